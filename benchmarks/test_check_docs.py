@@ -0,0 +1,96 @@
+"""Benchmarks for check-docs, over synthetic repositories of various sizes."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from diagnostic import _check_docs as check_docs
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+FILES_PER_PACKAGE = 100
+# Most files in a repository have nothing to do with errors.
+FILES_PER_CODE = 10
+
+_WITH_CODE = '''"""Module {index}."""
+
+
+class Error{index}(DiagnosticError):
+    code = "error-{index}"
+
+
+def function_{index}(value):
+    if value is None:
+        raise Error{index}(message="message", causes=[], hint_stmt=None)
+    return value * 2
+'''
+_WITHOUT_CODE = '''"""Module {index}."""
+
+
+def function_{index}(value):
+    return [item * 2 for item in range(value) if item % 3]
+'''
+
+
+@pytest.fixture(
+    scope="module",
+    params=[1_000, 10_000, 100_000],
+    ids=lambda files: f"{files}-files",
+)
+def repository(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> tuple[Path, int]:
+    files: int = request.param
+    root = tmp_path_factory.mktemp(f"repository-{files}")
+
+    (root / "src").mkdir()
+    for index in range(files):
+        package = root / "src" / f"package_{index // FILES_PER_PACKAGE}"
+        if index % FILES_PER_PACKAGE == 0:
+            package.mkdir()
+        template = _WITH_CODE if index % FILES_PER_CODE == 0 else _WITHOUT_CODE
+        (package / f"module_{index}.py").write_text(template.format(index=index))
+
+    (root / "docs").mkdir()
+    headings = (
+        f"## error-{index}\n\nWhat went wrong.\n\n"
+        for index in range(0, files, FILES_PER_CODE)
+    )
+    (root / "docs" / "errors.md").write_text("# Errors\n\n" + "".join(headings))
+    return root, files // FILES_PER_CODE
+
+
+def test_scan(benchmark: BenchmarkFixture, repository: tuple[Path, int]) -> None:
+    root, codes = repository
+
+    def scan() -> tuple[object, ...]:
+        return check_docs._scan(root / "src", root / "docs")  # pyright: ignore[reportPrivateUsage]
+
+    code_codes, doc_codes, _ = benchmark.pedantic(scan, rounds=3, iterations=1)
+
+    assert len(code_codes) == codes
+    assert len(doc_codes) == codes + 1  # including "Errors"
+
+
+def test_scan_cached(benchmark: BenchmarkFixture, repository: tuple[Path, int]) -> None:
+    root, codes = repository
+    source_cache, docs_cache = check_docs._caches(None, strict_rst=False)  # pyright: ignore[reportPrivateUsage]
+
+    def scan() -> tuple[object, ...]:
+        return check_docs._scan(  # pyright: ignore[reportPrivateUsage]
+            root / "src",
+            root / "docs",
+            source_cache=source_cache,
+            docs_cache=docs_cache,
+        )
+
+    scan()
+    code_codes, _, stats = benchmark.pedantic(scan, rounds=3, iterations=1)
+
+    assert len(code_codes) == codes
+    assert stats.parsed == 0
@@ -0,0 +1,56 @@
+"""Benchmarks for creating diagnostic objects."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from rich.text import Text
+
+from diagnostic import DiagnosticError
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+class ClassCodeError(DiagnosticError):
+    code = "class-code"
+    docs_index = "https://example.com/errors/{code}"
+
+
+def test_code_from_class(benchmark: BenchmarkFixture) -> None:
+    causes = ["It was not quite right."]
+
+    def create() -> DiagnosticError:
+        return ClassCodeError(message="message", causes=causes, hint_stmt=None)
+
+    benchmark(create)
+
+
+def test_code_from_arguments(benchmark: BenchmarkFixture) -> None:
+    causes = ["It was not quite right."]
+
+    def create() -> DiagnosticError:
+        return DiagnosticError(
+            code="argument-code", message="message", causes=causes, hint_stmt=None
+        )
+
+    benchmark(create)
+
+
+@pytest.mark.parametrize("multiline", [False, True], ids=["plain", "multiline"])
+@pytest.mark.parametrize("count", [0, 1, 100, 10_000])
+def test_with_causes(benchmark: BenchmarkFixture, count: int, multiline: bool) -> None:
+    causes: list[str | Text] = [
+        Text(f"Item {index} was not quite right,\nand could not be used.")
+        if multiline
+        else f"Item {index} was not quite right."
+        for index in range(count)
+    ]
+
+    def create() -> DiagnosticError:
+        return DiagnosticError(
+            code="argument-code", message="message", causes=causes, hint_stmt=None
+        )
+
+    benchmark(create)
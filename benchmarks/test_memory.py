@@ -0,0 +1,55 @@
+"""Benchmarks for the memory footprint of diagnostic objects."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import pytest
+
+from diagnostic import Diagnostic, DiagnosticError, DiagnosticWarning
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+COUNT = 100_000
+
+
+class FrozenWarning(DiagnosticWarning, frozen=True):
+    pass
+
+
+class UnslottedWarning(Diagnostic, Warning):
+    """Equivalent to DiagnosticWarning, without `__slots__`."""
+
+    style = DiagnosticWarning.style
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [DiagnosticError, DiagnosticWarning, FrozenWarning, UnslottedWarning],
+    ids=lambda cls: cls.__name__,
+)
+def test_footprint(benchmark: BenchmarkFixture, cls: type[Diagnostic]) -> None:
+    causes = ["It was not quite right."]
+
+    def create() -> list[Diagnostic]:
+        return [
+            cls(code="some-code", message="message", causes=causes, hint_stmt=None)
+            for _ in range(COUNT)
+        ]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        diagnostics = create()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del diagnostics
+
+    benchmark.extra_info["count"] = COUNT
+    benchmark.extra_info["bytes_per_instance"] = (after - before) / COUNT
+    benchmark.pedantic(create, rounds=3)
@@ -0,0 +1,170 @@
+"""Benchmarks for finding codes in source code and documentation."""
+
+from __future__ import annotations
+
+import textwrap
+from typing import TYPE_CHECKING
+
+import pytest
+
+from diagnostic import _parsers as parsers
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+FILES = 200
+
+# Mostly ordinary code, with a few codes scattered through it.
+_MODULE = textwrap.dedent(
+    '''
+    """A module in a synthetic project."""
+
+    import functools
+
+
+    class Error{index}(DiagnosticError):
+        code = "error-{index}"
+
+
+    class Helper{index}:
+        def __init__(self, value):
+            self.value = value
+            self.values = [item * 2 for item in range(value) if item % 3]
+
+        def compute(self, other):
+            total = 0
+            for item in self.values:
+                if item > other:
+                    total += item
+                else:
+                    total -= {{"left": item, "right": other}}["left"]
+            return total
+
+        def describe(self):
+            return f"Helper({{self.value!r}}) with {{len(self.values)}} values"
+
+    '''
+)
+_FILLER = textwrap.dedent(
+    """
+    def function_{index}_{part}(a, b, *, c=None):
+        if c is None:
+            c = [a, b]
+        return sorted(c, key=lambda item: (item, a, b))[{part}]
+
+    """
+)
+_CALL = textwrap.dedent(
+    """
+    def fail_{index}():
+        raise DiagnosticError(
+            code="call-{index}", message="message", causes=[], hint_stmt=None
+        )
+    """
+)
+_MARKDOWN_SECTION = textwrap.dedent(
+    """
+    ## error-{index}
+
+    This happens when something goes wrong with `thing {index}`. Some *emphasis*
+    and a [link](https://example.com/{index}) to more details.
+
+    ```python
+    raise DiagnosticError(code="error-{index}")
+    ```
+
+    How to fix
+    ----------
+
+    Do the other thing instead, and check that it worked.
+    """
+)
+_RST_SECTION = textwrap.dedent(
+    """
+    error-{index}
+    ---------
+
+    This happens when something goes wrong with ``thing {index}``. Some *emphasis*
+    and a `link <https://example.com/{index}>`_ to more details.
+
+    .. code-block:: python
+
+        raise DiagnosticError(code="error-{index}")
+
+    How to fix
+    ~~~~~~~~~~
+
+    Do the other thing instead, and check that it worked::
+
+        $ do-the-thing
+    """
+)
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("corpus")
+    for index in range(FILES):
+        parts = [_MODULE.format(index=index)]
+        parts.extend(_FILLER.format(index=index, part=part) for part in range(40))
+        parts.append(_CALL.format(index=index))
+        (root / f"module_{index}.py").write_text("".join(parts))
+    return root
+
+
+def test_find_codes_in_sources(benchmark: BenchmarkFixture, corpus: Path) -> None:
+    megabytes = sum(file.stat().st_size for file in corpus.iterdir()) / 1_000_000
+
+    result = benchmark(parsers.find_codes_in_sources, corpus)
+
+    assert len(result) == 2 * FILES
+    benchmark.extra_info["megabytes"] = round(megabytes, 3)
+    if benchmark.stats is not None:  # not when run with --benchmark-disable
+        benchmark.extra_info["seconds_per_megabyte"] = (
+            benchmark.stats.stats.mean / megabytes
+        )
+
+
+@pytest.fixture(scope="module")
+def markdown_index(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    document = tmp_path_factory.mktemp("docs") / "index.md"
+    sections = (_MARKDOWN_SECTION.format(index=index) for index in range(FILES))
+    document.write_text("# Errors\n" + "".join(sections))
+    return document
+
+
+def test_find_code_headings_in_markdown(
+    benchmark: BenchmarkFixture, markdown_index: Path
+) -> None:
+    result = benchmark(parsers.find_code_headings_in_markdown, markdown_index)
+
+    assert len(result) == FILES + 1  # including "Errors"
+
+
+def test_find_code_headings_in_markdown_with_markdown_it(
+    benchmark: BenchmarkFixture, markdown_index: Path
+) -> None:
+    text = markdown_index.read_text()
+
+    result = benchmark(parsers._parse_markdown_headings, text)  # pyright: ignore[reportPrivateUsage]
+
+    assert len(result) == 2 * FILES + 1
+
+
+@pytest.fixture(scope="module")
+def rst_index(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    document = tmp_path_factory.mktemp("docs") / "index.rst"
+    sections = (_RST_SECTION.format(index=index) for index in range(FILES))
+    document.write_text("======\nErrors\n======\n\nIntro.\n" + "".join(sections))
+    return document
+
+
+@pytest.mark.parametrize("strict", [False, True], ids=["scanner", "docutils"])
+def test_find_code_headings_in_rst(
+    benchmark: BenchmarkFixture, rst_index: Path, strict: bool
+) -> None:
+    result = benchmark(parsers.find_code_headings_in_rst, rst_index, strict=strict)
+
+    assert len(result) == FILES + 1  # including "Errors"
@@ -0,0 +1,136 @@
+"""Benchmarks for presenting diagnostic objects."""
+
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING
+
+import pytest
+from rich.console import Console
+from rich.text import Text
+
+from diagnostic import DiagnosticError, DiagnosticWarning, render_many
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+def create_warnings(count: int) -> list[DiagnosticWarning]:
+    return [
+        DiagnosticWarning(
+            code=f"warning-{index % 10}",
+            message=f"Something is not quite right with item {index}.",
+            causes=["It was not quite right.", "It was also\nslightly wrong."],
+            hint_stmt="Make it right.",
+        )
+        for index in range(count)
+    ]
+
+
+def create_console() -> Console:
+    return Console(file=io.StringIO(), color_system="truecolor", width=100)
+
+
+@pytest.mark.parametrize("count", [100, 1_000])
+def test_print_each(benchmark: BenchmarkFixture, count: int) -> None:
+    warnings = create_warnings(count)
+
+    def print_each() -> None:
+        console = create_console()
+        for warning in warnings:
+            console.print(warning)
+
+    benchmark(print_each)
+
+
+@pytest.mark.parametrize("count", [100, 1_000])
+def test_render_many(benchmark: BenchmarkFixture, count: int) -> None:
+    warnings = create_warnings(count)
+
+    def render() -> None:
+        render_many(warnings, console=create_console())
+
+    benchmark(render)
+
+
+@pytest.mark.parametrize("count", [100, 1_000])
+def test_render_many_deduplicated(benchmark: BenchmarkFixture, count: int) -> None:
+    warnings = create_warnings(count) * 2
+
+    def render() -> None:
+        render_many(warnings, console=create_console(), deduplicate=True)
+
+    benchmark(render)
+
+
+CAUSE_COUNTS = [0, 1, 100, 10_000]
+
+
+class AsciiIO(io.StringIO):
+    """A stream that rich presents ASCII-only output to."""
+
+    encoding = "ascii"  # pyright: ignore[reportIncompatibleVariableOverride]
+
+
+CONSOLE_MODES = {
+    "unicode-color": (io.StringIO, "truecolor"),
+    "unicode-no-color": (io.StringIO, None),
+    "ascii-color": (AsciiIO, "truecolor"),
+    "ascii-no-color": (AsciiIO, None),
+}
+
+
+def create_error(count: int, *, multiline: bool) -> DiagnosticError:
+    causes: list[str | Text] = [
+        Text(f"Item {index} was not quite right,\nand could not be used.")
+        if multiline
+        else f"Item {index} was not quite right."
+        for index in range(count)
+    ]
+    return DiagnosticError(
+        code="some-error",
+        message="Something is not quite right.",
+        causes=causes,
+        note_stmt="It was checked.",
+        hint_stmt="Make it right.",
+    )
+
+
+@pytest.mark.parametrize("multiline", [False, True], ids=["plain", "multiline"])
+@pytest.mark.parametrize("count", CAUSE_COUNTS)
+def test_str(benchmark: BenchmarkFixture, count: int, multiline: bool) -> None:
+    error = create_error(count, multiline=multiline)
+
+    benchmark(str, error)
+
+
+@pytest.mark.parametrize("mode", CONSOLE_MODES)
+@pytest.mark.parametrize("multiline", [False, True], ids=["plain", "multiline"])
+@pytest.mark.parametrize("count", CAUSE_COUNTS)
+def test_rich_console(
+    benchmark: BenchmarkFixture, count: int, multiline: bool, mode: str
+) -> None:
+    error = create_error(count, multiline=multiline)
+    file_class, color_system = CONSOLE_MODES[mode]
+    # Reused, as it would be, so that the cached decorations for it are used.
+    file = file_class()
+    console = Console(file=file, color_system=color_system, width=100)
+
+    def render() -> None:
+        file.seek(0)
+        file.truncate()
+        console.print(error)
+
+    benchmark(render)
+
+
+@pytest.mark.parametrize("mode", CONSOLE_MODES)
+def test_rich_console_first_print(benchmark: BenchmarkFixture, mode: str) -> None:
+    error = create_error(1, multiline=False)
+    file_class, color_system = CONSOLE_MODES[mode]
+
+    def render() -> None:
+        console = Console(file=file_class(), color_system=color_system, width=100)
+        console.print(error)
+
+    benchmark(render)
@@ -0,0 +1,58 @@
+"""Benchmarks for serializing diagnostic objects, eg: to send between processes."""
+
+from __future__ import annotations
+
+import json
+import pickle
+from typing import TYPE_CHECKING
+
+import pytest
+from rich.text import Text
+
+from diagnostic import DiagnosticError
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+def create_error(count: int) -> DiagnosticError:
+    causes = [
+        Text.from_markup(f"Item [bold]{index}[/] was not [red]quite[/] right.")
+        for index in range(count)
+    ]
+    return DiagnosticError(
+        code="argument-code",
+        message=Text("message", style="bold"),
+        causes=causes,
+        hint_stmt="hint",
+    )
+
+
+@pytest.mark.parametrize("count", [1, 100, 10_000])
+def test_pickle(benchmark: BenchmarkFixture, count: int) -> None:
+    error = create_error(count)
+
+    def round_trip() -> DiagnosticError:
+        return pickle.loads(pickle.dumps(error, protocol=pickle.HIGHEST_PROTOCOL))
+
+    restored = benchmark(round_trip)
+
+    assert restored.causes == error.causes
+    benchmark.extra_info["bytes"] = len(pickle.dumps(error, pickle.HIGHEST_PROTOCOL))
+    # For comparison, what pickling the `Text` objects themselves would take.
+    benchmark.extra_info["bytes_as_text_objects"] = len(
+        pickle.dumps(error.causes, pickle.HIGHEST_PROTOCOL)
+    )
+
+
+@pytest.mark.parametrize("count", [1, 100, 10_000])
+def test_json(benchmark: BenchmarkFixture, count: int) -> None:
+    error = create_error(count)
+
+    def round_trip() -> DiagnosticError:
+        return DiagnosticError.from_dict(json.loads(json.dumps(error.to_dict())))
+
+    restored = benchmark(round_trip)
+
+    assert restored.causes == error.causes
+    benchmark.extra_info["bytes"] = len(json.dumps(error.to_dict()))
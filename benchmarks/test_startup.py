@@ -0,0 +1,51 @@
+"""Benchmarks for the start up time of the package, and its check-docs entry point."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+@pytest.fixture
+def tiny_project(tmp_path: Path) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "errors.py").write_text(
+        'class AwesomeError(DiagnosticError):\n    code = "awesome-error"\n'
+    )
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "errors.md").write_text("# Errors\n\n## awesome-error\n")
+    return tmp_path
+
+
+def test_import(benchmark: BenchmarkFixture) -> None:
+    # Includes starting the interpreter, for comparison with `-c pass`.
+    command = [sys.executable, "-c", "import diagnostic"]
+
+    def run() -> subprocess.CompletedProcess[bytes]:
+        return subprocess.run(command, capture_output=True)
+
+    process = benchmark(run)
+
+    assert process.returncode == 0, process.stderr
+
+
+def test_check_docs(benchmark: BenchmarkFixture, tiny_project: Path) -> None:
+    command = [
+        *(sys.executable, "-m", "diagnostic.check-docs"),
+        *("src", "docs", "--no-cache", "--no-fail-on-extra", "--jobs=1"),
+    ]
+
+    def run() -> subprocess.CompletedProcess[bytes]:
+        return subprocess.run(command, cwd=tiny_project, capture_output=True)
+
+    process = benchmark(run)
+
+    assert process.returncode == 0, process.stderr
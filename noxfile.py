@@ -1,8 +1,12 @@
 """Development automation."""
 
+import os
+
 import nox
 
 ALL_SUPPORTED_PYTHONS = ["3.10", "3.11", "3.12", "3.13", "3.14"]
+# Timings are specific to the machine, so the baseline is not checked in.
+BENCHMARK_BASELINE = ".benchmarks/baseline.json"
 nox.options.sessions = ["lint", "docs", "test"]
 
 
@@ -47,6 +51,34 @@ def test(session: nox.Session) -> None:
     )
 
 
+@nox.session
+def benchmark(session: nox.Session) -> None:
+    session.install("-e", ".[check-docs]")
+
+    session.install("-r", "benchmarks/requirements.txt")
+    compare = []
+    if os.path.exists(BENCHMARK_BASELINE):
+        compare = [
+            f"--benchmark-compare={BENCHMARK_BASELINE}",
+            "--benchmark-compare-fail=mean:20%",
+        ]
+    session.run("pytest", "benchmarks/", *compare, *session.posargs)
+
+
+@nox.session(name="benchmark-baseline")
+def benchmark_baseline(session: nox.Session) -> None:
+    session.install("-e", ".[check-docs]")
+
+    session.install("-r", "benchmarks/requirements.txt")
+    os.makedirs(os.path.dirname(BENCHMARK_BASELINE), exist_ok=True)
+    session.run(
+        "pytest",
+        "benchmarks/",
+        f"--benchmark-json={BENCHMARK_BASELINE}",
+        *session.posargs,
+    )
+
+
 @nox.session
 def docs(session: nox.Session) -> None:
     session.install("-e", ".")
@@ -1,7 +1,20 @@
 """Present errors that contain causes better understand what happened."""
 
 from ._base import Diagnostic, DiagnosticStyle
+from ._collector import DiagnosticCollector
 from ._concrete import DiagnosticError, DiagnosticWarning
+from ._group import DiagnosticGroup, dump_plain, render_many
+from ._registry import lookup
 
-__all__ = ["DiagnosticStyle", "Diagnostic", "DiagnosticError", "DiagnosticWarning"]
+__all__ = [
+    "DiagnosticStyle",
+    "Diagnostic",
+    "DiagnosticError",
+    "DiagnosticWarning",
+    "DiagnosticGroup",
+    "DiagnosticCollector",
+    "render_many",
+    "dump_plain",
+    "lookup",
+]
 __version__ = "3.0.0"
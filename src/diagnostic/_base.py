@@ -3,15 +3,27 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import re
 import textwrap
-from typing import TYPE_CHECKING, ClassVar
+import weakref
+from typing import TYPE_CHECKING, Any, ClassVar, TextIO, TypeVar, cast
 
-import rich.console
-import rich.text
+from ._registry import register
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Callable, Hashable, Iterator, Mapping, Sequence
+    from typing import TypeAlias
+
+    import rich.console
+    import rich.text
+
+    _Deferrable: TypeAlias = "str | rich.text.Text | Callable[[], str | rich.text.Text]"
+    # A `Text` as (plain, style, [(start, end, style), ...]), with styles as strings.
+    _EncodedText: TypeAlias = "tuple[str, str, list[tuple[int, int, str]]]"
+    _Encoded: TypeAlias = "str | _EncodedText | None"
+
+_D = TypeVar("_D", bound="Diagnostic")
 
 RE_code = re.compile(
     r"""
@@ -31,30 +43,91 @@ _RE_TAGS = re.compile(
 )
 
 
+# Codes are typically drawn from a small set, so memoise the regex match.
+@functools.lru_cache(maxsize=1024)
 def _is_valid_code(s: str) -> bool:
     return re.match(RE_code, s) is not None
 
 
 def _ensure_text(s: str | rich.text.Text) -> rich.text.Text:
+    # Imported here, so that `import diagnostic` does not pay for `rich`.
+    import rich.text
+
     if isinstance(s, str):
         return rich.text.Text(s)
     return s
 
 
-def _index_prefix_rich(
-    s: str | rich.text.Text,
-    console: rich.console.Console,
-    *,
-    prefix: str,
-    indent: str,
-) -> rich.text.Text:
-    lines = _ensure_text(s).split(allow_blank=True)
-    body = console.render_str(f"\n{indent}", overflow="ignore").join(lines)
-    return console.render_str(prefix, overflow="ignore") + body
+def _plain(s: str | rich.text.Text) -> str:
+    if isinstance(s, str):
+        return s
+    return s.plain
+
+
+def _text_identity(
+    s: str | rich.text.Text | None, *, presented: bool = False
+) -> Hashable:
+    if s is None or isinstance(s, str):
+        return s
+    if presented and not s.style and not s.spans:
+        # Presented the same as its plain string (see `_ensure_text`).
+        return s.plain
+    return (s.plain, str(s.style), tuple(s.spans))
+
+
+def _encode_text(s: str | rich.text.Text | None) -> _Encoded:
+    if s is None or isinstance(s, str):
+        return s
+    spans = [(span.start, span.end, str(span.style)) for span in s.spans]
+    return (s.plain, str(s.style), spans)
+
+
+def _decode_text(value: Any) -> str | rich.text.Text | None:
+    if value is None or isinstance(value, str):
+        return value
+    # Imported here, so that `import diagnostic` does not pay for `rich`.
+    import rich.text
+
+    plain, style, spans = value  # also lists, after a round trip through JSON
+    return rich.text.Text(
+        plain, style=style, spans=list(map(rich.text.Span._make, spans))
+    )
+
+
+def _create(
+    cls: type[_D],
+    code: str,
+    message: _Encoded,
+    causes: list[_Encoded],
+    note_stmt: _Encoded,
+    hint_stmt: _Encoded,
+) -> _D:
+    """Create a diagnostic from encoded fields, without calling `__init__`."""
+    self = cls.__new__(cls)
+    decoded = [_decode_text(item) for item in causes]
+    _assign_frozen(
+        self,
+        _code=code,
+        message=_decode_text(message),
+        causes=tuple(decoded) if cls._frozen else decoded,  # pyright: ignore[reportPrivateUsage]
+        note_stmt=_decode_text(note_stmt),
+        hint_stmt=_decode_text(hint_stmt),
+    )
+    return self
+
+
+def _restore(cls: type[_D], state: tuple[Any, ...]) -> _D:
+    """Recreate a diagnostic from the state given by :meth:`Diagnostic.__reduce__`."""
+    *fields, details_link, attributes = state
+    self = _create(cls, *fields)
+    _assign_frozen(self, _details_link=details_link)
+    if attributes:
+        self.__dict__.update(attributes)
+    return self
 
 
 def _indent_prefix(s: str | rich.text.Text, *, prefix: str, indent: str) -> str:
-    first, _, rest = _ensure_text(s).plain.partition("\n")
+    first, _, rest = _plain(s).partition("\n")
     return "\n".join(filter(None, [prefix + first, textwrap.indent(rest, indent)]))
 
 
@@ -66,8 +139,171 @@ class DiagnosticStyle:
     unicode_symbol: str
 
 
+@dataclasses.dataclass(frozen=True)
+class _Decoration:
+    """A pre-rendered prefix for the first line, and indent for the rest."""
+
+    prefix: rich.text.Text
+    indent: rich.text.Text
+
+    @classmethod
+    def render(
+        cls, console: rich.console.Console, *, prefix: str, indent: str
+    ) -> _Decoration:
+        return cls(
+            prefix=console.render_str(prefix, overflow="ignore"),
+            indent=console.render_str(f"\n{indent}", overflow="ignore"),
+        )
+
+    def apply(self, s: str | rich.text.Text) -> rich.text.Text:
+        lines = _ensure_text(s).split(allow_blank=True)
+        return self.prefix + self.indent.join(lines)
+
+
+@dataclasses.dataclass(frozen=True)
+class _TreeDecorations:
+    """All the decorations used when presenting a diagnostic with `rich`."""
+
+    message: _Decoration
+    message_with_causes: _Decoration
+    cause: _Decoration
+    last_cause: _Decoration
+    note: _Decoration
+    hint: _Decoration
+
+    @classmethod
+    def render(
+        cls, console: rich.console.Console, style: DiagnosticStyle
+    ) -> _TreeDecorations:
+        color = style.color
+        return cls(
+            message=_Decoration.render(console, prefix=f"[{color}]×[/] ", indent="  "),
+            message_with_causes=_Decoration.render(
+                console,
+                prefix=f"[{color}]{style.unicode_symbol}[/] ",
+                indent=f"[{color}]│[/] ",
+            ),
+            cause=_Decoration.render(
+                console, prefix=f"[{color}]├─>[/] ", indent=f"[{color}]│  [/] "
+            ),
+            last_cause=_Decoration.render(
+                console, prefix=f"[{color}]╰─>[/] ", indent=f"[{color}]   [/] "
+            ),
+            note=_Decoration.render(
+                console, prefix="[magenta bold]note[/]: ", indent="      "
+            ),
+            hint=_Decoration.render(
+                console, prefix="[cyan bold]hint[/]: ", indent="      "
+            ),
+        )
+
+
+# Rendering markup is relatively expensive, so the decorations are only rendered
+# once per console (which holds the markup/emoji/highlighting settings) and style.
+_decorations_cache: weakref.WeakKeyDictionary[
+    rich.console.Console, dict[DiagnosticStyle, _TreeDecorations]
+] = weakref.WeakKeyDictionary()
+
+
+def _tree_decorations(
+    console: rich.console.Console, style: DiagnosticStyle
+) -> _TreeDecorations:
+    per_style = _decorations_cache.setdefault(console, {})
+    try:
+        return per_style[style]
+    except KeyError:
+        decorations = per_style[style] = _TreeDecorations.render(console, style)
+        return decorations
+
+
+class _CodeAttribute:
+    """The descriptor backing :attr:`Diagnostic.code`.
+
+    Accessed on a class, this is the code set on that class (if any). Accessed
+    on an instance, this is the code of that instance, which is stored in the
+    `_code` slot so that it does not need an instance `__dict__`.
+    """
+
+    def __get__(
+        self, obj: Diagnostic | None, objtype: type[Diagnostic] | None = None
+    ) -> str | None:
+        if obj is None:
+            assert objtype is not None
+            return objtype._class_code  # pyright: ignore[reportPrivateUsage]
+        return obj._code  # pyright: ignore[reportPrivateUsage]
+
+    def __set__(self, obj: Diagnostic, value: str | None) -> None:
+        obj._code = value  # pyright: ignore[reportPrivateUsage]
+
+
+# The instance attributes of a diagnostic object. Concrete subclasses list
+# these in their `__slots__`, to avoid a per-instance `__dict__`.
+_FIELDS = ("code", "message", "causes", "hint_stmt", "note_stmt", "details_link")
+_SLOTS = (
+    "_code",
+    "message",
+    "causes",
+    "hint_stmt",
+    "note_stmt",
+    "_details_link",
+    "_hash",
+)
+
+
+def _assign_frozen(self: Diagnostic, **fields: object) -> None:
+    for name, value in fields.items():
+        object.__setattr__(self, name, value)
+
+
+def _frozen_setattr(self: Diagnostic, name: str, value: object) -> None:
+    if name in _FIELDS:
+        raise dataclasses.FrozenInstanceError(f"cannot assign to field {name!r}")
+    object.__setattr__(self, name, value)
+
+
+def _frozen_delattr(self: Diagnostic, name: str) -> None:
+    if name in _FIELDS:
+        raise dataclasses.FrozenInstanceError(f"cannot delete field {name!r}")
+    object.__delattr__(self, name)
+
+
+def _frozen_eq(self: Diagnostic, other: object) -> bool:
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    assert isinstance(other, Diagnostic)
+    return self._identity() == other._identity()  # pyright: ignore[reportPrivateUsage]
+
+
+def _frozen_hash(self: Diagnostic) -> int:
+    try:
+        return self._hash  # pyright: ignore[reportPrivateUsage]
+    except AttributeError:
+        value = hash(self._identity())  # pyright: ignore[reportPrivateUsage]
+        object.__setattr__(self, "_hash", value)
+        return value
+
+
 class Diagnostic:
-    """An object that holds diagnostic information to present to a reader."""
+    """An object that holds diagnostic information to present to a reader.
+
+    The :attr:`message`, :attr:`causes`, :attr:`hint_stmt` and :attr:`note_stmt`
+    can be provided as zero-argument callables (eg: ``functools.partial(
+    template.format, *args)``), which are called when the diagnostic is first
+    presented and replaced with their results. This avoids formatting content for
+    diagnostics that are never presented.
+
+    Subclasses can be made immutable, by passing ``frozen=True`` in the class
+    definition. The fields of such diagnostics can not be reassigned after
+    creation, their :attr:`causes` are stored as a tuple, and they are hashable
+    and compare equal when they would be presented identically.
+    """
+
+    __slots__ = ()
+
+    _class_code: ClassVar[str | None] = None
+    _frozen: ClassVar[bool] = False
+    _code: str | None
+    _hash: int
 
     style: ClassVar[DiagnosticStyle]
     """Data about how this diagnostic should be presented"""
@@ -78,7 +314,10 @@ class Diagnostic:
     which will be replaced with the code of this instance.
     """
 
-    code: str | None = None
+    if TYPE_CHECKING:
+        code: str | None = None
+    else:
+        code = _CodeAttribute()
     """
     A unique code to help readers identify this in output, documentation, etc.
 
@@ -87,37 +326,102 @@ class Diagnostic:
     numbers, and dashes.
     """
 
-    message: str | rich.text.Text
+    message: _Deferrable
     """A short description."""
 
-    causes: Sequence[str | rich.text.Text]
+    causes: Sequence[_Deferrable]
     """A list of strings describing the causes."""
 
-    hint_stmt: str | rich.text.Text | None
+    hint_stmt: _Deferrable | None
     """A hint for what the reader might want to do next."""
 
-    note_stmt: str | rich.text.Text | None
+    note_stmt: _Deferrable | None
     """
     A note with additional information, that's not part of the "causes" but
     could be useful to know for the reader.
     """
 
-    details_link: str | None
-    """
-    A link to more details about the problem.
+    _details_link: str | None
 
-    This is determined automatically if :attr:`code` is set, and
-    :attr:`docs_index` is set.
-    """
+    @property
+    def details_link(self) -> str | None:
+        """
+        A link to more details about the problem.
+
+        This is determined automatically if :attr:`code` is set, and
+        :attr:`docs_index` is set. It is only computed when first accessed.
+        """
+        try:
+            return self._details_link
+        except AttributeError:
+            pass
+        if self.docs_index is None:
+            link = None
+        else:
+            link = self.docs_index.format(code=self.code)
+        # Bypass the __setattr__ of frozen diagnostics, this is not a change.
+        object.__setattr__(self, "_details_link", link)
+        return link
+
+    @details_link.setter
+    def details_link(self, value: str | None) -> None:
+        self._details_link = value
+
+    def __init_subclass__(cls, *, frozen: bool | None = None, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # Move a `code = "..."` set in the class body, out of the way of the
+        # descriptor that provides per-instance codes.
+        if "code" in cls.__dict__:
+            cls._class_code = cls.__dict__["code"]
+            del cls.code
+
+        # Validate the class-level configuration once, here, rather than every
+        # time an instance is created.
+        code = cls.__dict__.get("_class_code")
+        if code is not None and not _is_valid_code(code):
+            raise ValueError(
+                f"Cannot create {cls.__name__} class: "
+                f"error code {code!r} must be kebab-case and start "
+                "with a character!"
+            )
+        style = cls.__dict__.get("style")
+        if style is not None and not isinstance(style, DiagnosticStyle):
+            raise TypeError(
+                f"Cannot create {cls.__name__} class: "
+                f"`style` must be a DiagnosticStyle, not {type(style).__name__}!"
+            )
+        docs_index = cls.__dict__.get("docs_index")
+        if docs_index is not None and "{code}" not in docs_index:
+            raise ValueError(
+                f"Cannot create {cls.__name__} class: "
+                "`docs_index` must contain a {code} placeholder!"
+            )
+
+        if not frozen and frozen is not None and cls._frozen:
+            raise TypeError(
+                f"Cannot create {cls.__name__} class: "
+                "can not inherit non-frozen diagnostic from a frozen one!"
+            )
+        if frozen:
+            cls._frozen = True
+            cls.__setattr__ = _frozen_setattr  # type: ignore[method-assign]
+            cls.__delattr__ = _frozen_delattr  # type: ignore[method-assign]
+            cls.__eq__ = _frozen_eq  # type: ignore[method-assign]
+            cls.__hash__ = _frozen_hash  # type: ignore[method-assign]
+
+        # Only now that the class is known to be valid, so that lookup() finds it.
+        if code is not None:
+            register(cls, code)
 
     def __init__(
         self,
         *,
         code: str | None = None,
-        message: str | rich.text.Text,
-        causes: list[str] | list[rich.text.Text] | list[str | rich.text.Text],
-        hint_stmt: str | rich.text.Text | None,
-        note_stmt: str | rich.text.Text | None = None,
+        message: _Deferrable,
+        causes: list[str] | list[rich.text.Text] | list[_Deferrable],
+        hint_stmt: _Deferrable | None,
+        note_stmt: _Deferrable | None = None,
     ) -> None:
         """
         :param code: Maps to :attr:`code`.
@@ -129,13 +433,13 @@ class Diagnostic:
         super().__init__()
 
         if code is None:
-            if self.__class__.code is None:
+            code = self.__class__.code
+            if code is None:
                 raise ValueError(
                     f"Cannot create {self.__class__.__name__} object: "
                     "`code` must be provided!"
                 )
-            code = self.__class__.code
-        if not _is_valid_code(code):
+        elif not _is_valid_code(code):
             raise ValueError(
                 f"Cannot create {self.__class__.__name__} object: "
                 f"error code {code!r} must be kebab-case and start "
@@ -152,6 +456,17 @@ class Diagnostic:
                 "`style` must be set in a subclass of Diagnostic!"
             )
 
+        if self._frozen:
+            _assign_frozen(
+                self,
+                code=code,
+                message=message,
+                causes=tuple(causes),
+                note_stmt=note_stmt,
+                hint_stmt=hint_stmt,
+            )
+            return
+
         self.code = code
 
         self.message = message
@@ -160,18 +475,6 @@ class Diagnostic:
         self.note_stmt = note_stmt
         self.hint_stmt = hint_stmt
 
-        if self.__class__.docs_index is not None:
-            if "{code}" not in self.__class__.docs_index:
-                raise ValueError(
-                    f"Cannot create {self.__class__.__name__} object: "
-                    "`docs_index` must contain a {code} placeholder!"
-                )
-            self.details_link: str | None = self.__class__.docs_index.format(
-                code=self.code
-            )
-        else:
-            self.details_link = None
-
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__}("
@@ -184,91 +487,218 @@ class Diagnostic:
             ")>"
         )
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Support pickling, with a compact representation of the fields.
+
+        The default for exceptions would recreate the object by calling the class
+        with positional arguments, which diagnostics do not accept. Deferred
+        fields are resolved, since callables usually can not be pickled.
+        """
+        message, causes, note_stmt, hint_stmt = self._resolve_deferred()
+        # Without slots, the fields are in `__dict__` too, but encoded above.
+        attributes = {
+            name: value
+            for name, value in getattr(self, "__dict__", {}).items()
+            if name not in _SLOTS
+        }
+        state = (
+            self.code,
+            _encode_text(message),
+            [_encode_text(item) for item in causes],
+            _encode_text(note_stmt),
+            _encode_text(hint_stmt),
+            self.details_link,
+            attributes or None,
+        )
+        return (_restore, (self.__class__, state))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the fields of this diagnostic, as JSON-compatible values.
+
+        Strings are kept as they are, and :class:`rich.text.Text` objects are
+        given as ``[plain, style, spans]`` with each span as ``[start, end,
+        style]``, with the styles as strings. Deferred fields are resolved.
+        The class of the diagnostic is not included, see :meth:`from_dict`.
+        """
+        message, causes, note_stmt, hint_stmt = self._resolve_deferred()
+        return {
+            "code": self.code,
+            "message": _encode_text(message),
+            "causes": [_encode_text(item) for item in causes],
+            "note_stmt": _encode_text(note_stmt),
+            "hint_stmt": _encode_text(hint_stmt),
+            "details_link": self.details_link,
+        }
+
+    @classmethod
+    def from_dict(cls: type[_D], data: Mapping[str, Any]) -> _D:
+        """Recreate a diagnostic from the fields given by :meth:`to_dict`.
+
+        This creates an instance of the class that it is called on, without
+        calling its ``__init__`` (so that subclasses with different arguments
+        work too). Without a ``details_link``, it is determined as usual.
+
+        :param data: The fields of the diagnostic.
+        """
+        code = data["code"]
+        if not isinstance(code, str) or not _is_valid_code(code):
+            raise ValueError(
+                f"Cannot create {cls.__name__} object: "
+                f"error code {code!r} must be kebab-case and start "
+                "with a character!"
+            )
+        causes: Any = data["causes"]
+        if not isinstance(causes, list):
+            raise TypeError(
+                f"Cannot create {cls.__name__} object: "
+                f"`causes` must be a list, not {type(causes).__name__}!"
+            )
+        diagnostic = _create(
+            cls,
+            code,
+            data["message"],
+            cast("list[_Encoded]", causes),
+            data.get("note_stmt"),
+            data.get("hint_stmt"),
+        )
+        if "details_link" in data:
+            _assign_frozen(diagnostic, _details_link=data["details_link"])
+        return diagnostic
+
+    def _resolve_deferred(
+        self,
+    ) -> tuple[
+        str | rich.text.Text,
+        Sequence[str | rich.text.Text],
+        str | rich.text.Text | None,
+        str | rich.text.Text | None,
+    ]:
+        """Call any deferred fields, replacing them with their results.
+
+        Returns:
+            The resolved message, causes, note_stmt and hint_stmt.
+        """
+        message = self.message
+        if callable(message):
+            message = message()
+            object.__setattr__(self, "message", message)
+
+        causes = self.causes
+        if any(callable(item) for item in causes):
+            resolved = [item() if callable(item) else item for item in causes]
+            causes = tuple(resolved) if self._frozen else resolved
+            object.__setattr__(self, "causes", causes)
+
+        note_stmt = self.note_stmt
+        if callable(note_stmt):
+            note_stmt = note_stmt()
+            object.__setattr__(self, "note_stmt", note_stmt)
+
+        hint_stmt = self.hint_stmt
+        if callable(hint_stmt):
+            hint_stmt = hint_stmt()
+            object.__setattr__(self, "hint_stmt", hint_stmt)
+
+        return (
+            message,
+            cast("Sequence[str | rich.text.Text]", causes),
+            note_stmt,
+            hint_stmt,
+        )
+
+    def _identity(self, *, presented: bool = False) -> Hashable:
+        """A value that is equal for diagnostics with equal fields.
+
+        With `presented`, it is also equal for diagnostics that only differ in
+        ways that are not presented (eg: a string, and an unstyled Text).
+        """
+        message, causes, note_stmt, hint_stmt = self._resolve_deferred()
+        return (
+            self.__class__,
+            self.code,
+            _text_identity(message, presented=presented),
+            tuple(_text_identity(item, presented=presented) for item in causes),
+            _text_identity(note_stmt, presented=presented),
+            _text_identity(hint_stmt, presented=presented),
+            self.details_link,
+        )
+
     def __str__(self) -> str:
         return "\n".join(self._str_parts())
 
+    def write_plain(self, stream: TextIO) -> None:
+        """Write the plain-text presentation of this diagnostic to a stream.
+
+        This writes the same content as :func:`str`, without building it as a
+        single string first.
+
+        :param stream: The text stream to write to.
+        """
+        parts = self._str_parts()
+        stream.write(next(parts))
+        for part in parts:
+            stream.write("\n")
+            stream.write(part)
+
     def _str_parts(self) -> Iterator[str]:
         assert self.code is not None
+        message, causes, note_stmt, hint_stmt = self._resolve_deferred()
+        details_link = self.details_link
+
         yield self.code
         yield ""
-        yield _ensure_text(self.message).plain
-        if self.causes:
+        yield _plain(message)
+        if causes:
             yield ""
             yield "Caused by:"
-            for item in self.causes:
+            for item in causes:
                 yield _indent_prefix(item, prefix="--> ", indent="    ")
-        if self.note_stmt is not None or self.hint_stmt is not None:
+        if note_stmt is not None or hint_stmt is not None:
             yield ""
-        if self.note_stmt is not None:
-            yield _indent_prefix(self.note_stmt, prefix="note: ", indent="      ")
-        if self.hint_stmt is not None:
-            yield _indent_prefix(self.hint_stmt, prefix="hint: ", indent="      ")
-        if self.details_link is not None:
+        if note_stmt is not None:
+            yield _indent_prefix(note_stmt, prefix="note: ", indent="      ")
+        if hint_stmt is not None:
+            yield _indent_prefix(hint_stmt, prefix="hint: ", indent="      ")
+        if details_link is not None:
             yield ""
-            yield f"For more details, see {self.details_link}"
+            yield f"For more details, see {details_link}"
 
     def __rich_console__(
         self,
         console: rich.console.Console,
         options: rich.console.ConsoleOptions,
     ) -> rich.console.RenderResult:
+        message, causes, note_stmt, hint_stmt = self._resolve_deferred()
+        details_link = self.details_link
+        decorations = _tree_decorations(console, self.style)
+
         yield f"[{self.style.color} bold]{self.style.name}[/]: [bold]{self.code}[/]"
         yield ""
 
         if not options.ascii_only:
             # Present the main message, with relevant causes indented.
-            if self.causes:
-                yield _index_prefix_rich(
-                    self.message,
-                    console,
-                    prefix=f"[{self.style.color}]{self.style.unicode_symbol}[/] ",
-                    indent=f"[{self.style.color}]│[/] ",
-                )
-                for item in self.causes[:-1]:
-                    yield _index_prefix_rich(
-                        item,
-                        console,
-                        prefix=f"[{self.style.color}]├─>[/] ",
-                        indent=f"[{self.style.color}]│  [/] ",
-                    )
-                yield _index_prefix_rich(
-                    self.causes[-1],
-                    console,
-                    prefix=f"[{self.style.color}]╰─>[/] ",
-                    indent=f"[{self.style.color}]   [/] ",
-                )
+            if causes:
+                yield decorations.message_with_causes.apply(message)
+                for item in causes[:-1]:
+                    yield decorations.cause.apply(item)
+                yield decorations.last_cause.apply(causes[-1])
             else:
-                yield _index_prefix_rich(
-                    self.message,
-                    console,
-                    prefix=f"[{self.style.color}]×[/] ",
-                    indent="  ",
-                )
+                yield decorations.message.apply(message)
         else:
-            yield _ensure_text(self.message)
-            if self.causes:
+            yield _ensure_text(message)
+            if causes:
                 yield ""
-                for item in self.causes:
+                for item in causes:
                     yield _ensure_text(item)
 
-        if not (self.note_stmt is None and self.hint_stmt is None):
+        if not (note_stmt is None and hint_stmt is None):
             yield ""
 
-        if self.note_stmt is not None:
-            yield _index_prefix_rich(
-                self.note_stmt,
-                console,
-                prefix="[magenta bold]note[/]: ",
-                indent="      ",
-            )
-        if self.hint_stmt is not None:
-            yield _index_prefix_rich(
-                self.hint_stmt,
-                console,
-                prefix="[cyan bold]hint[/]: ",
-                indent="      ",
-            )
+        if note_stmt is not None:
+            yield decorations.note.apply(note_stmt)
+        if hint_stmt is not None:
+            yield decorations.hint.apply(hint_stmt)
 
-        if self.details_link is not None:
+        if details_link is not None:
             yield ""
-            yield f"For more details, see {self.details_link}"
+            yield f"For more details, see {details_link}"
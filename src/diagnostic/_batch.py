@@ -0,0 +1,98 @@
+"""Configuration for checking many projects at once, with check-docs."""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+@dataclasses.dataclass(frozen=True)
+class Project:
+    """A pair of source code and documentation to check against each other."""
+
+    name: str
+    source: Path
+    docs_index: Path
+    fail_on_extra: bool = True
+
+
+def _get(table: dict[str, Any], key: str, kind: type, *, where: str) -> Any:
+    value = table.get(key)
+    if value is not None and not isinstance(value, kind):
+        raise ValueError(f"Invalid {where}: {key!r} must be a {kind.__name__}")
+    return value
+
+
+def _project(
+    table: dict[str, Any], *, base: Path, fail_on_extra: bool, where: str
+) -> Project:
+    source = _get(table, "source", str, where=where)
+    docs_index = _get(table, "error-index", str, where=where)
+    if source is None or docs_index is None:
+        raise ValueError(f"Invalid {where}: 'source' and 'error-index' are required")
+
+    name = _get(table, "name", str, where=where)
+    project_fail_on_extra = _get(table, "fail-on-extra", bool, where=where)
+    return Project(
+        name=source if name is None else name,
+        source=base / source,
+        docs_index=base / docs_index,
+        fail_on_extra=(
+            fail_on_extra if project_fail_on_extra is None else project_fail_on_extra
+        ),
+    )
+
+
+def load_projects(pyproject: Path, *, fail_on_extra: bool = True) -> list[Project]:
+    """Load the projects to check, from the `[tool.diagnostic.check-docs]` table.
+
+    The table either describes a single project, or has a `projects` array of
+    tables that describe one each. Projects are described with `source` and
+    `error-index` paths (relative to the file), and optionally a `name` and
+    `fail-on-extra`. A `fail-on-extra` in the table applies to all its projects,
+    and `fail_on_extra` applies to those that do not set it either way.
+
+    Raises:
+        ValueError: If the file does not contain a valid configuration.
+    """
+    with open(pyproject, "rb") as f:
+        try:
+            data = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid TOML in {pyproject}: {e}") from e
+
+    config: Any = data.get("tool", {}).get("diagnostic", {}).get("check-docs")
+    if not isinstance(config, dict):
+        raise ValueError(f"No [tool.diagnostic.check-docs] table in {pyproject}")
+    config = cast("dict[str, Any]", config)
+
+    where = "[tool.diagnostic.check-docs]"
+    base = pyproject.parent
+    table_fail_on_extra = _get(config, "fail-on-extra", bool, where=where)
+    if table_fail_on_extra is not None:
+        fail_on_extra = table_fail_on_extra
+
+    projects: list[Any] | None = _get(config, "projects", list, where=where)
+    if projects is None:
+        return [_project(config, base=base, fail_on_extra=fail_on_extra, where=where)]
+
+    loaded: list[Project] = []
+    table: Any
+    for index, table in enumerate(projects):
+        project_where = f"{where} projects[{index}]"
+        if not isinstance(table, dict):
+            raise ValueError(f"Invalid {project_where}: must be a table")
+        table = cast("dict[str, Any]", table)
+        loaded.append(
+            _project(table, base=base, fail_on_extra=fail_on_extra, where=project_where)
+        )
+    return loaded
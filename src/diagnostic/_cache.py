@@ -0,0 +1,151 @@
+"""On-disk cache for the codes found in individual files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+from . import __version__
+from ._base import RE_code
+from ._git import blob_id
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from ._parsers import codeLocationMapping
+
+DEFAULT_CACHE_DIR = ".diagnostic-cache"
+# Changed whenever the layout of the entries changes.
+_FORMAT = "2"
+
+
+def _hash_file(file: Path) -> str:
+    # The same as git, so that entries can be checked against a revision.
+    return blob_id(file.read_bytes())
+
+
+class ScanCache:
+    """A cache of the codes found in files, stored as JSON in a directory.
+
+    Each entry is keyed by the file's path and validated against its mtime and
+    size. If those have changed, the content hash is compared before treating
+    the entry as stale. The whole cache is invalidated if the version of this
+    package or the pattern for codes changes.
+
+    The content hash is the blob id that git gives the file, so that entries
+    can also be validated against a git revision, without reading the files
+    (see :meth:`trust`).
+    """
+
+    def __init__(self, directory: Path | None, kind: str) -> None:
+        """
+        :param directory: The directory to store the cache in, or None to only
+            keep it in memory.
+        :param kind: What is being cached (eg: "sources"), used as the filename.
+        """
+        self.path = None if directory is None else directory / f"{kind}.json"
+        self.key = hashlib.sha256(
+            "\0".join([__version__, _FORMAT, RE_code.pattern, kind]).encode()
+        ).hexdigest()
+
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._pending_hashes: dict[str, str] = {}
+        self._trusted: Mapping[str, str] = {}
+        self._dirty = False
+
+        if self.path is None:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data: Any = json.load(f)
+            if data["key"] == self.key:
+                self._entries = data["files"]
+        except (OSError, ValueError, LookupError, TypeError):
+            # A missing or corrupted cache is the same as an empty one.
+            pass
+
+    def trust(self, blobs: Mapping[str, str]) -> None:
+        """Use the entries for files with known content, without checking the files.
+
+        An entry is used without a stat or a hash, if the file's content when it
+        was cached has the blob id given for it here.
+
+        :param blobs: The blob ids of the current content of files, by their
+            absolute paths (eg: of the files that git reports as unchanged since
+            a revision, see :func:`diagnostic._git.unchanged_files`).
+        """
+        self._trusted = blobs
+
+    def get(self, file: Path) -> codeLocationMapping | None:
+        """Get the codes for `file`, if the cached entry is still valid."""
+        name = os.path.abspath(file)
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+
+        trusted = self._trusted.get(name) == entry["blob"]
+        if not trusted and not self._is_current(name, file, entry):
+            return None
+
+        return {
+            code: [(file, lineno) for lineno in linenos]
+            for code, linenos in entry["codes"].items()
+        }
+
+    def _is_current(self, name: str, file: Path, entry: dict[str, Any]) -> bool:
+        stat = file.stat()
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            digest = _hash_file(file)
+            if entry["blob"] != digest:
+                self._pending_hashes[name] = digest
+                return False
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self._dirty = True
+        return True
+
+    def put(self, file: Path, codes: codeLocationMapping) -> None:
+        """Store the codes found in `file`."""
+        name = os.path.abspath(file)
+        stat = file.stat()
+        digest = self._pending_hashes.pop(name, None) or _hash_file(file)
+        self._entries[name] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "blob": digest,
+            "codes": {
+                code: [lineno for _, lineno in locations]
+                for code, locations in codes.items()
+            },
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk, if it has changed."""
+        if not self._dirty or self.path is None:
+            return
+
+        # Drop the entries for files that no longer exist.
+        entries = {
+            name: entry for name, entry in self._entries.items() if os.path.exists(name)
+        }
+
+        directory = self.path.parent
+        if not directory.exists():
+            directory.mkdir(parents=True)
+            (directory / ".gitignore").write_text("# Created by diagnostic\n*\n")
+
+        # Write atomically, so that concurrent runs do not see partial files.
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": self.key, "files": entries}, f)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self._dirty = False
@@ -3,18 +3,32 @@
 from __future__ import annotations
 
 import argparse
+import importlib.util
+import os
 import sys
+import time
 from pathlib import Path
 
 import rich
 import rich.text
-import rich.traceback
 from rich.markup import escape
 
 from . import DiagnosticError
-from ._parsers import find_code_headings_in_document, find_codes_in_sources
-
-rich.traceback.install(show_locals=True)
+from ._batch import Project, load_projects
+from ._cache import DEFAULT_CACHE_DIR, ScanCache
+from ._git import unchanged_files
+from ._parsers import (
+    ScanStats,
+    codeLocationMapping,
+    find_code_headings_in_document,
+    find_code_headings_in_many_documents,
+    find_codes_by_import,
+    find_codes_in_many_sources,
+    find_codes_in_sources,
+    stat_files,
+)
+from ._reports import REPORTS, Report
+from ._walk import PathFilter
 
 
 def _format_to_lines(
@@ -42,16 +56,76 @@ def _format_to_lines(
     return "\n".join(lines)
 
 
-def _process(
-    source: Path, docs_index: Path, verbose: bool, fail_on_extra: bool
-) -> None:
-    """Main entry point for the script."""
-    code_codes = find_codes_in_sources(source)
-    doc_codes = find_code_headings_in_document(docs_index)
+def _scan(
+    source: Path,
+    docs_index: Path,
+    *,
+    jobs: int = 1,
+    source_cache: ScanCache | None = None,
+    docs_cache: ScanCache | None = None,
+    strict_rst: bool = False,
+    path_filter: PathFilter | None = None,
+    package: str | None = None,
+) -> tuple[codeLocationMapping, codeLocationMapping, ScanStats]:
+    """Find the codes in the source code, and the headings in the documentation.
 
+    With `package`, the codes are found by importing it instead of parsing.
+    """
+    source_stats = ScanStats()
+    if package is not None:
+        code_codes = find_codes_by_import(package, source)
+    else:
+        code_codes = find_codes_in_sources(
+            source,
+            jobs=jobs,
+            cache=source_cache,
+            stats=source_stats,
+            path_filter=path_filter,
+        )
+    doc_codes = find_code_headings_in_document(
+        docs_index, cache=docs_cache, strict_rst=strict_rst, path_filter=path_filter
+    )
+    return code_codes, doc_codes, source_stats
+
+
+def _print_stats(source_stats: ScanStats) -> None:
+    rich.print(
+        f"Scanned {source_stats.files} source files: "
+        f"{source_stats.parsed} parsed, "
+        f"{source_stats.cached} from cache, "
+        f"{source_stats.skipped} skipped without any codes."
+    )
+
+
+def _mismatches(
+    code_codes: codeLocationMapping,
+    doc_codes: codeLocationMapping,
+    fail_on_extra: bool,
+) -> tuple[set[str], set[str]]:
+    """Get the undocumented codes, and the extra codes if those are failures."""
+    undocumented_codes = set(code_codes) - set(doc_codes)
+    if not fail_on_extra:
+        extra_codes: set[str] = set()
+    else:
+        extra_codes = set(doc_codes) - set(code_codes)
+    return undocumented_codes, extra_codes
+
+
+def _report(
+    docs_index: Path,
+    code_codes: codeLocationMapping,
+    doc_codes: codeLocationMapping,
+    source_stats: ScanStats | None,
+    verbose: bool,
+    fail_on_extra: bool,
+) -> None:
+    """Present the codes that were found, raising an error for any mismatches."""
     rich.print(f"Found {len(code_codes)} codes in the source code.")
     rich.print(f"Found {len(doc_codes)} codes in the documentation.")
     if verbose:
+        if source_stats is not None:
+            rich.get_console().rule()
+            _print_stats(source_stats)
         rich.get_console().rule()
         rich.print("codes in the source code")
         for code, locations in code_codes.items():
@@ -65,11 +139,7 @@ def _process(
             rich.print(f"  [green]{escape(code)}[/]: {escape(repr(linenos))}")
         rich.get_console().rule()
 
-    undocumented_codes = set(code_codes) - set(doc_codes)
-    if not fail_on_extra:
-        extra_codes: set[str] = set()
-    else:
-        extra_codes = set(doc_codes) - set(code_codes)
+    undocumented_codes, extra_codes = _mismatches(code_codes, doc_codes, fail_on_extra)
 
     if not undocumented_codes:
         rich.print("[bold green]All error codes in code are documented![/] :tada:")
@@ -114,6 +184,280 @@ def _process(
     )
 
 
+def _caches(
+    cache_dir: Path | None,
+    *,
+    strict_rst: bool,
+    unchanged: dict[str, str] | None = None,
+) -> tuple[ScanCache, ScanCache]:
+    source_cache = ScanCache(cache_dir, "sources")
+    if unchanged is not None:
+        source_cache.trust(unchanged)
+    # The headings found can differ with docutils, so cache them separately.
+    docs_cache = ScanCache(cache_dir, "docs-strict-rst" if strict_rst else "docs")
+    return source_cache, docs_cache
+
+
+def _process(
+    source: Path,
+    docs_index: Path,
+    verbose: bool,
+    fail_on_extra: bool,
+    *,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    strict_rst: bool = False,
+    path_filter: PathFilter | None = None,
+    unchanged: dict[str, str] | None = None,
+    package: str | None = None,
+) -> None:
+    """Main entry point for the script.
+
+    With `unchanged` (see :func:`_unchanged_files`), the cached codes for those
+    files are used without checking them, if they were cached with the same
+    content. With `package`, the codes are found by importing it instead of
+    parsing the source code.
+    """
+    if cache_dir is None:
+        source_cache = docs_cache = None
+    else:
+        source_cache, docs_cache = _caches(
+            cache_dir, strict_rst=strict_rst, unchanged=unchanged
+        )
+
+    code_codes, doc_codes, source_stats = _scan(
+        source,
+        docs_index,
+        jobs=jobs,
+        source_cache=source_cache,
+        docs_cache=docs_cache,
+        strict_rst=strict_rst,
+        path_filter=path_filter,
+        package=package,
+    )
+
+    if source_cache is not None and docs_cache is not None:
+        source_cache.save()
+        docs_cache.save()
+
+    _report(
+        docs_index,
+        code_codes,
+        doc_codes,
+        source_stats if package is None else None,
+        verbose,
+        fail_on_extra,
+    )
+
+
+def _process_to_report(
+    source: Path,
+    docs_index: Path,
+    fail_on_extra: bool,
+    report: Report,
+    *,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    strict_rst: bool = False,
+    path_filter: PathFilter | None = None,
+    unchanged: dict[str, str] | None = None,
+    package: str | None = None,
+) -> bool:
+    """Like :func:`_process`, but writing the results to a machine-readable report.
+
+    Returns:
+        Whether there were no undocumented (or extra) codes.
+    """
+    if cache_dir is None:
+        source_cache = docs_cache = None
+    else:
+        source_cache, docs_cache = _caches(
+            cache_dir, strict_rst=strict_rst, unchanged=unchanged
+        )
+
+    report.start()
+    if package is not None:
+        code_codes = find_codes_by_import(package, source)
+        report.codes(code_codes)
+    else:
+        code_codes = find_codes_in_sources(
+            source,
+            jobs=jobs,
+            cache=source_cache,
+            on_result=report.codes,
+            path_filter=path_filter,
+        )
+    doc_codes = find_code_headings_in_document(
+        docs_index,
+        cache=docs_cache,
+        strict_rst=strict_rst,
+        on_result=report.headings,
+        path_filter=path_filter,
+    )
+
+    if source_cache is not None and docs_cache is not None:
+        source_cache.save()
+        docs_cache.save()
+
+    undocumented_codes, extra_codes = _mismatches(code_codes, doc_codes, fail_on_extra)
+    for code in sorted(undocumented_codes):
+        report.undocumented(code, code_codes[code])
+    for code in sorted(extra_codes):
+        report.extra(code, doc_codes[code])
+    report.finish()
+
+    return not undocumented_codes and not extra_codes
+
+
+def _process_batch(
+    projects: list[Project],
+    verbose: bool,
+    *,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    strict_rst: bool = False,
+    path_filter: PathFilter | None = None,
+    unchanged: dict[str, str] | None = None,
+) -> bool:
+    """Check many projects, scanning all their files in a single pass.
+
+    Files that are shared between projects are only parsed once.
+
+    Returns:
+        Whether all the projects passed their checks.
+    """
+    # Always cache, so that documents are parsed once even when not shared.
+    source_cache, docs_cache = _caches(
+        cache_dir, strict_rst=strict_rst, unchanged=unchanged
+    )
+
+    source_stats = ScanStats()
+    all_code_codes = find_codes_in_many_sources(
+        [project.source for project in projects],
+        jobs=jobs,
+        cache=source_cache,
+        stats=source_stats,
+        path_filter=path_filter,
+    )
+    all_doc_codes = find_code_headings_in_many_documents(
+        [project.docs_index for project in projects],
+        cache=docs_cache,
+        strict_rst=strict_rst,
+        path_filter=path_filter,
+    )
+    source_cache.save()
+    docs_cache.save()
+
+    if verbose:
+        _print_stats(source_stats)
+
+    success = True
+    for project, code_codes, doc_codes in zip(projects, all_code_codes, all_doc_codes):
+        rich.get_console().rule(escape(project.name))
+        try:
+            _report(
+                project.docs_index,
+                code_codes,
+                doc_codes,
+                None,
+                verbose,
+                project.fail_on_extra,
+            )
+        except DiagnosticError as e:
+            rich.print(e, file=sys.stderr)
+            success = False
+    return success
+
+
+class _Watcher:
+    """Detect changes to the files that would be scanned, by polling them."""
+
+    def __init__(
+        self, source: Path, docs_index: Path, path_filter: PathFilter | None = None
+    ) -> None:
+        self.source = source
+        self.docs_index = docs_index
+        self.path_filter = path_filter
+        self._states: dict[Path, tuple[int, int]] | None = None
+
+    def poll(self) -> bool:
+        """Check whether any files were added, removed or changed since last time.
+
+        This is always true, the first time that it is called.
+        """
+        states = stat_files(
+            self.source, extensions=(".py",), path_filter=self.path_filter
+        )
+        states.update(
+            stat_files(
+                self.docs_index,
+                extensions=(".md", ".rst"),
+                path_filter=self.path_filter,
+            )
+        )
+        if states == self._states:
+            return False
+        self._states = states
+        return True
+
+
+def _watch(
+    source: Path,
+    docs_index: Path,
+    verbose: bool,
+    fail_on_extra: bool,
+    *,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    strict_rst: bool = False,
+    path_filter: PathFilter | None = None,
+    interval: float = 0.2,
+) -> None:
+    """Re-check the codes whenever any of the files change, until interrupted.
+
+    The codes found in each file are kept in memory between checks, so only the
+    files that have changed are parsed again. Files that can not be read or
+    parsed are reported, and checked again when they change.
+    """
+    source_cache, docs_cache = _caches(cache_dir, strict_rst=strict_rst)
+    watcher = _Watcher(source, docs_index, path_filter)
+    console = rich.get_console()
+
+    while True:
+        if watcher.poll():
+            console.rule(time.strftime("%H:%M:%S"))
+            try:
+                code_codes, doc_codes, source_stats = _scan(
+                    source,
+                    docs_index,
+                    jobs=jobs,
+                    source_cache=source_cache,
+                    docs_cache=docs_cache,
+                    strict_rst=strict_rst,
+                    path_filter=path_filter,
+                )
+                source_cache.save()
+                docs_cache.save()
+                _report(
+                    docs_index,
+                    code_codes,
+                    doc_codes,
+                    source_stats,
+                    verbose,
+                    fail_on_extra,
+                )
+            except DiagnosticError as e:
+                rich.print(e, file=sys.stderr)
+            except (SyntaxError, UnicodeDecodeError, OSError) as e:
+                # eg: a file saved part way through an edit. It is not cached,
+                # so it is parsed again once it changes.
+                rich.print(escape(f"{type(e).__name__}: {e}"), file=sys.stderr)
+            rich.print("[dim]Watching for changes...[/]")
+            # Only a few files change at a time, so a process pool does not help.
+            jobs = 1
+        time.sleep(interval)
+
+
 def _get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="diagnostic.check-docs",
@@ -125,13 +469,23 @@ def _get_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "source",
         metavar="source",
+        nargs="?",
         help="Path to the source code file or directory.",
     )
     parser.add_argument(
         "docs_index",
         metavar="error-index",
+        nargs="?",
         help="Path to the documentation file or directory serving as the error index.",
     )
+    parser.add_argument(
+        "--config",
+        metavar="PYPROJECT",
+        help=(
+            "Check every project in the [tool.diagnostic.check-docs] table of "
+            "this file, instead of a single source and error-index."
+        ),
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -141,25 +495,124 @@ def _get_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--fail-on-extra",
         dest="fail_on_extra",
-        default=True,
         action=argparse.BooleanOptionalAction,
         help=(
             "Fail if there are codes in the documentation headings, that are "
-            "not in the source code."
+            "not in the source code (the default). With --config, this only "
+            "applies to the projects that do not set `fail-on-extra`."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes to use, for parsing the source code.",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help=(
+            "Cache the codes found in each file, and only re-parse files that "
+            "have changed since the last run."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory to store the cache in.",
+    )
+    parser.add_argument(
+        "--discover",
+        metavar="{ast,import:PACKAGE}",
+        default="ast",
+        help=(
+            "How to find the codes in the source code: by parsing it, or by "
+            "importing every module of PACKAGE and using the diagnostic classes "
+            "defined within the source. Importing only finds codes set in class "
+            "definitions."
+        ),
+    )
+    parser.add_argument(
+        "--changed-since",
+        dest="changed_since",
+        metavar="REVISION",
+        help=(
+            "Use the cached codes of the source files that git reports as "
+            "unchanged since this revision, without checking the files, if they "
+            "were cached with the content they have in it."
+        ),
+    )
+    parser.add_argument(
+        "--strict-rst",
+        dest="strict_rst",
+        action="store_true",
+        help=(
+            "Find headings in reStructuredText documents by fully parsing them "
+            "with docutils, rather than scanning them for section titles."
         ),
     )
-    parser.set_defaults(fail_on_extra=True)
+    parser.add_argument(
+        "--include",
+        metavar="GLOB",
+        action="append",
+        default=[],
+        help=(
+            "Only check the files matching this gitignore-style pattern, within "
+            "the source and error-index directories. Can be repeated."
+        ),
+    )
+    parser.add_argument(
+        "--exclude",
+        metavar="GLOB",
+        action="append",
+        default=[],
+        help=(
+            "Skip the files and directories matching this gitignore-style "
+            "pattern, within the source and error-index directories. Can be "
+            "repeated."
+        ),
+    )
+    parser.add_argument(
+        "--gitignore",
+        dest="gitignore",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Skip the files and directories that are ignored by git.",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=["text", *REPORTS],
+        default="text",
+        help=(
+            "Format to present the results in. Other than text, results are "
+            "written to stdout as they are found, and nothing else is."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running, and check again whenever the source code or "
+            "documentation changes."
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=0.2,
+        help="Seconds between checks for changes, with --watch.",
+    )
     return parser
 
 
-def main() -> None:
-    """Main entry point for the script."""
-    parser = _get_parser()
-    args = parser.parse_args()
-
-    source = Path(args.source)
-    docs_index = Path(args.docs_index)
-
+def _check_paths(source: Path, docs_index: Path) -> None:
+    """Exit with an error message, if the paths can not be checked."""
     if not source.exists():
         rich.print(f"Source {source} does not exist.", file=sys.stderr)
         sys.exit(1)
@@ -177,8 +630,148 @@ def main() -> None:
         )
         sys.exit(1)
 
+
+def _discover_package(discover: str) -> str | None:
+    """Exit with an error message, if the package to import can not be found."""
+    if discover == "ast":
+        return None
+    package = discover.removeprefix("import:")
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        rich.print(f"Package {escape(package)} can not be imported.", file=sys.stderr)
+        sys.exit(1)
+    return package
+
+
+def _unchanged_files(
+    revision: str | None, sources: list[Path]
+) -> dict[str, str] | None:
+    """Exit with an error message, if the unchanged files can not be found."""
+    if revision is None:
+        return None
+    unchanged: dict[str, str] = {}
     try:
-        _process(source, docs_index, args.verbose, args.fail_on_extra)
+        for source in sources:
+            unchanged.update(unchanged_files(revision, source))
+    except ValueError as e:
+        rich.print(escape(str(e)), file=sys.stderr)
+        sys.exit(1)
+    return unchanged
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    import rich.traceback
+
+    rich.traceback.install(show_locals=True)
+
+    parser = _get_parser()
+    args = parser.parse_args()
+    cache_dir = Path(args.cache_dir) if args.cache else None
+    path_filter = PathFilter(
+        include=tuple(args.include),
+        exclude=tuple(args.exclude),
+        gitignore=args.gitignore,
+    )
+    if args.discover != "ast" and not (
+        args.discover.startswith("import:") and args.discover != "import:"
+    ):
+        parser.error("--discover must be 'ast' or 'import:PACKAGE'")
+    if args.discover != "ast" and (args.watch or args.config is not None):
+        parser.error("--discover can not be used with --watch or --config")
+    if args.changed_since is not None:
+        if cache_dir is None:
+            parser.error("--changed-since can not be used with --no-cache")
+        if args.watch:
+            parser.error("--changed-since can not be used with --watch")
+
+    if args.config is not None:
+        if args.source is not None or args.docs_index is not None:
+            parser.error("--config can not be used with source or error-index")
+        if args.watch or args.output_format != "text":
+            parser.error("--config can only be used with --format=text")
+        try:
+            projects = load_projects(
+                Path(args.config),
+                fail_on_extra=args.fail_on_extra is not False,
+            )
+        except (OSError, ValueError) as e:
+            rich.print(escape(str(e)), file=sys.stderr)
+            sys.exit(1)
+        for project in projects:
+            _check_paths(project.source, project.docs_index)
+        unchanged = _unchanged_files(
+            args.changed_since, [project.source for project in projects]
+        )
+        success = _process_batch(
+            projects,
+            args.verbose,
+            jobs=args.jobs,
+            cache_dir=cache_dir,
+            strict_rst=args.strict_rst,
+            path_filter=path_filter,
+            unchanged=unchanged,
+        )
+        sys.exit(0 if success else 1)
+
+    if args.source is None or args.docs_index is None:
+        parser.error("the following arguments are required: source, error-index")
+    fail_on_extra = args.fail_on_extra is not False
+    source = Path(args.source)
+    docs_index = Path(args.docs_index)
+    _check_paths(source, docs_index)
+    unchanged = _unchanged_files(args.changed_since, [source])
+    package = _discover_package(args.discover)
+
+    if args.output_format != "text":
+        if args.watch:
+            parser.error("--watch can only be used with --format=text")
+        success = _process_to_report(
+            source,
+            docs_index,
+            fail_on_extra,
+            REPORTS[args.output_format](sys.stdout),
+            jobs=args.jobs,
+            cache_dir=cache_dir,
+            strict_rst=args.strict_rst,
+            path_filter=path_filter,
+            unchanged=unchanged,
+            package=package,
+        )
+        sys.exit(0 if success else 1)
+
+    if args.watch:
+        try:
+            _watch(
+                source,
+                docs_index,
+                args.verbose,
+                fail_on_extra,
+                jobs=args.jobs,
+                cache_dir=cache_dir,
+                strict_rst=args.strict_rst,
+                path_filter=path_filter,
+                interval=args.watch_interval,
+            )
+        except KeyboardInterrupt:
+            sys.exit(130)
+
+    try:
+        _process(
+            source,
+            docs_index,
+            args.verbose,
+            fail_on_extra,
+            jobs=args.jobs,
+            cache_dir=cache_dir,
+            strict_rst=args.strict_rst,
+            path_filter=path_filter,
+            unchanged=unchanged,
+            package=package,
+        )
     except DiagnosticError as e:
         rich.print(e, file=sys.stderr)
         sys.exit(1)
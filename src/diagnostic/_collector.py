@@ -0,0 +1,209 @@
+"""Presenting the diagnostics of many workers, through a single console."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Protocol, TextIO, cast
+
+from ._base import _text_identity  # pyright: ignore[reportPrivateUsage]
+from ._group import DiagnosticGroup, dump_plain
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from types import TracebackType
+
+    import rich.console
+
+    from ._base import Diagnostic
+
+
+class _Queue(Protocol):
+    """The parts of :class:`queue.Queue` and :class:`multiprocessing.Queue` used."""
+
+    def put(self, item: Any, /) -> None: ...
+
+    def get(self, block: bool = True, timeout: float | None = None) -> object: ...
+
+
+class DiagnosticCollector:
+    """Present the diagnostics of many workers together, from a single thread.
+
+    Workers put their diagnostics on :attr:`queue`, instead of presenting them.
+    This is a :class:`queue.Queue` by default, for worker threads; pass a
+    :class:`multiprocessing.Queue` for worker processes (diagnostics can be
+    pickled). While the collector is running, a thread in the presenting
+    process takes the diagnostics off the queue and presents them in batches,
+    so that the output of different workers never interleaves.
+
+    A batch is presented once it has `batch_size` diagnostics, or once its first
+    diagnostic has waited for `interval` seconds. Consecutive diagnostics are
+    separated by a blank line, as with :func:`render_many`.
+
+    This is a context manager, which starts the collector on entry and closes it
+    on exit.
+    """
+
+    queue: _Queue
+    """The queue that workers put their diagnostics on."""
+
+    presented: int
+    """The number of diagnostics presented so far."""
+
+    duplicates: int
+    """The number of diagnostics skipped so far, as duplicates."""
+
+    def __init__(
+        self,
+        queue: _Queue | None = None,
+        *,
+        console: rich.console.Console | None = None,
+        stream: TextIO | None = None,
+        deduplicate: bool = True,
+        batch_size: int = 100,
+        interval: float = 0.1,
+    ) -> None:
+        """
+        :param queue: The queue that workers put their diagnostics on. Defaults
+            to a new :class:`queue.Queue`.
+        :param console: The console to present on. Defaults to the global console
+            used by :func:`rich.print`.
+        :param stream: A text stream to write the plain-text presentation to (see
+            :meth:`Diagnostic.write_plain`), instead of presenting on a console.
+        :param deduplicate: Only present the first of the diagnostics with the
+            same code and message.
+        :param batch_size: The most diagnostics to present at once.
+        :param interval: The longest time, in seconds, that a diagnostic waits
+            to be presented while the collector is running.
+        """
+        if console is not None and stream is not None:
+            raise ValueError(
+                "Cannot create DiagnosticCollector with both console and stream"
+            )
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be at least 1, not {batch_size}")
+
+        self.queue = queue if queue is not None else _new_queue()
+        self.presented = 0
+        self.duplicates = 0
+
+        self._console = console
+        self._stream = stream
+        self._deduplicate = deduplicate
+        self._batch_size = batch_size
+        self._interval = interval
+        self._seen: set[Hashable] = set()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.presented} presented)>"
+
+    def submit(self, diagnostic: Diagnostic) -> None:
+        """Put a diagnostic on the queue, to be presented."""
+        self.queue.put(diagnostic)
+
+    def start(self) -> None:
+        """Start presenting the diagnostics from the queue, in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("DiagnosticCollector can only be started once")
+        self._thread = threading.Thread(
+            target=self._run, name="DiagnosticCollector", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Present the remaining diagnostics on the queue, and stop.
+
+        Diagnostics put on the queue before this is called are all presented. If
+        the collector was never started, they are presented in this thread.
+        """
+        self.queue.put(None)
+        if self._thread is None:
+            self._run()
+        else:
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> DiagnosticCollector:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        try:
+            self._drain()
+        except BaseException as e:
+            self._error = e
+
+    def _drain(self) -> None:
+        batch: list[Diagnostic] = []
+        deadline: float | None = None
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:  # the batch has waited for long enough
+                self._present(batch)
+                batch, deadline = [], None
+                continue
+
+            if item is None:
+                self._present(batch)
+                return
+            diagnostic = cast("Diagnostic", item)
+            if self._is_duplicate(diagnostic):
+                continue
+            batch.append(diagnostic)
+            if deadline is None:
+                deadline = time.monotonic() + self._interval
+            if len(batch) >= self._batch_size:
+                self._present(batch)
+                batch, deadline = [], None
+
+    def _is_duplicate(self, diagnostic: Diagnostic) -> bool:
+        if not self._deduplicate:
+            return False
+        message = diagnostic._resolve_deferred()[0]  # pyright: ignore[reportPrivateUsage]
+        key = (diagnostic.code, _text_identity(message, presented=True))
+        if key in self._seen:
+            self.duplicates += 1
+            return True
+        self._seen.add(key)
+        return False
+
+    def _present(self, batch: list[Diagnostic]) -> None:
+        if not batch:
+            return
+        if self._stream is not None:
+            if self.presented:
+                self._stream.write("\n")
+            dump_plain(batch, self._stream)
+            self._stream.flush()
+        else:
+            import rich
+
+            console = self._console if self._console is not None else rich.get_console()
+            if self.presented:
+                console.print()
+            console.print(DiagnosticGroup(batch))
+        self.presented += len(batch)
+
+
+def _new_queue() -> _Queue:
+    return queue.Queue["Diagnostic | None"]()
+
+
+# Don't expose the private module name.
+DiagnosticCollector.__module__ = "diagnostic"
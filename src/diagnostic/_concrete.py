@@ -1,6 +1,6 @@
 """Concrete classes for diagnostic objects, for use in standard Python toolchain."""
 
-from ._base import Diagnostic, DiagnosticStyle
+from ._base import _SLOTS, Diagnostic, DiagnosticStyle  # pyright: ignore[reportPrivateUsage]
 
 
 class DiagnosticError(Diagnostic, Exception):
@@ -11,6 +11,8 @@ class DiagnosticError(Diagnostic, Exception):
     `rich` to get a pretty presentation of the error.
     """
 
+    __slots__ = _SLOTS
+
     style = DiagnosticStyle(
         name="error",
         color="red",
@@ -25,6 +27,8 @@ class DiagnosticWarning(Diagnostic, Warning):
     This is a subclass of Warning and can be used as a normal warning, with
     the typical"""
 
+    __slots__ = _SLOTS
+
     style = DiagnosticStyle(
         name="warning",
         color="yellow",
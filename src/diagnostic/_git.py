@@ -0,0 +1,90 @@
+"""Finding the files that have changed, according to git."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _git(*args: str, cwd: str) -> str:
+    """Run a git command, and get its output."""
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, check=True
+        )
+    except FileNotFoundError as e:
+        raise ValueError("Could not run git, is it installed?") from e
+    except subprocess.CalledProcessError as e:
+        stderr = os.fsdecode(e.stderr).strip()
+        raise ValueError(f"git {args[0]} failed: {stderr}") from e
+    return os.fsdecode(result.stdout)
+
+
+def _toplevel(path: Path) -> str:
+    directory = os.path.abspath(path if path.is_dir() else path.parent)
+    # Relative to `directory`, to keep its spelling (eg: through symlinks).
+    cdup = _git("rev-parse", "--show-cdup", cwd=directory).rstrip("\n")
+    return os.path.normpath(os.path.join(directory, cdup))
+
+
+def _changed_files(revision: str, toplevel: str) -> set[str]:
+    output = _git("diff", "--name-only", "-z", revision, "--", cwd=toplevel)
+    output += _git("ls-files", "--others", "--exclude-standard", "-z", cwd=toplevel)
+    return {
+        os.path.normpath(os.path.join(toplevel, name))
+        for name in output.split("\0")
+        if name
+    }
+
+
+def changed_files(revision: str, path: Path) -> set[str]:
+    """Get the files changed since `revision`, in the repository containing `path`.
+
+    This includes the changes that are staged or only in the working tree, as
+    well as untracked files that are not ignored. The files are given as
+    absolute paths, the same as :func:`os.path.abspath` would give for them.
+
+    Raises:
+        ValueError: If `path` is not in a git repository, or git fails otherwise
+            (eg: for an unknown `revision`).
+    """
+    return _changed_files(revision, _toplevel(path))
+
+
+def unchanged_files(revision: str, path: Path) -> dict[str, str]:
+    """Get the files not changed since `revision`, with their git blob ids.
+
+    These are the files in `revision`, of the repository containing `path`, that
+    are not in :func:`changed_files`. So the blob id (see :func:`blob_id`) of
+    each one is that of its content in the working tree too, unless git filters
+    the content (eg: converting line endings).
+
+    Raises:
+        ValueError: If `path` is not in a git repository, or git fails otherwise
+            (eg: for an unknown `revision`).
+    """
+    toplevel = _toplevel(path)
+    changed = _changed_files(revision, toplevel)
+    output = _git("ls-tree", "-r", "-z", "--full-tree", revision, cwd=toplevel)
+
+    unchanged: dict[str, str] = {}
+    for line in output.split("\0"):
+        if not line:
+            continue
+        info, _, name = line.partition("\t")
+        _, kind, blob = info.split(" ")
+        file = os.path.normpath(os.path.join(toplevel, name))
+        if kind == "blob" and file not in changed:
+            unchanged[file] = blob
+    return unchanged
+
+
+def blob_id(content: bytes) -> str:
+    """Get the id that git gives to a file with `content`."""
+    header = f"blob {len(content)}\0".encode()
+    return hashlib.sha1(header + content, usedforsecurity=False).hexdigest()
@@ -0,0 +1,120 @@
+"""Presenting many diagnostic objects together."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Iterator
+
+    import rich.console
+
+    from ._base import Diagnostic
+
+
+class DiagnosticGroup:
+    """A renderable that presents multiple diagnostics, in a single console pass.
+
+    This is useful when presenting a large number of diagnostics, since it
+    avoids going through the console's printing machinery for each one of them.
+    Consecutive diagnostics are separated by a blank line.
+    """
+
+    diagnostics: list[Diagnostic]
+    """The diagnostics to present, in the order that they'll be presented in."""
+
+    def __init__(
+        self,
+        diagnostics: Iterable[Diagnostic],
+        *,
+        group_by_code: bool = False,
+        deduplicate: bool = False,
+    ) -> None:
+        """
+        :param diagnostics: The diagnostics to present.
+        :param group_by_code: Present diagnostics with the same code together,
+            ordered by the first occurrence of each code.
+        :param deduplicate: Only present the first of any diagnostics that would
+            be presented identically.
+        """
+        if deduplicate:
+            diagnostics = _deduplicated(diagnostics)
+        if group_by_code:
+            diagnostics = _grouped_by_code(diagnostics)
+        self.diagnostics = list(diagnostics)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({len(self.diagnostics)} diagnostics)>"
+
+    def __rich_console__(
+        self,
+        console: rich.console.Console,
+        options: rich.console.ConsoleOptions,
+    ) -> rich.console.RenderResult:
+        for index, diagnostic in enumerate(self.diagnostics):
+            if index:
+                yield ""
+            yield from diagnostic.__rich_console__(console, options)
+
+
+def _deduplicated(diagnostics: Iterable[Diagnostic]) -> Iterator[Diagnostic]:
+    seen: set[Hashable] = set()
+    for diagnostic in diagnostics:
+        identity = diagnostic._identity(presented=True)  # pyright: ignore[reportPrivateUsage]
+        if identity not in seen:
+            seen.add(identity)
+            yield diagnostic
+
+
+def _grouped_by_code(diagnostics: Iterable[Diagnostic]) -> Iterator[Diagnostic]:
+    groups: dict[str | None, list[Diagnostic]] = {}
+    for diagnostic in diagnostics:
+        groups.setdefault(diagnostic.code, []).append(diagnostic)
+    for group in groups.values():
+        yield from group
+
+
+def render_many(
+    diagnostics: Iterable[Diagnostic],
+    *,
+    console: rich.console.Console | None = None,
+    group_by_code: bool = False,
+    deduplicate: bool = False,
+) -> None:
+    """Present multiple diagnostics, in a single console pass.
+
+    :param diagnostics: The diagnostics to present.
+    :param console: The console to present on. Defaults to the global console
+        used by :func:`rich.print`.
+    :param group_by_code: See :class:`DiagnosticGroup`.
+    :param deduplicate: See :class:`DiagnosticGroup`.
+    """
+    import rich
+
+    if console is None:
+        console = rich.get_console()
+    console.print(
+        DiagnosticGroup(
+            diagnostics, group_by_code=group_by_code, deduplicate=deduplicate
+        )
+    )
+
+
+def dump_plain(diagnostics: Iterable[Diagnostic], stream: TextIO) -> None:
+    """Write the plain-text presentation of multiple diagnostics to a stream.
+
+    Each diagnostic is written as it would be by :meth:`Diagnostic.write_plain`,
+    followed by a newline. Consecutive diagnostics are separated by a blank line.
+
+    :param diagnostics: The diagnostics to write.
+    :param stream: The text stream to write to.
+    """
+    for index, diagnostic in enumerate(diagnostics):
+        if index:
+            stream.write("\n")
+        diagnostic.write_plain(stream)
+        stream.write("\n")
+
+
+# Don't expose the private module name.
+DiagnosticGroup.__module__ = "diagnostic"
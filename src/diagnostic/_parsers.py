@@ -1,143 +1,615 @@
 """Supporting functions for parsing the source code and documentation."""
 
 import ast
+import bisect
+import concurrent.futures
+import dataclasses
+import functools
+import importlib
+import mmap
 import os
+import pkgutil
+import re
+import sys
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Sequence
 from pathlib import Path
-from typing import Any, TypeAlias, cast
+from typing import TYPE_CHECKING, Any, TypeAlias, cast
 
-import docutils.core
 import rich
-from markdown_it import MarkdownIt
 from rich.markup import escape
 
 from ._base import RE_code
+from ._registry import registered_classes, registered_codes
+from ._walk import PathFilter
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
+
+    from ._cache import ScanCache
 
 codeLocationMapping: TypeAlias = "dict[str, list[tuple[Path, int]]]"
 
 
 def _ignoring(*, ctx: str, what: str, why: str, where: "tuple[Path, int]") -> None:
-    rich.print(f"[yellow]Ignoring {escape(what)}[/]")
-    rich.print(f"  [magenta]{escape(str(where[0]))}[/]:[cyan]{where[1]}[/]")
-    rich.print(f"  [blue]{ctx}[/]: {escape(why)}")
+    # Written to stderr, to keep stdout for the results.
+    rich.print(
+        f"[yellow]Ignoring {escape(what)}[/]\n"
+        f"  [magenta]{escape(str(where[0]))}[/]:[cyan]{where[1]}[/]\n"
+        f"  [blue]{ctx}[/]: {escape(why)}",
+        file=sys.stderr,
+    )
 
 
-def handle_directory_traversal(
+@dataclasses.dataclass
+class ScanStats:
+    """Counts of how the files were handled, during a traversal."""
+
+    files: int = 0
+    cached: int = 0
+    skipped: int = 0
+    parsed: int = 0
+
+
+def _iter_files(
     path: Path,
-    func: Callable[[Path], codeLocationMapping],
     *,
     extensions: "tuple[str, ...]",
-) -> codeLocationMapping:
+    path_filter: "PathFilter | None" = None,
+) -> Iterator[Path]:
+    """Yield the files within `path`, in a deterministic order."""
+    if path_filter is None:
+        path_filter = PathFilter()
+    return path_filter.iter_files(path, extensions=extensions)
+
+
+def stat_files(
+    path: Path,
+    *,
+    extensions: "tuple[str, ...]",
+    path_filter: "PathFilter | None" = None,
+) -> dict[Path, tuple[int, int]]:
+    """Get the modification time and size of the files that would be traversed.
+
+    This covers `path`, or every file with one of `extensions` within it, the
+    same as :func:`handle_directory_traversal`.
+    """
+    files = (
+        [path]
+        if not path.is_dir()
+        else _iter_files(path, extensions=extensions, path_filter=path_filter)
+    )
+
+    states: dict[Path, tuple[int, int]] = {}
+    for file in files:
+        try:
+            stat = file.stat()
+        except FileNotFoundError:  # deleted, since it was listed
+            continue
+        states[file] = (stat.st_mtime_ns, stat.st_size)
+    return states
+
+
+def _map_files(
+    func: Callable[[Path], codeLocationMapping], files: "list[Path]", *, jobs: int
+) -> Iterator[codeLocationMapping]:
+    """Call `func` on every file, across `jobs` processes, preserving order."""
+    if jobs <= 1 or len(files) <= 1:
+        yield from map(func, files)
+        return
+
+    jobs = min(jobs, len(files))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Batch the files, to amortise the cost of inter-process communication.
+        chunksize = max(1, len(files) // (jobs * 4))
+        yield from executor.map(func, files, chunksize=chunksize)
+
+
+def _list_files(
+    path: Path,
+    *,
+    extensions: "tuple[str, ...]",
+    path_filter: "PathFilter | None",
+) -> "list[Path]":
     if not path.is_dir():
         assert path.name.endswith(extensions), (
             f"expected {path} to end with one of {extensions}"
         )
-        return func(path)
+        return [path]
+    return list(_iter_files(path, extensions=extensions, path_filter=path_filter))
+
+
+def _scan_files(
+    files: "list[Path]",
+    func: Callable[[Path], codeLocationMapping],
+    *,
+    jobs: int,
+    cache: "ScanCache | None",
+    prefilter: "Callable[[Path], bool] | None",
+    stats: ScanStats | None,
+) -> Iterator[codeLocationMapping]:
+    """Get the codes in each of `files`, in order. See handle_directory_traversal."""
+    if stats is None:
+        stats = ScanStats()
+    stats.files += len(files)
+
+    found: list[codeLocationMapping | None] = []
+    for file in files:
+        these_codes: codeLocationMapping | None = (
+            None if cache is None else cache.get(file)
+        )
+        if these_codes is not None:
+            stats.cached += 1
+        elif prefilter is not None and not prefilter(file):
+            stats.skipped += 1
+            these_codes = {}
+            if cache is not None:
+                # Replacing any stale entry, so it is not checked every time.
+                cache.put(file, these_codes)
+        found.append(these_codes)
+
+    missing = [file for file, these_codes in zip(files, found) if these_codes is None]
+    stats.parsed += len(missing)
+    parsed = _map_files(func, missing, jobs=jobs)
+
+    for file, these_codes in zip(files, found):
+        if these_codes is None:
+            these_codes = next(parsed)
+            if cache is not None:
+                cache.put(file, these_codes)
+        yield these_codes
+
+
+def handle_directory_traversal(
+    path: Path,
+    func: Callable[[Path], codeLocationMapping],
+    *,
+    extensions: "tuple[str, ...]",
+    jobs: int = 1,
+    cache: "ScanCache | None" = None,
+    prefilter: "Callable[[Path], bool] | None" = None,
+    stats: ScanStats | None = None,
+    on_result: "Callable[[codeLocationMapping], None] | None" = None,
+    path_filter: "PathFilter | None" = None,
+) -> codeLocationMapping:
+    """Call `func` on `path`, or every file with one of `extensions` within it.
+
+    Directories are walked with `path_filter`, which defaults to skipping the
+    files ignored by git and the directories in DEFAULT_EXCLUDES.
+
+    With `jobs` greater than 1, files are processed in a pool of that many
+    processes; `func` must be picklable in that case. The results are merged in
+    the same order regardless.
+
+    With a `cache`, `func` is only called for files without a valid entry in it.
+    With a `prefilter`, `func` is only called for files that it returns True for;
+    other files are treated as having no codes.
+
+    With `on_result`, the codes found in each file are also passed to it as soon
+    as they are available, in the same order that they are merged in.
+    """
+    files = _list_files(path, extensions=extensions, path_filter=path_filter)
+    results = _scan_files(
+        files, func, jobs=jobs, cache=cache, prefilter=prefilter, stats=stats
+    )
 
     codes: codeLocationMapping = defaultdict(list)
-    for dirpath, _, filenames in os.walk(path):
-        for filename in filenames:
-            if filename.endswith(extensions):
-                these_codes = func(Path(dirpath) / filename)
-                for code, locations in these_codes.items():
-                    codes[code].extend(locations)
+    for these_codes in results:
+        if on_result is not None and these_codes:
+            on_result(these_codes)
+        for code, locations in these_codes.items():
+            codes[code].extend(locations)
     return codes
 
 
-def find_codes_in_sources(src_path: Path) -> codeLocationMapping:
+def handle_many_directory_traversals(
+    paths: "Sequence[Path]",
+    func: Callable[[Path], codeLocationMapping],
+    *,
+    extensions: "tuple[str, ...]",
+    jobs: int = 1,
+    cache: "ScanCache | None" = None,
+    prefilter: "Callable[[Path], bool] | None" = None,
+    stats: ScanStats | None = None,
+    path_filter: "PathFilter | None" = None,
+) -> "list[codeLocationMapping]":
+    """Like :func:`handle_directory_traversal`, for each of `paths` at once.
+
+    All the files are processed in a single pass, and files that are within more
+    than one of the `paths` are only processed once. Their locations are reported
+    relative to each of the `paths` they're within.
+    """
+    files_per_path = [
+        _list_files(path, extensions=extensions, path_filter=path_filter)
+        for path in paths
+    ]
+
+    unique_files: dict[str, Path] = {}
+    for files in files_per_path:
+        for file in files:
+            unique_files.setdefault(os.path.abspath(file), file)
+    results = dict(
+        zip(
+            unique_files,
+            _scan_files(
+                list(unique_files.values()),
+                func,
+                jobs=jobs,
+                cache=cache,
+                prefilter=prefilter,
+                stats=stats,
+            ),
+        )
+    )
+
+    mappings: list[codeLocationMapping] = []
+    for files in files_per_path:
+        codes: codeLocationMapping = defaultdict(list)
+        for file in files:
+            for code, locations in results[os.path.abspath(file)].items():
+                codes[code].extend((file, lineno) for _, lineno in locations)
+        mappings.append(codes)
+    return mappings
+
+
+def _may_contain_code(file: Path) -> bool:
+    """Cheaply check whether `file` could contain a code, without parsing it.
+
+    Every way that a code is found involves the name `code`, so files that do not
+    contain that anywhere can not contain a code either.
+    """
+    with open(file, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+                return contents.find(b"code") != -1
+        except ValueError:  # empty files can not be memory-mapped
+            return False
+
+
+_RE_code_name = re.compile(r"\bcode\b")
+_RE_definition = re.compile(r"(class|def|async[ \t]+def)[ \t]+([A-Za-z_][A-Za-z0-9_]*)")
+
+
+class _CodeFinder(ast.NodeVisitor):
+    """Find the codes in a module, only descending into nodes that can have them.
+
+    Every pattern that is recognised involves the name `code`, so any node that
+    does not span a line containing that name is skipped along with its children.
+    """
+
+    def __init__(self, file: Path, candidate_lines: "list[int]") -> None:
+        self.file = file
+        self.candidate_lines = candidate_lines
+        self.codes: codeLocationMapping = defaultdict(list)
+
+    def _may_contain_code(self, node: ast.AST) -> bool:
+        start: int | None = getattr(node, "lineno", None)
+        if start is None:
+            return True
+        end: int = getattr(node, "end_lineno", None) or start
+        # Decorators come before the `def`/`class` line, that the node starts at.
+        decorators: list[ast.expr] = getattr(node, "decorator_list", [])
+        if decorators:
+            start = min(start, *(decorator.lineno for decorator in decorators))
+        index = bisect.bisect_left(self.candidate_lines, start)
+        return index < len(self.candidate_lines) and self.candidate_lines[index] <= end
+
+    def _record(self, ctx: str, value: ast.expr, lineno: int) -> None:
+        if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+            return
+        ref = value.value
+        if not RE_code.match(ref):
+            _ignoring(
+                ctx=ctx,
+                what=f"{ref!r}",
+                why="not a valid code",
+                where=(self.file, lineno),
+            )
+            return
+        self.codes[ref].append((self.file, lineno))
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if self._may_contain_code(child):
+                self.visit(child)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        for attr in node.body:
+            if (
+                isinstance(attr, ast.Assign)
+                and len(attr.targets) == 1
+                and isinstance(attr.targets[0], ast.Name)
+                and attr.targets[0].id == "code"
+            ):
+                self._record("class-attribute", attr.value, node.lineno)
+            elif (
+                isinstance(attr, ast.AnnAssign)
+                and isinstance(attr.target, ast.Name)
+                and attr.target.id == "code"
+                and attr.value is not None
+            ):
+                self._record("class-attribute", attr.value, node.lineno)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        for kw in node.keywords:
+            if kw.arg == "code":
+                self._record("call-argument", kw.value, node.lineno)
+            elif kw.arg is None and isinstance(kw.value, ast.Dict):
+                # eg: `functools.partial(DiagnosticError, **{"code": "..."})`
+                for key, value in zip(kw.value.keys, kw.value.values):
+                    if isinstance(key, ast.Constant) and key.value == "code":
+                        self._record("call-argument", value, node.lineno)
+        self.generic_visit(node)
+
+
+def _find_codes_in_source_file(file: Path) -> codeLocationMapping:
+    with open(file) as f:
+        source = f.read()
+
+    candidate_lines = [
+        lineno
+        for lineno, line in enumerate(source.split("\n"), start=1)
+        if "code" in line and _RE_code_name.search(line)
+    ]
+    if not candidate_lines:
+        return {}
+
+    finder = _CodeFinder(file, candidate_lines)
+    finder.visit(ast.parse(source, filename=file))
+    return finder.codes
+
+
+def find_codes_in_sources(
+    src_path: Path,
+    *,
+    jobs: int = 1,
+    cache: "ScanCache | None" = None,
+    stats: ScanStats | None = None,
+    on_result: "Callable[[codeLocationMapping], None] | None" = None,
+    path_filter: "PathFilter | None" = None,
+) -> codeLocationMapping:
     """Find all the codes in the source code, using the AST.
 
     This uses the AST to find all the error codes in the source code. An
     error code is found in two ways:
 
-    - A class with a `code` attribute, which is a string literal.
-    - A call with a `code` keyword argument, which is a string literal.
+    - A class with a `code` attribute (which may be annotated), which is a
+      string literal.
+    - A call with a `code` keyword argument, which is a string literal. This
+      includes keyword arguments unpacked from a dictionary literal.
+
+    Files are parsed across `jobs` processes, when that is greater than 1, and
+    only when they do not have a valid entry in the `cache`. Files that do not
+    contain `code` anywhere are skipped without parsing them. The codes found in
+    each file are passed to `on_result`, as they are found. Directories are
+    walked with `path_filter`.
 
     Returns:
         A dictionary mapping the code to a list of (filename, line number)
         tuples, where the code was found.
     """
+    return handle_directory_traversal(
+        src_path,
+        _find_codes_in_source_file,
+        extensions=(".py",),
+        jobs=jobs,
+        cache=cache,
+        prefilter=_may_contain_code,
+        stats=stats,
+        on_result=on_result,
+        path_filter=path_filter,
+    )
 
-    def find_codes_in_file(file: Path) -> codeLocationMapping:
-        codes: defaultdict[str, list[tuple[Path, int]]] = defaultdict(list)
-
-        with open(file) as f:
-            tree = ast.parse(f.read())
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                for attr in node.body:
-                    if (
-                        isinstance(attr, ast.Assign)
-                        and len(attr.targets) == 1
-                        and isinstance(attr.targets[0], ast.Name)
-                        and attr.targets[0].id == "code"
-                        and isinstance(attr.value, ast.Constant)
-                        and isinstance(attr.value.value, str)
-                    ):
-                        ref = attr.value.value
-                        if not RE_code.match(ref):
-                            _ignoring(
-                                ctx="class-attribute",
-                                what=f"{ref!r}",
-                                why="not a valid code",
-                                where=(file, node.lineno),
-                            )
-                            continue
-                        codes[ref].append((file, node.lineno))
-            elif isinstance(node, ast.Call):
-                for kw in node.keywords:
-                    if (
-                        kw.arg == "code"
-                        and isinstance(kw.value, ast.Constant)
-                        and isinstance(kw.value.value, str)
-                    ):
-                        ref = kw.value.value
-                        if not RE_code.match(ref):
-                            _ignoring(
-                                ctx="call-argument",
-                                what=f"{ref!r}",
-                                why="not a valid code",
-                                where=(file, node.lineno),
-                            )
-                            continue
-                        codes[ref].append((file, node.lineno))
-
-        return codes
-
-    return handle_directory_traversal(src_path, find_codes_in_file, extensions=(".py",))
-
-
-def find_code_headings_in_document(doc_path: Path) -> codeLocationMapping:
-    """Finds all the level 2+ headings within the document.
+
+def find_codes_in_many_sources(
+    src_paths: "Sequence[Path]",
+    *,
+    jobs: int = 1,
+    cache: "ScanCache | None" = None,
+    stats: ScanStats | None = None,
+    path_filter: "PathFilter | None" = None,
+) -> "list[codeLocationMapping]":
+    """Like :func:`find_codes_in_sources`, for each of `src_paths` at once.
+
+    Files shared between the `src_paths` are only parsed once.
+    """
+    return handle_many_directory_traversals(
+        src_paths,
+        _find_codes_in_source_file,
+        extensions=(".py",),
+        jobs=jobs,
+        cache=cache,
+        prefilter=_may_contain_code,
+        stats=stats,
+        path_filter=path_filter,
+    )
+
+
+def _import_package(name: str) -> None:
+    """Import the package `name`, and every module within it."""
+    package = importlib.import_module(name)
+    for module in pkgutil.walk_packages(
+        getattr(package, "__path__", []), prefix=f"{name}.", onerror=lambda _: None
+    ):
+        if module.name.rpartition(".")[2] == "__main__":
+            continue  # running these would run the package
+        try:
+            importlib.import_module(module.name)
+        except Exception as e:
+            rich.print(
+                f"[yellow]Ignoring module {escape(module.name)}[/]\n"
+                f"  [blue]import failed[/]: {escape(repr(e))}",
+                file=sys.stderr,
+            )
+
+
+def _class_lines(file: str) -> "dict[str, int]":
+    """Get the line numbers of the class statements in `file`, by qualified name.
+
+    Nesting is told from indentation, which is enough for the usual layout of
+    class and function definitions.
+    """
+    lines: dict[str, int] = {}
+    scopes: list[tuple[int, str]] = []  # (indentation, name) of the enclosing ones
+    try:
+        with open(file, encoding="utf-8", errors="replace") as f:
+            for lineno, line in enumerate(f, start=1):
+                stripped = line.lstrip(" \t")
+                if not stripped.strip() or stripped.startswith("#"):
+                    continue
+                indentation = len(line) - len(stripped)
+                while scopes and scopes[-1][0] >= indentation:
+                    scopes.pop()
+                match = _RE_definition.match(stripped)
+                if match is None:
+                    continue
+                keyword, name = match.groups()
+                if keyword == "class":
+                    qualname = ".".join([*(scope for _, scope in scopes), name])
+                    lines.setdefault(qualname, lineno)
+                else:
+                    name += ".<locals>"
+                scopes.append((indentation, name))
+    except OSError:
+        pass
+    return lines
+
+
+def _definition_location(
+    cls: type, class_lines: "dict[str, dict[str, int]]"
+) -> "tuple[Path, int] | None":
+    """Get where `cls` was defined, the same as when parsing its source file.
+
+    This scans the lines of the module once, rather than using :mod:`inspect`
+    which parses the whole module again for every class.
+    """
+    file: str | None = getattr(sys.modules.get(cls.__module__), "__file__", None)
+    if file is None or not file.endswith(".py"):
+        return None
+
+    if file not in class_lines:
+        class_lines[file] = _class_lines(file)
+    # eg: classes created with `type()`, or with their `__qualname__` changed.
+    # Line numbers are 1-based, so fall back to the start of the file.
+    return Path(file), class_lines[file].get(cls.__qualname__, 1)
+
+
+def find_codes_by_import(package: str, src_path: Path) -> codeLocationMapping:
+    """Find the codes of the diagnostic classes within `src_path`, by importing.
+
+    Every module in `package` is imported, and the codes are taken from the
+    diagnostic classes defined in them (see :func:`diagnostic.lookup`) that are
+    within `src_path`. Unlike :func:`find_codes_in_sources`, this only finds
+    codes set in class definitions. Modules that fail to import are ignored.
 
     Returns:
-        A dictionary mapping the code to a list of line numbers, where the
-        heading was found.
+        A dictionary mapping the code to a list of (filename, line number)
+        tuples, where the class with that code was defined.
     """
+    _import_package(package)
+
+    root = os.path.abspath(src_path)
+    class_lines: dict[str, dict[str, int]] = {}
+    found: list[tuple[Path, int, str]] = []
+    for code in registered_codes():
+        for cls in registered_classes(code):
+            location = _definition_location(cls, class_lines)
+            if location is None:
+                continue
+            file = os.path.abspath(location[0])
+            if file == root:
+                path = src_path
+            elif file.startswith(os.path.join(root, "")):
+                # Relative to `src_path`, the same as when parsing.
+                path = src_path / os.path.relpath(file, root)
+            else:
+                continue
+            found.append((path, location[1], code))
 
-    def find_codes_in_file(doc_path: Path) -> codeLocationMapping:
-        if doc_path.name.endswith(".md"):
-            return find_code_headings_in_markdown(doc_path)
-        else:
-            assert doc_path.name.endswith(".rst")
-            return find_code_headings_in_rst(doc_path)
+    codes: codeLocationMapping = defaultdict(list)
+    for file, lineno, code in sorted(found):
+        codes[code].append((file, lineno))
+    return codes
 
-    return handle_directory_traversal(
-        doc_path, find_codes_in_file, extensions=(".md", ".rst")
-    )
 
+def _find_code_headings_in_file(
+    doc_path: Path, *, strict_rst: bool = False
+) -> codeLocationMapping:
+    if doc_path.name.endswith(".md"):
+        return find_code_headings_in_markdown(doc_path)
+    else:
+        assert doc_path.name.endswith(".rst")
+        return find_code_headings_in_rst(doc_path, strict=strict_rst)
 
-def find_code_headings_in_markdown(doc_path: Path) -> codeLocationMapping:
-    """Finds potential code headings in a Markdown document.
+
+def find_code_headings_in_document(
+    doc_path: Path,
+    *,
+    cache: "ScanCache | None" = None,
+    strict_rst: bool = False,
+    on_result: "Callable[[codeLocationMapping], None] | None" = None,
+    path_filter: "PathFilter | None" = None,
+) -> codeLocationMapping:
+    """Finds all the level 2+ headings within the document.
+
+    Documents are only parsed when they do not have a valid entry in the `cache`.
+    With `strict_rst`, reStructuredText documents are always parsed with docutils.
+    The headings found in each document are passed to `on_result`, as they are
+    found. Directories are walked with `path_filter`.
 
     Returns:
         A dictionary mapping the code to a list of line numbers, where the
         heading was found.
     """
-    parser = MarkdownIt()
-    tokens = parser.parse(Path(doc_path).read_text())  # type: ignore
+    return handle_directory_traversal(
+        doc_path,
+        functools.partial(_find_code_headings_in_file, strict_rst=strict_rst),
+        extensions=(".md", ".rst"),
+        cache=cache,
+        on_result=on_result,
+        path_filter=path_filter,
+    )
+
+
+def find_code_headings_in_many_documents(
+    doc_paths: "Sequence[Path]",
+    *,
+    cache: "ScanCache | None" = None,
+    strict_rst: bool = False,
+    path_filter: "PathFilter | None" = None,
+) -> "list[codeLocationMapping]":
+    """Like :func:`find_code_headings_in_document`, for each of `doc_paths` at once.
+
+    Documents shared between the `doc_paths` are only parsed once.
+    """
+    return handle_many_directory_traversals(
+        doc_paths,
+        functools.partial(_find_code_headings_in_file, strict_rst=strict_rst),
+        extensions=(".md", ".rst"),
+        cache=cache,
+        path_filter=path_filter,
+    )
+
+
+_RE_md_setext_underline = re.compile(r"(?:=+|-+) *$")
+_RE_md_thematic_break = re.compile(r"([-*_])(?: *\1){2,} *$")
+_RE_md_list_marker = re.compile(r"(?:[-*+]|[0-9]{1,9}[.)])(?: +|$)")
+_RE_md_fence = re.compile(r"(`{3,}|~{3,})(.*)$")
+
+
+@functools.cache
+def _markdown_parser() -> "MarkdownIt":
+    # Imported here, since it is only needed for documents the scanner can not
+    # handle, and importing it is comparatively slow.
+    from markdown_it import MarkdownIt
+
+    return MarkdownIt()
+
+
+def _parse_markdown_headings(text: str) -> list[tuple[str, int]]:
+    """Find the headings in a Markdown document, using markdown-it."""
+    tokens = _markdown_parser().parse(text)  # type: ignore
 
     found_headings: list[tuple[str, int]] = []
     current_heading: tuple[str, int] | None = None
@@ -147,9 +619,7 @@ def find_code_headings_in_markdown(doc_path: Path) -> codeLocationMapping:
             current_heading = ("", -1)
         elif token.type == "heading_close":
             assert current_heading, "no active heading"
-            # Skip headings that are not codes
-            if RE_code.match(current_heading[0]):
-                found_headings.append(current_heading)
+            found_headings.append(current_heading)
             current_heading = None
         elif current_heading is not None:
             assert token.type == "inline", "expected inline token"
@@ -158,49 +628,329 @@ def find_code_headings_in_markdown(doc_path: Path) -> codeLocationMapping:
             assert isinstance(new_text, str)
             current_heading = (new_text, token.map[0] + 1)
 
-    codes: codeLocationMapping = defaultdict(list)
-    for heading, lineno in found_headings:
-        codes[heading].append((doc_path, lineno))  # pyright: ignore
+    return found_headings
 
-    return codes
 
+def _atx_heading_content(rest: str) -> str:
+    # An optional closing sequence of `#`s is dropped, if preceded by a space.
+    rest = rest.rstrip(" ")
+    without_closing = rest.rstrip("#")
+    if without_closing != rest and without_closing.endswith(" "):
+        rest = without_closing
+    return rest.strip()
 
-def find_code_headings_in_rst(doc_path: Path) -> codeLocationMapping:
-    """Finds all the level 2+ headings within the document.
+
+def _scan_markdown_headings(text: str) -> list[tuple[str, int]] | None:
+    """Find the headings in a Markdown document, without parsing all of it.
+
+    This streams through the lines of the document, tracking just enough state
+    to find ATX and setext headings outside of fenced and indented code.
+
+    Returns:
+        The (content, line number) of every heading, same as markdown-it would,
+        or None if the document uses a construct that this can not handle
+        reliably (eg: block quotes, HTML, tabs, or headings within lists).
+    """
+    headings: list[tuple[str, int]] = []
+
+    fence: str | None = None  # the opening fence, when within fenced code
+    paragraph: list[str] | None = None  # the lines, when within a paragraph
+    paragraph_start = 0
+    paragraph_in_list = False  # whether the paragraph might be in a list item
+    seen_list = False
+
+    for lineno, line in enumerate(text.split("\n"), start=1):
+        stripped = line.lstrip(" ")
+        indent = len(line) - len(stripped)
+
+        if fence is not None:
+            if indent < 4 and stripped.startswith(fence[0]):
+                if "\t" in line:
+                    return None
+                run = len(stripped) - len(stripped.lstrip(fence[0]))
+                if run >= len(fence) and not stripped[run:].strip(" "):
+                    fence = None
+            continue
+
+        if not stripped.strip(" \t"):
+            paragraph = None
+            continue
+        if "\t" in line:
+            return None
+
+        if indent >= 4:
+            if seen_list:
+                # This could be within a list item, rather than indented code.
+                if stripped[0] in "#`~<>" or _RE_md_setext_underline.match(stripped):
+                    return None
+                if paragraph is None:
+                    paragraph, paragraph_start = [line], lineno
+                    paragraph_in_list = True
+                else:
+                    paragraph.append(line)
+            elif paragraph is not None:
+                paragraph.append(line)
+            continue
+
+        if stripped[0] in "<>":
+            return None
+
+        if paragraph is not None and _RE_md_setext_underline.match(stripped):
+            if paragraph_in_list:
+                return None
+            headings.append(("\n".join(paragraph).strip(), paragraph_start))
+            paragraph = None
+            continue
+
+        if _RE_md_thematic_break.match(stripped):
+            paragraph = None
+            continue
+
+        if stripped[0] == "#":
+            level = len(stripped) - len(stripped.lstrip("#"))
+            if level <= 6 and stripped[level : level + 1] in ("", " "):
+                headings.append((_atx_heading_content(stripped[level:]), lineno))
+                paragraph = None
+                continue
+
+        match = _RE_md_fence.match(stripped)
+        if match and not (match[1][0] == "`" and "`" in match[2]):
+            if seen_list and indent:
+                return None
+            fence = match[1]
+            paragraph = None
+            continue
+
+        match = _RE_md_list_marker.match(stripped)
+        if match:
+            content = stripped[match.end() :]
+            if content and (
+                content[0] in "#`~<>[="
+                or _RE_md_setext_underline.match(content)
+                or _RE_md_list_marker.match(content)
+            ):
+                return None
+            seen_list = True
+            if paragraph is None:
+                paragraph, paragraph_start = [line], lineno
+            else:
+                paragraph.append(line)
+            paragraph_in_list = True
+            continue
+
+        if paragraph is None:
+            if stripped[0] == "[":  # possibly a link reference definition
+                return None
+            paragraph, paragraph_start = [line], lineno
+            paragraph_in_list = seen_list and indent > 0
+        else:
+            paragraph.append(line)
+
+    return headings
+
+
+def find_code_headings_in_markdown(doc_path: Path) -> codeLocationMapping:
+    """Finds potential code headings in a Markdown document.
+
+    The document is scanned line-by-line for headings, falling back to parsing
+    it with markdown-it when it uses constructs that the scanner can not handle.
 
     Returns:
         A dictionary mapping the code to a list of line numbers, where the
         heading was found.
     """
+    text = Path(doc_path).read_text()
+    headings = _scan_markdown_headings(text)
+    if headings is None:
+        headings = _parse_markdown_headings(text)
 
-    with open(doc_path) as f:
-        rst_string = f.read()
+    codes: codeLocationMapping = defaultdict(list)
+    for heading, lineno in headings:
+        # Skip headings that are not codes
+        if RE_code.match(heading):
+            codes[heading].append((doc_path, lineno))
+
+    return codes
+
+
+# Punctuation that section titles can be adorned with, repeated across a line.
+_RE_rst_adornment = re.compile(r"([!-/:-@\[-`{-~])\1* *$")
+_RE_rst_simple_table_top = re.compile(r"=+( +=+)+ *$")
+_RE_rst_directive = re.compile(
+    r"\.\. +((?:(?!_)\w)+(?:[-._+:](?:(?!_)\w)+)*) ?::(?: |$)"
+)
+# Characters that start inline markup, which changes the text of a title.
+_RST_INLINE_MARKUP = frozenset("`*|\\_[<")
+# Directives that create titles of their own, or pull in content from elsewhere.
+_RST_TITLE_DIRECTIVES = frozenset(
+    {
+        "admonition",
+        "contents",
+        "csv-table",
+        "include",
+        "list-table",
+        "sectnum",
+        "section-numbering",
+        "sidebar",
+        "table",
+        "topic",
+    }
+)
+
+
+def _parse_rst_titles(text: str) -> list[tuple[str, int]]:
+    """Find the titles in a reStructuredText document, using docutils."""
+    import docutils.core
+    import docutils.nodes
 
-    # Parse the reStructuredText document
     document = cast(
         "Any",  # docutils types are incomplete, and cause pyright to complain
-        docutils.core.publish_doctree(rst_string),  # type: ignore
+        docutils.core.publish_doctree(text),  # type: ignore
     )
 
-    # Iterate through the document and extract all headings
-    codes: codeLocationMapping = defaultdict(list)
-    for node in document.findall(
-        condition=lambda n: getattr(n, "tagname", None) == "title"  # pyright: ignore
-    ):
-        heading_text = node.astext()
+    titles: list[tuple[str, int]] = []
+    for node in document.findall(docutils.nodes.title):
+        assert node.line
+        titles.append((node.astext(), node.line))
+    return titles
 
-        # Determine the level of the heading
-        heading_level = -1  # we'll always have `document` as the parent
-        tree = node
-        while tree.parent is not None:
-            tree = tree.parent
-            heading_level += 1
 
-        # Skip headings that are not codes
-        if not RE_code.match(heading_text):
+def _scan_rst_titles(text: str) -> list[tuple[str, int]] | None:
+    """Find the section titles in a reStructuredText document, without parsing it.
+
+    Only titles whose text could be a code are returned, since those are the only
+    ones that need to be located precisely. Unlike docutils, this does not turn
+    the first section within the document title into a subtitle.
+
+    Returns:
+        The (text, line number of the underline) of every section title whose
+        text could be a code, or None if the document uses a construct that this
+        can not handle reliably (eg: inline markup in titles, simple tables, or
+        quoted literal blocks).
+    """
+    lines = [
+        line.expandtabs(8).rstrip()
+        for line in text.replace("\v", " ").replace("\f", " ").splitlines()
+    ]
+
+    titles: list[tuple[str, int]] = []
+    # Whether the next line starts a new top-level element, if that is known.
+    at_boundary: bool | None = True
+    expect_literal = False  # whether the previous paragraph ended with `::`
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if not line:
+            at_boundary = True
+            index += 1
             continue
 
-        assert node.line
-        codes[heading_text].append((doc_path, node.line))
+        if expect_literal and line[0] != " ":
+            return None  # a quoted literal block, possibly
+        expect_literal = False
+
+        if line[0] == " ":
+            # Titles can not be nested within indented blocks, and whether what
+            # follows one is a new element depends on what the block was.
+            at_boundary = None
+            index += 1
+            continue
+
+        if line.startswith("..") and line[2:3] in ("", " "):
+            match = _RE_rst_directive.match(line)
+            if match and match[1].lower() in _RST_TITLE_DIRECTIVES:
+                return None
+            at_boundary = None
+            index += 1
+            continue
+
+        if _RE_rst_simple_table_top.match(line):
+            return None
+
+        following = lines[index + 1] if index + 1 < len(lines) else ""
+
+        if _RE_rst_adornment.match(line):
+            overlined = (
+                index + 2 < len(lines) and following and lines[index + 2] == line
+            )
+            if not overlined:
+                if at_boundary is not False and following:
+                    return None  # an incomplete title, possibly
+                # A transition, or text that looks like one.
+                at_boundary = False
+                index += 1
+                continue
+
+            # An overlined title, with the text possibly inset.
+            title = following.strip()
+            is_code = RE_code.match(title)
+            if is_code or not _RST_INLINE_MARKUP.isdisjoint(title):
+                if (
+                    not is_code
+                    or at_boundary is not True
+                    or len(line) < max(4, len(title))
+                ):
+                    return None
+                titles.append((title, index + 3))
+            elif at_boundary is False:
+                # Whether this is a title depends on what the previous line was,
+                # but the lines within it can not start titles either way.
+                index += 1
+                continue
+            at_boundary = False
+            index += 3
+            continue
+
+        if following and following[0] != " " and _RE_rst_adornment.match(following):
+            # An underlined title, unless this is within a paragraph or the
+            # underline is too short.
+            title = line.rstrip()
+            is_code = RE_code.match(title)
+            if is_code or not _RST_INLINE_MARKUP.isdisjoint(title):
+                if at_boundary is not True:
+                    return None
+                if len(title) > len(following) and len(following) < 4:
+                    pass  # treated as ordinary text
+                elif is_code:
+                    titles.append((title, index + 2))
+                    at_boundary = True
+                    index += 2
+                    continue
+                else:
+                    return None
+
+        expect_literal = line.endswith("::")
+        at_boundary = False
+        index += 1
+
+    return titles
+
+
+def find_code_headings_in_rst(
+    doc_path: Path, *, strict: bool = False
+) -> codeLocationMapping:
+    """Finds potential code headings in a reStructuredText document.
+
+    The document is scanned line-by-line for section titles, falling back to
+    parsing it with docutils when it uses constructs that the scanner can not
+    handle, or when `strict` is true.
+
+    Returns:
+        A dictionary mapping the code to a list of line numbers, where the
+        heading was found.
+    """
+    with open(doc_path) as f:
+        rst_string = f.read()
+
+    titles = None if strict else _scan_rst_titles(rst_string)
+    if titles is None:
+        titles = _parse_rst_titles(rst_string)
+
+    codes: codeLocationMapping = defaultdict(list)
+    for heading_text, lineno in titles:
+        # Skip headings that are not codes
+        if RE_code.match(heading_text):
+            codes[heading_text].append((doc_path, lineno))
 
     return codes
@@ -0,0 +1,62 @@
+"""The index of diagnostic classes, by the code set in their definition."""
+
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._base import Diagnostic
+
+# Weak references, so that classes created on the fly (eg: in tests) can still
+# be garbage collected. Codes usually have a single class, so the lists are short.
+_classes: dict[str, list[weakref.ref[type[Diagnostic]]]] = {}
+
+
+def _name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def register(cls: type[Diagnostic], code: str) -> None:
+    """Record that `cls` was defined with `code`.
+
+    A class with the same module and name replaces the one recorded earlier,
+    since that is a redefinition (eg: when the module is reloaded).
+    """
+    refs = _classes.setdefault(code, [])
+    refs[:] = [ref for ref in refs if (other := ref()) and _name(other) != _name(cls)]
+    refs.append(weakref.ref(cls))
+
+
+def registered_classes(code: str) -> list[type[Diagnostic]]:
+    """Get every class that is currently defined with `code`."""
+    refs = _classes.get(code, [])
+    found = [cls for ref in refs if (cls := ref()) is not None]
+    if len(found) != len(refs):
+        refs[:] = [weakref.ref(cls) for cls in found]
+    return found
+
+
+def registered_codes() -> list[str]:
+    """Get every code that a class is currently defined with."""
+    return [code for code in list(_classes) if registered_classes(code)]
+
+
+def lookup(code: str) -> type[Diagnostic]:
+    """Get the diagnostic class that is defined with `code`.
+
+    Only classes that set :attr:`~diagnostic.Diagnostic.code` in their definition
+    are found, once the module containing them has been imported.
+
+    Raises:
+        LookupError: If no class is defined with `code`, or more than one is.
+    """
+    found = registered_classes(code)
+    if not found:
+        raise LookupError(f"No diagnostic class is defined with code {code!r}")
+    if len(found) > 1:
+        names = ", ".join(sorted(map(_name, found)))
+        raise LookupError(
+            f"More than one diagnostic class is defined with code {code!r}: {names}"
+        )
+    return found[0]
@@ -0,0 +1,233 @@
+"""Machine-readable reports of the results of check-docs."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, TextIO
+
+from . import __version__
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from ._parsers import codeLocationMapping
+
+
+def _location(file: Path, lineno: int) -> dict[str, Any]:
+    return {"path": str(file), "line": lineno}
+
+
+def _uri(file: Path) -> str:
+    return file.as_uri() if file.is_absolute() else file.as_posix()
+
+
+class Report:
+    """Writes the results of check-docs to a stream, piece by piece.
+
+    Each piece is written as soon as it is passed in, so that the results never
+    need to be held in memory as a whole, and consumers can start processing
+    them before the check is complete.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def start(self) -> None:
+        """Called before anything else is written."""
+
+    def codes(self, found: codeLocationMapping) -> None:
+        """Called with the codes found in each source file."""
+
+    def headings(self, found: codeLocationMapping) -> None:
+        """Called with the code headings found in each document."""
+
+    def undocumented(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        """Called for every code in the source code, without documentation."""
+
+    def extra(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        """Called for every code heading in the documentation, not in the source."""
+
+    def finish(self) -> None:
+        """Called after everything else has been written."""
+        self.stream.flush()
+
+
+class NDJSONReport(Report):
+    """One JSON object per line, for each code, heading and finding."""
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record))
+        self.stream.write("\n")
+
+    def _write_found(self, kind: str, found: codeLocationMapping) -> None:
+        for code, locations in found.items():
+            for file, lineno in locations:
+                self._write({"type": kind, "code": code, **_location(file, lineno)})
+        self.stream.flush()
+
+    def codes(self, found: codeLocationMapping) -> None:
+        self._write_found("code", found)
+
+    def headings(self, found: codeLocationMapping) -> None:
+        self._write_found("heading", found)
+
+    def undocumented(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        self._write(
+            {
+                "type": "undocumented",
+                "code": code,
+                "locations": [_location(*location) for location in locations],
+            }
+        )
+
+    def extra(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        self._write(
+            {
+                "type": "extra",
+                "code": code,
+                "locations": [_location(*location) for location in locations],
+            }
+        )
+
+
+class JSONReport(Report):
+    """A single JSON object, with a list for each kind of result.
+
+    The lists are "codes", "headings", "undocumented" and "extra".
+    """
+
+    _SECTIONS = ("codes", "headings", "undocumented", "extra")
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._section = -1
+        self._empty = True
+
+    def _open_sections_until(self, index: int) -> None:
+        # Every section is opened in order, so they're all present even if empty.
+        while self._section < index:
+            self._section += 1
+            self.stream.write("\n  ]," if self._section else "{")
+            self.stream.write(f"\n  {json.dumps(self._SECTIONS[self._section])}: [")
+            self._empty = True
+
+    def _write(self, section: str, record: dict[str, Any]) -> None:
+        self._open_sections_until(self._SECTIONS.index(section))
+        self.stream.write("\n    " if self._empty else ",\n    ")
+        self.stream.write(json.dumps(record))
+        self._empty = False
+
+    def _write_found(self, section: str, found: codeLocationMapping) -> None:
+        for code, locations in found.items():
+            for file, lineno in locations:
+                self._write(section, {"code": code, **_location(file, lineno)})
+        self.stream.flush()
+
+    def codes(self, found: codeLocationMapping) -> None:
+        self._write_found("codes", found)
+
+    def headings(self, found: codeLocationMapping) -> None:
+        self._write_found("headings", found)
+
+    def undocumented(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        self._write(
+            "undocumented",
+            {
+                "code": code,
+                "locations": [_location(*location) for location in locations],
+            },
+        )
+
+    def extra(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        self._write(
+            "extra",
+            {
+                "code": code,
+                "locations": [_location(*location) for location in locations],
+            },
+        )
+
+    def finish(self) -> None:
+        self._open_sections_until(len(self._SECTIONS) - 1)
+        self.stream.write("\n  ]\n}\n")
+        super().finish()
+
+
+class SARIFReport(Report):
+    """A SARIF 2.1.0 log, with a result for every finding.
+
+    The codes and headings are not included, since they are not findings.
+    """
+
+    _RULES = [
+        {
+            "id": "undocumented-code",
+            "shortDescription": {
+                "text": "A code in the source code has no documentation."
+            },
+        },
+        {
+            "id": "extra-code",
+            "shortDescription": {
+                "text": "A code in the documentation is not in the source code."
+            },
+        },
+    ]
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._empty = True
+
+    def start(self) -> None:
+        driver = {
+            "name": "diagnostic.check-docs",
+            "version": __version__,
+            "rules": self._RULES,
+        }
+        self.stream.write(
+            '{\n  "version": "2.1.0",\n'
+            '  "$schema": "https://json.schemastore.org/sarif-2.1.0.json",\n'
+            '  "runs": [\n    {\n'
+            f'      "tool": {{"driver": {json.dumps(driver)}}},\n'
+            '      "results": ['
+        )
+
+    def _write(
+        self, rule: str, message: str, locations: list[tuple[Path, int]]
+    ) -> None:
+        result = {
+            "ruleId": rule,
+            "level": "error",
+            "message": {"text": message},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": _uri(file)},
+                        "region": {"startLine": lineno},
+                    }
+                }
+                for file, lineno in locations
+            ],
+        }
+        self.stream.write("\n        " if self._empty else ",\n        ")
+        self.stream.write(json.dumps(result))
+        self._empty = False
+
+    def undocumented(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        self._write("undocumented-code", f"Code {code!r} is not documented.", locations)
+
+    def extra(self, code: str, locations: list[tuple[Path, int]]) -> None:
+        self._write(
+            "extra-code", f"Code {code!r} is not in the source code.", locations
+        )
+
+    def finish(self) -> None:
+        self.stream.write("\n      ]\n    }\n  ]\n}\n")
+        super().finish()
+
+
+REPORTS: dict[str, type[Report]] = {
+    "json": JSONReport,
+    "ndjson": NDJSONReport,
+    "sarif": SARIFReport,
+}
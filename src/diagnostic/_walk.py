@@ -0,0 +1,253 @@
+"""Walking directory trees, without descending into irrelevant directories."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+# Directories that never contain the source code or documentation being checked.
+# Virtual environments are also detected by their pyvenv.cfg, whatever the name.
+DEFAULT_EXCLUDES = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".bzr/",
+    ".venv/",
+    ".tox/",
+    ".nox/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    "__pycache__/",
+    "__pypackages__/",
+    "node_modules/",
+    "site-packages/",
+    "*.egg-info/",
+)
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore-style glob into a regular expression."""
+    parts: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+            if i + 2 == n:
+                parts.append(".*")
+                i += 2
+                continue
+            if pattern[i + 2] == "/":
+                parts.append("(?:.*/)?")
+                i += 3
+                continue
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        elif c == "[":
+            start = i + 2 if pattern[i + 1 : i + 2] in ("!", "^") else i + 1
+            end = pattern.find("]", start + 1)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                chars = pattern[i + 1 : end].replace("\\", "\\\\")
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+                parts.append(f"[{chars}]")
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+@dataclasses.dataclass(frozen=True)
+class _Rule:
+    regex: re.Pattern[str]
+    negated: bool
+    directory_only: bool
+
+
+def _parse_rule(pattern: str) -> _Rule | None:
+    """Parse a line of a .gitignore file, or None if there is no pattern in it."""
+    pattern = re.sub(r"(?<!\\)\s+$", "", pattern)
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    # Patterns with a slash are relative to the base, others match at any depth.
+    if "/" in pattern:
+        regex = _translate(pattern.lstrip("/"))
+    else:
+        regex = "(?:.*/)?" + _translate(pattern)
+    return _Rule(re.compile(regex, re.DOTALL), negated, directory_only)
+
+
+def _parse_rules(patterns: Iterable[str]) -> list[_Rule]:
+    return [rule for rule in map(_parse_rule, patterns) if rule is not None]
+
+
+def _read_rules(file: str) -> list[_Rule]:
+    try:
+        with open(file, encoding="utf-8", errors="replace") as f:
+            return _parse_rules(f)
+    except OSError:
+        return []
+
+
+def _matches(rules: list[_Rule], relative: str, is_dir: bool) -> bool | None:
+    """Whether the last of `rules` that matches ignores the path, if any match."""
+    for rule in reversed(rules):
+        if rule.directory_only and not is_dir:
+            continue
+        if rule.regex.fullmatch(relative):
+            return not rule.negated
+    return None
+
+
+# The rules from each .gitignore, with the absolute path of its directory (ending
+# in a separator, so that the paths within it can be made relative by slicing).
+_IgnoreRules = list[tuple[str, list[_Rule]]]
+
+
+def _is_ignored(ignores: _IgnoreRules, path: str, is_dir: bool) -> bool:
+    # Rules from deeper .gitignore files take precedence, as in git.
+    for base, rules in reversed(ignores):
+        relative = path[len(base) :]
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+        ignored = _matches(rules, relative, is_dir)
+        if ignored is not None:
+            return ignored
+    return False
+
+
+def _as_base(directory: str) -> str:
+    return os.path.join(directory, "")
+
+
+def _ancestor_ignores(directory: str) -> _IgnoreRules:
+    """Get the rules from the .gitignore files above `directory` in its repository."""
+    ignores: _IgnoreRules = []
+    while True:
+        parent = os.path.dirname(directory)
+        is_root = os.path.exists(os.path.join(directory, ".git"))
+        if is_root:
+            exclude = os.path.join(directory, ".git", "info", "exclude")
+            ignores.append((_as_base(directory), _read_rules(exclude)))
+        if parent == directory or is_root:
+            break
+        directory = parent
+        gitignore = os.path.join(directory, ".gitignore")
+        ignores.append((_as_base(directory), _read_rules(gitignore)))
+
+    if not is_root:  # not in a repository, so these do not apply
+        return []
+    return [(base, rules) for base, rules in reversed(ignores) if rules]
+
+
+@dataclasses.dataclass(frozen=True)
+class PathFilter:
+    """Which files within a directory to walk over.
+
+    Directories matching DEFAULT_EXCLUDES, virtual environments, and anything
+    ignored by git (with `gitignore`) are skipped without being read. `exclude`
+    and `include` are gitignore-style globs, relative to the directory being
+    walked: files matching any of `exclude`, or not within a match for any of
+    `include` (if given), are skipped too.
+    """
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    gitignore: bool = True
+
+    @functools.cached_property
+    def _exclude_rules(self) -> list[_Rule]:
+        return _parse_rules((*DEFAULT_EXCLUDES, *self.exclude))
+
+    @functools.cached_property
+    def _include_rules(self) -> list[_Rule]:
+        return _parse_rules(self.include)
+
+    def iter_files(self, path: Path, *, extensions: tuple[str, ...]) -> Iterator[Path]:
+        """Yield the files within `path`, in a deterministic order.
+
+        Files come before the subdirectories of each directory, in sorted order.
+        """
+        root = os.path.abspath(path)
+        ignores = _ancestor_ignores(root) if self.gitignore else []
+        yield from self._walk(
+            str(path), root, "", ignores, not self.include, extensions=extensions
+        )
+
+    def _walk(
+        self,
+        directory: str,
+        absolute: str,
+        relative: str,
+        ignores: _IgnoreRules,
+        included: bool,
+        *,
+        extensions: tuple[str, ...],
+    ) -> Iterator[Path]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        names = {entry.name for entry in entries}
+        if relative and "pyvenv.cfg" in names:
+            return
+        if self.gitignore and ".gitignore" in names:
+            rules = _read_rules(os.path.join(directory, ".gitignore"))
+            if rules:
+                ignores = [*ignores, (_as_base(absolute), rules)]
+
+        subdirectories: list[tuple[os.DirEntry[str], str, bool]] = []
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if not is_dir and not entry.name.endswith(extensions):
+                continue
+            entry_relative = f"{relative}/{entry.name}" if relative else entry.name
+            if _matches(self._exclude_rules, entry_relative, is_dir):
+                continue
+            entry_absolute = os.path.join(absolute, entry.name)
+            if ignores and _is_ignored(ignores, entry_absolute, is_dir):
+                continue
+
+            entry_included = included or bool(
+                _matches(self._include_rules, entry_relative, is_dir)
+            )
+            if is_dir:
+                subdirectories.append((entry, entry_relative, entry_included))
+            elif entry_included and entry.is_file():
+                yield Path(entry.path)
+
+        for entry, entry_relative, entry_included in subdirectories:
+            yield from self._walk(
+                entry.path,
+                os.path.join(absolute, entry.name),
+                entry_relative,
+                ignores,
+                entry_included,
+                extensions=extensions,
+            )
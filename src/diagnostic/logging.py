@@ -0,0 +1,145 @@
+"""Presenting diagnostic objects through the standard library's `logging`."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import logging.handlers
+from typing import TYPE_CHECKING, Any, TextIO
+
+from ._base import Diagnostic
+
+if TYPE_CHECKING:
+    import rich.console
+
+    # Only subscriptable at runtime on Python 3.11+.
+    _StreamHandler = logging.StreamHandler[TextIO]
+else:
+    _StreamHandler = logging.StreamHandler
+
+__all__ = ["DiagnosticFormatter", "DiagnosticHandler", "DiagnosticQueueHandler"]
+
+
+def _diagnostic_of(record: logging.LogRecord) -> tuple[Diagnostic | None, bool]:
+    """Get the diagnostic in a record, and whether it is the record's exception."""
+    # Set by DiagnosticQueueHandler, in place of the exception.
+    diagnostic: Diagnostic | None = getattr(record, "diagnostic", None)
+    if diagnostic is not None:
+        return diagnostic, True
+    if record.exc_info and isinstance(record.exc_info[1], Diagnostic):
+        return record.exc_info[1], True
+    if isinstance(record.msg, Diagnostic):
+        return record.msg, False
+    return None, False
+
+
+class DiagnosticFormatter(logging.Formatter):
+    """A formatter that presents the diagnostics in log records.
+
+    A diagnostic is found in a record if it is the exception being logged (eg:
+    with :meth:`logging.Logger.exception`), or if it was logged as the message.
+    The record is formatted as usual, with the diagnostic presented after it,
+    in place of the traceback. A diagnostic logged as the message is given as
+    its code in the message.
+
+    With a `console`, diagnostics are presented by rendering them on it (with
+    colors, if the console has them). Otherwise, their plain-text presentation
+    is used (the same as :func:`str`).
+    """
+
+    def __init__(
+        self,
+        fmt: str | None = None,
+        datefmt: str | None = None,
+        style: Any = "%",
+        validate: bool = True,
+        *,
+        console: rich.console.Console | None = None,
+        show_traceback: bool = False,
+    ) -> None:
+        """
+        :param fmt: See :class:`logging.Formatter`.
+        :param datefmt: See :class:`logging.Formatter`.
+        :param style: See :class:`logging.Formatter`.
+        :param validate: See :class:`logging.Formatter`.
+        :param console: The console to render diagnostics with.
+        :param show_traceback: Include the traceback of diagnostics that are
+            logged as an exception, before presenting them.
+        """
+        super().__init__(fmt, datefmt, style, validate)
+        self.console = console
+        self.show_traceback = show_traceback
+
+    def format(self, record: logging.LogRecord) -> str:
+        diagnostic, is_exception = _diagnostic_of(record)
+        if diagnostic is None:
+            return super().format(record)
+
+        record = copy.copy(record)
+        if record.msg is diagnostic:
+            record.msg, record.args = diagnostic.code, None
+        if is_exception and not self.show_traceback:
+            record.exc_info, record.exc_text = None, None
+        return f"{super().format(record)}\n{self.format_diagnostic(diagnostic)}"
+
+    def format_diagnostic(self, diagnostic: Diagnostic) -> str:
+        """Get the presentation of a diagnostic, without a trailing newline."""
+        if self.console is None:
+            return str(diagnostic)
+        with self.console.capture() as capture:
+            self.console.print(diagnostic)
+        return capture.get().rstrip("\n")
+
+
+class DiagnosticHandler(_StreamHandler):
+    """A handler that presents the diagnostics in log records, on a stream.
+
+    Diagnostics are rendered with `rich` when the stream is a terminal (as
+    detected by :class:`rich.console.Console`), and presented as plain text
+    otherwise. See :class:`DiagnosticFormatter`, which this uses by default.
+    """
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        """
+        :param stream: The stream to write to. Defaults to :data:`sys.stderr`.
+        """
+        # Imported here, so that `import diagnostic.logging` does not pay for `rich`.
+        import rich.console
+
+        super().__init__(stream)
+        console = rich.console.Console(file=self.stream)
+        self.setFormatter(
+            DiagnosticFormatter(console=console if console.is_terminal else None)
+        )
+
+
+class DiagnosticQueueHandler(logging.handlers.QueueHandler):
+    """A queue handler that leaves presenting diagnostics to the queue's listener.
+
+    :class:`logging.handlers.QueueHandler` formats records before putting them
+    on the queue, which turns diagnostics into plain text in the thread that
+    logged them. This keeps the diagnostics in the records instead, so that a
+    :class:`logging.handlers.QueueListener` with a :class:`DiagnosticHandler`
+    presents them, in its own thread. Other records are prepared as usual.
+
+    The diagnostics can be pickled, so this works with a
+    :class:`multiprocessing.Queue` too.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> Any:
+        diagnostic, is_exception = _diagnostic_of(record)
+        if diagnostic is None:
+            return super().prepare(record)
+
+        record = copy.copy(record)
+        if record.msg is not diagnostic:
+            record.msg, record.args = record.getMessage(), None
+        # Tracebacks can not be pickled, so only their text is kept.
+        if record.exc_info:
+            if not record.exc_text:
+                formatter = self.formatter or logging.Formatter()
+                record.exc_text = formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if is_exception:
+            record.diagnostic = diagnostic  # pyright: ignore[reportAttributeAccessIssue]
+        return record
@@ -0,0 +1,202 @@
+"""Presenting diagnostic warnings, when they are emitted with :mod:`warnings`."""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import sys
+import threading
+import warnings
+from typing import TYPE_CHECKING, Literal, TextIO
+
+from ._concrete import DiagnosticWarning
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import rich.console
+
+__all__ = ["WarningHook", "install", "uninstall"]
+
+_MODES = ("once", "always", "count")
+
+
+class WarningHook:
+    """Presents :class:`~diagnostic.DiagnosticWarning` objects, as they are emitted.
+
+    This takes the place of :func:`warnings.showwarning` (see :func:`install`),
+    and passes other warnings on to the one it replaced (if any). Repeated
+    warnings are told apart by their code, rather than by their message, as:
+
+    - ``"once"``: the first warning with each code is presented, and the rest
+      are counted. The counts are presented by :meth:`summarise`.
+    - ``"always"``: every warning is presented.
+    - ``"count"``: nothing is presented as it is emitted. The first warning with
+      each code is presented by :meth:`summarise`, with how many times it was
+      emitted.
+
+    Only the `maxsize` most recently emitted codes are remembered. When a code is
+    forgotten, its counts are presented in the summary as "other" warnings (or
+    with ``"count"``, its warning is presented right away).
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: Literal["once", "always", "count"] = "once",
+        maxsize: int = 1024,
+        console: rich.console.Console | None = None,
+    ) -> None:
+        """
+        :param mode: How to handle repeated warnings, see above.
+        :param maxsize: The most codes to remember.
+        :param console: The console to present on. Defaults to one for
+            :data:`sys.stderr`, where warnings are shown by default.
+        """
+        if mode not in _MODES:
+            raise ValueError(f"`mode` must be one of {_MODES}, not {mode!r}")
+        if maxsize < 1:
+            raise ValueError(f"`maxsize` must be at least 1, not {maxsize}")
+
+        self.mode = mode
+        self.maxsize = maxsize
+        self._console = console
+        self._previous: Callable[..., None] | None = None
+        self._lock = threading.Lock()
+        # code -> (first warning, times emitted), the most recent last.
+        self._seen: collections.OrderedDict[str, tuple[DiagnosticWarning, int]] = (
+            collections.OrderedDict()
+        )
+        self._forgotten = 0  # suppressed warnings, of codes no longer in `_seen`
+
+    def showwarning(
+        self,
+        message: Warning | str,
+        category: type[Warning],
+        filename: str,
+        lineno: int,
+        file: TextIO | None = None,
+        line: str | None = None,
+    ) -> None:
+        """Show a warning, with the signature of :func:`warnings.showwarning`."""
+        if not isinstance(message, DiagnosticWarning):
+            if self._previous is not None:
+                self._previous(message, category, filename, lineno, file, line)
+            else:
+                text = warnings.formatwarning(message, category, filename, lineno, line)
+                (file or sys.stderr).write(text)
+            return
+
+        if self.mode == "always":
+            self._present(message, file=file)
+            return
+
+        code = message.code
+        assert code is not None
+        with self._lock:
+            first, count = self._seen.pop(code, (message, 0))
+            self._seen[code] = (first, count + 1)
+            evicted = None
+            if len(self._seen) > self.maxsize:
+                evicted = self._seen.popitem(last=False)[1]
+                if self.mode == "once":
+                    self._forgotten += evicted[1] - 1
+        if self.mode == "once" and count == 0:
+            self._present(message, file=file)
+        elif self.mode == "count" and evicted is not None:
+            self._present(*evicted)
+
+    def summarise(self) -> None:
+        """Present the warnings that were held back, and forget them.
+
+        This is called at exit, when the hook is installed.
+        """
+        with self._lock:
+            seen = list(self._seen.values())
+            forgotten = self._forgotten
+            self._seen.clear()
+            self._forgotten = 0
+
+        if self.mode == "count":
+            for warning, count in seen:
+                self._present(warning, count)
+            return
+
+        suppressed = [(w.code, count - 1) for w, count in seen if count > 1]
+        total = forgotten + sum(count for _, count in suppressed)
+        if not total:
+            return
+        details = [f"{code} ({count})" for code, count in suppressed]
+        if forgotten:
+            details.append(f"other ({forgotten})")
+        self._console_or_default().print(
+            f"[magenta bold]note[/]: {total} repeated warnings were not shown: "
+            + ", ".join(details),
+            highlight=False,
+        )
+
+    def _present(
+        self, warning: DiagnosticWarning, count: int = 1, *, file: TextIO | None = None
+    ) -> None:
+        if file is not None:
+            warning.write_plain(file)
+            file.write("\n")
+            return
+        console = self._console_or_default()
+        console.print(warning)
+        if count > 1:
+            console.print(f"[magenta bold]note[/]: emitted {count} times")
+
+    def _console_or_default(self) -> rich.console.Console:
+        if self._console is None:
+            import rich.console
+
+            self._console = rich.console.Console(stderr=True)
+        return self._console
+
+
+_installed: WarningHook | None = None
+
+
+def install(
+    *,
+    mode: Literal["once", "always", "count"] = "once",
+    maxsize: int = 1024,
+    console: rich.console.Console | None = None,
+) -> WarningHook:
+    """Present diagnostic warnings with `rich`, deduplicating them by code.
+
+    This replaces :func:`warnings.showwarning` with a :class:`WarningHook`, and
+    registers its :meth:`~WarningHook.summarise` to be called at exit. It also
+    adds an "always" filter for diagnostic warnings, after any others, so that
+    they are not recorded by message in every module's ``__warningregistry__``.
+    Filters that match them first (eg: ``-W error``) still apply.
+
+    Any hook installed earlier is uninstalled first. The arguments are the
+    same as those of :class:`WarningHook`.
+    """
+    global _installed
+
+    uninstall()
+    hook = WarningHook(mode=mode, maxsize=maxsize, console=console)
+    hook._previous = warnings.showwarning  # pyright: ignore[reportPrivateUsage]
+    warnings.showwarning = hook.showwarning
+    warnings.filterwarnings("always", category=DiagnosticWarning, append=True)
+    atexit.register(hook.summarise)
+    _installed = hook
+    return hook
+
+
+def uninstall() -> None:
+    """Undo :func:`install`, without summarising the warnings held back."""
+    global _installed
+
+    hook, _installed = _installed, None
+    if hook is None:
+        return
+    atexit.unregister(hook.summarise)
+    if warnings.showwarning == hook.showwarning:
+        warnings.showwarning = hook._previous  # type: ignore[assignment]  # pyright: ignore[reportPrivateUsage]
+    entry = ("always", None, DiagnosticWarning, None, 0)
+    if entry in warnings.filters:
+        warnings.filters.remove(entry)  # type: ignore[arg-type]
@@ -7,11 +7,20 @@ first test).
 
 from __future__ import annotations
 
+import dataclasses
+import functools
+import json
+import pickle
+from typing import TYPE_CHECKING
+
 import pytest
 from rich.text import Text
 
 from diagnostic import Diagnostic, DiagnosticError
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class TestDiagnostic:
     def test_rejects_direct_instantiation_due_to_no_style_given(self):
@@ -109,13 +118,29 @@ class TestDiagnostic:
         ],
     )
     def test_rejects_incorrect_code_names(self, name: str) -> None:
+        # GIVEN / WHEN
+        with pytest.raises(ValueError) as exc_info:
+
+            class DerivedError(DiagnosticError):  # pyright: ignore[reportUnusedClass]
+                code = name
+
+        # THEN
+        error_str = str(exc_info.value)
+
+        assert "error code" in error_str
+        assert repr(name) in error_str
+        assert "must be kebab-case" in error_str
+        assert "DerivedError" in error_str
+
+    @pytest.mark.parametrize("name", ["bad_name", "-bad-name"])
+    def test_rejects_incorrect_code_names_in_arguments(self, name: str) -> None:
         # GIVEN
         class DerivedError(DiagnosticError):
-            code = name
+            pass
 
         # WHEN
         with pytest.raises(ValueError) as exc_info:
-            DerivedError(message="", causes=[], hint_stmt=None)
+            DerivedError(code=name, message="", causes=[], hint_stmt=None)
 
         # THEN
         error_str = str(exc_info.value)
@@ -125,6 +150,19 @@ class TestDiagnostic:
         assert "must be kebab-case" in error_str
         assert "DerivedError" in error_str
 
+    def test_rejects_incorrect_style(self) -> None:
+        # GIVEN / WHEN
+        with pytest.raises(TypeError) as exc_info:
+
+            class DerivedError(DiagnosticError):  # pyright: ignore[reportUnusedClass]
+                style = "red"  # type: ignore[assignment]
+
+        # THEN
+        error_str = str(exc_info.value)
+
+        assert "`style` must be a DiagnosticStyle" in error_str
+        assert "DerivedError" in error_str
+
     def test_permits_creation_without_details_link(self) -> None:
         # GIVEN
         class DerivedError(DiagnosticError):
@@ -137,14 +175,12 @@ class TestDiagnostic:
         assert obj.details_link is None
 
     def test_reject_docs_url_without_code_template(self) -> None:
-        # GIVEN
-        class DerivedError(DiagnosticError):
-            code = "subclass-code"
-            docs_index = "https://example.com/"
-
-        # WHEN
+        # GIVEN / WHEN
         with pytest.raises(ValueError) as exc_info:
-            DerivedError(message="", causes=[], hint_stmt=None)
+
+            class DerivedError(DiagnosticError):  # pyright: ignore[reportUnusedClass]
+                code = "subclass-code"
+                docs_index = "https://example.com/"
 
         # THEN
         error_str = str(exc_info.value)
@@ -200,6 +236,332 @@ class TestDiagnostic:
         assert "DiagnosticError" in error_str
 
 
+class TestDeferred:
+    def test_callables_are_called_when_presented(self) -> None:
+        # GIVEN
+        calls: list[str] = []
+
+        def deferred(value: str) -> Callable[[], str]:
+            def call() -> str:
+                calls.append(value)
+                return value
+
+            return call
+
+        obj = DiagnosticError(
+            code="code",
+            message=deferred("message"),
+            causes=["cause", deferred("deferred cause")],
+            hint_stmt=deferred("hint"),
+            note_stmt=deferred("note"),
+        )
+        assert calls == []
+
+        # WHEN
+        first, second = str(obj), str(obj)
+
+        # THEN
+        assert calls == ["message", "deferred cause", "note", "hint"]
+        assert first == second
+        assert obj.message == "message"
+        assert obj.causes == ["cause", "deferred cause"]
+        assert obj.note_stmt == "note"
+        assert obj.hint_stmt == "hint"
+
+    def test_template_with_arguments(self) -> None:
+        # GIVEN
+        obj = DiagnosticError(
+            code="code",
+            message=functools.partial("Could not find {}".format, "a file"),
+            causes=[],
+            hint_stmt=None,
+        )
+
+        # WHEN
+        result = str(obj)
+
+        # THEN
+        assert result == "code\n\nCould not find a file"
+
+    def test_frozen_diagnostics_are_resolved(self) -> None:
+        # GIVEN
+        class FrozenError(DiagnosticError, frozen=True):
+            code = "frozen-code"
+
+        def create() -> FrozenError:
+            return FrozenError(
+                message=lambda: "message", causes=[lambda: "cause"], hint_stmt=None
+            )
+
+        # WHEN
+        first, second = create(), create()
+
+        # THEN
+        assert first == second
+        assert first.message == "message"
+        assert first.causes == ("cause",)
+
+    def test_details_link_is_computed_on_first_access(self) -> None:
+        # GIVEN
+        class DerivedError(DiagnosticError):
+            code = "subclass-code"
+            docs_index = "https://example.com/{code}"
+
+        obj = DerivedError(message="", causes=[], hint_stmt=None)
+        DerivedError.docs_index = "https://example.com/#{code}"
+
+        # WHEN
+        first, second = obj.details_link, obj.details_link
+
+        # THEN
+        assert first == second == "https://example.com/#subclass-code"
+
+    def test_details_link_can_be_overridden(self) -> None:
+        # GIVEN
+        obj = DiagnosticError(code="code", message="", causes=[], hint_stmt=None)
+
+        # WHEN
+        obj.details_link = "https://example.com/custom"
+
+        # THEN
+        assert obj.details_link == "https://example.com/custom"
+
+
+class TestStorage:
+    def test_concrete_classes_do_not_populate_instance_dict(self) -> None:
+        # GIVEN
+        class DerivedError(DiagnosticError):
+            code = "subclass-code"
+            docs_index = "https://example.com/{code}"
+
+        # WHEN
+        obj = DerivedError(
+            message="message", causes=["cause"], hint_stmt="hint", note_stmt="note"
+        )
+
+        # THEN
+        assert vars(obj) == {}
+        assert obj.code == "subclass-code"
+        assert DerivedError.code == "subclass-code"
+
+    def test_instance_code_does_not_affect_class_code(self) -> None:
+        # GIVEN
+        class DerivedError(DiagnosticError):
+            code = "subclass-code"
+
+        # WHEN
+        obj = DerivedError(code="instance-code", message="", causes=[], hint_stmt=None)
+
+        # THEN
+        assert obj.code == "instance-code"
+        assert DerivedError.code == "subclass-code"
+        assert DiagnosticError.code is None
+
+
+class TestFrozen:
+    def test_rejects_assignment(self) -> None:
+        # GIVEN
+        class FrozenError(DiagnosticError, frozen=True):
+            code = "frozen-code"
+
+        obj = FrozenError(message="message", causes=["cause"], hint_stmt=None)
+
+        # WHEN / THEN
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            obj.message = "different"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            obj.code = "different"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            del obj.hint_stmt
+        assert obj.causes == ("cause",)
+
+    def test_permits_exception_machinery(self) -> None:
+        # GIVEN
+        class FrozenError(DiagnosticError, frozen=True):
+            code = "frozen-code"
+
+        obj = FrozenError(message="message", causes=[], hint_stmt=None)
+
+        # WHEN
+        obj.add_note("additional note")
+        with pytest.raises(FrozenError) as exc_info:
+            raise obj
+
+        # THEN
+        assert exc_info.value.__notes__ == ["additional note"]
+        assert exc_info.value.__traceback__ is not None
+
+    def test_equality_and_hash(self) -> None:
+        # GIVEN
+        class FrozenError(DiagnosticError, frozen=True):
+            code = "frozen-code"
+
+        def create(message: str | Text) -> FrozenError:
+            return FrozenError(message=message, causes=["cause"], hint_stmt=None)
+
+        # WHEN
+        first, second, different = create("one"), create("one"), create(Text("one"))
+
+        # THEN
+        assert first == second
+        assert hash(first) == hash(second)
+        assert first != different
+        assert len({first, second, different}) == 2
+
+    def test_frozen_is_inherited(self) -> None:
+        # GIVEN
+        class FrozenError(DiagnosticError, frozen=True):
+            pass
+
+        # WHEN
+        class DerivedError(FrozenError):
+            code = "derived-code"
+
+        # THEN
+        obj = DerivedError(message="", causes=[], hint_stmt=None)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            obj.message = "different"
+
+    def test_rejects_unfreezing(self) -> None:
+        # GIVEN
+        class FrozenError(DiagnosticError, frozen=True):
+            pass
+
+        # WHEN
+        with pytest.raises(TypeError) as exc_info:
+
+            class DerivedError(FrozenError, frozen=False):  # pyright: ignore[reportUnusedClass]
+                pass
+
+        # THEN
+        assert "non-frozen" in str(exc_info.value)
+        assert "DerivedError" in str(exc_info.value)
+
+
+class PackageError(DiagnosticError, frozen=True):
+    """A diagnostic with its own arguments, at module level so it can be pickled."""
+
+    code = "package-error"
+    docs_index = "https://example.com/{code}"
+
+    def __init__(self, *, package: str) -> None:
+        super().__init__(
+            message=Text.from_markup(f"Could not install [green]{package}[/]"),
+            causes=[functools.partial("{} is {}".format, package, "broken")],
+            hint_stmt=Text("Try again.", style="bold"),
+        )
+
+
+class UnslottedDiagnostic(Diagnostic):
+    """A diagnostic without `__slots__`, so its fields are in its `__dict__`."""
+
+    style = DiagnosticError.style
+
+
+class TestSerialization:
+    def test_pickling(self) -> None:
+        # GIVEN
+        obj = PackageError(package="example")
+        obj.add_note("additional note")
+
+        # WHEN
+        restored = pickle.loads(pickle.dumps(obj))
+
+        # THEN
+        assert type(restored) is PackageError
+        assert restored == obj
+        assert restored.causes == ("example is broken",)
+        assert restored.message.spans == obj.message.spans  # type: ignore[union-attr]
+        assert restored.details_link == "https://example.com/package-error"
+        assert restored.__notes__ == ["additional note"]
+
+    def test_pickling_without_slots(self) -> None:
+        # GIVEN
+        obj = UnslottedDiagnostic(
+            code="unslotted",
+            # Deferred, and can not be pickled itself.
+            message=lambda: Text.from_markup("Could not install [green]example[/]"),
+            causes=["cause"],
+            hint_stmt=None,
+        )
+        obj.extra = "kept"  # pyright: ignore[reportAttributeAccessIssue]
+
+        # WHEN
+        pickled = pickle.dumps(obj)
+        restored = pickle.loads(pickled)
+
+        # THEN
+        slotted = DiagnosticError(
+            code="unslotted", message=obj.message, causes=["cause"], hint_stmt=None
+        )
+        # Only the class and the extra attribute differ.
+        assert len(pickled) < len(pickle.dumps(slotted)) + 64
+        assert pickled.count(b"Could not install") == 1
+        assert pickled.count(b"cause") == 1
+        assert b"rich.text" not in pickled
+        assert type(restored) is UnslottedDiagnostic
+        assert repr(restored) == repr(obj)
+        assert restored.message.spans == obj.message.spans  # type: ignore[union-attr]
+        assert restored.__dict__["extra"] == "kept"
+
+    def test_pickling_keeps_overridden_details_link(self) -> None:
+        # GIVEN
+        obj = DiagnosticError(code="some-code", message="", causes=[], hint_stmt=None)
+        obj.details_link = "https://example.com/elsewhere"
+
+        # WHEN
+        restored = pickle.loads(pickle.dumps(obj))
+
+        # THEN
+        assert restored.details_link == "https://example.com/elsewhere"
+        assert restored.causes == []
+
+    def test_dict_round_trip_through_json(self) -> None:
+        # GIVEN
+        obj = PackageError(package="example")
+
+        # WHEN
+        data = json.loads(json.dumps(obj.to_dict()))
+        restored = PackageError.from_dict(data)
+
+        # THEN
+        assert data == {
+            "code": "package-error",
+            "message": ["Could not install example", "", [[18, 25, "green"]]],
+            "causes": ["example is broken"],
+            "note_stmt": None,
+            "hint_stmt": ["Try again.", "bold", []],
+            "details_link": "https://example.com/package-error",
+        }
+        assert restored == obj
+
+    def test_from_dict_determines_details_link(self) -> None:
+        # GIVEN
+        data = {"code": "other-code", "message": "message", "causes": ["cause"]}
+
+        # WHEN
+        restored = PackageError.from_dict(data)
+
+        # THEN
+        assert restored.code == "other-code"
+        assert restored.causes == ("cause",)
+        assert restored.hint_stmt is None
+        assert restored.details_link == "https://example.com/other-code"
+
+    @pytest.mark.parametrize(
+        ("data", "exception"),
+        [
+            ({"code": "not valid", "message": "", "causes": []}, ValueError),
+            ({"code": "valid", "message": "", "causes": "cause"}, TypeError),
+        ],
+    )
+    def test_from_dict_rejects_invalid_fields(
+        self, data: dict[str, object], exception: type[Exception]
+    ) -> None:
+        with pytest.raises(exception):
+            DiagnosticError.from_dict(data)
+
+
 @pytest.mark.parametrize("code_str", ["basic", "dashed-name"])
 @pytest.mark.parametrize("message", ["Message", Text("Message")])
 @pytest.mark.parametrize("causes", [[], ["causes"], [Text("causes")]])
@@ -0,0 +1,128 @@
+"""Tests the configuration for checking many projects at once."""
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from diagnostic._batch import Project, load_projects
+
+
+def test_single_project(tmp_path: Path) -> None:
+    # GIVEN
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        textwrap.dedent(
+            """
+            [tool.diagnostic.check-docs]
+            source = "src"
+            error-index = "docs/errors.md"
+            """
+        )
+    )
+
+    # WHEN
+    projects = load_projects(pyproject)
+
+    # THEN
+    assert projects == [
+        Project(
+            name="src",
+            source=tmp_path / "src",
+            docs_index=tmp_path / "docs" / "errors.md",
+        )
+    ]
+
+
+def test_many_projects(tmp_path: Path) -> None:
+    # GIVEN
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        textwrap.dedent(
+            """
+            [tool.diagnostic.check-docs]
+            fail-on-extra = false
+
+            [[tool.diagnostic.check-docs.projects]]
+            name = "first"
+            source = "first/src"
+            error-index = "docs"
+
+            [[tool.diagnostic.check-docs.projects]]
+            source = "second/src"
+            error-index = "docs"
+            fail-on-extra = true
+            """
+        )
+    )
+
+    # WHEN
+    projects = load_projects(pyproject)
+
+    # THEN
+    assert projects == [
+        Project(
+            name="first",
+            source=tmp_path / "first" / "src",
+            docs_index=tmp_path / "docs",
+            fail_on_extra=False,
+        ),
+        Project(
+            name="second/src",
+            source=tmp_path / "second" / "src",
+            docs_index=tmp_path / "docs",
+            fail_on_extra=True,
+        ),
+    ]
+
+
+def test_fail_on_extra_default(tmp_path: Path) -> None:
+    # GIVEN
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        textwrap.dedent(
+            """
+            [[tool.diagnostic.check-docs.projects]]
+            source = "first/src"
+            error-index = "docs"
+
+            [[tool.diagnostic.check-docs.projects]]
+            source = "second/src"
+            error-index = "docs"
+            fail-on-extra = true
+            """
+        )
+    )
+
+    # WHEN
+    projects = load_projects(pyproject, fail_on_extra=False)
+
+    # THEN
+    assert [project.fail_on_extra for project in projects] == [False, True]
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ("[tool.other]\n", "No [tool.diagnostic.check-docs] table"),
+        ("[tool.diagnostic.check-docs]\nsource = 'src'\n", "are required"),
+        (
+            "[tool.diagnostic.check-docs]\nsource = 1\nerror-index = 'docs'\n",
+            "'source' must be a str",
+        ),
+        ("[tool.diagnostic.check-docs]\nprojects = [1]\n", "must be a table"),
+        ("[tool.diagnostic.check-docs\n", "Invalid TOML"),
+    ],
+    ids=["missing", "incomplete", "wrong-type", "not-a-table", "invalid-toml"],
+)
+def test_invalid_configuration(tmp_path: Path, content: str, message: str) -> None:
+    # GIVEN
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(content)
+
+    # WHEN
+    with pytest.raises(ValueError) as exc_info:
+        load_projects(pyproject)
+
+    # THEN
+    assert message in str(exc_info.value)
@@ -0,0 +1,195 @@
+"""Tests the on-disk cache of codes found in files."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from diagnostic import _cache as cache
+from diagnostic import _parsers as parsers
+from diagnostic._git import blob_id
+
+
+@pytest.fixture
+def source_file(tmp_path: Path) -> Path:
+    file = tmp_path / "source.py"
+    file.write_text('DiagnosticError(code="some-code")\n')
+    return file
+
+
+class TestScanCache:
+    def test_roundtrip(self, tmp_path: Path, source_file: Path) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+        scan_cache.save()
+
+        # WHEN
+        result = cache.ScanCache(tmp_path / "cache", "sources").get(source_file)
+
+        # THEN
+        assert result == {"some-code": [(source_file, 1)]}
+        assert (tmp_path / "cache" / ".gitignore").exists()
+
+    def test_missing_entry(self, tmp_path: Path, source_file: Path) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+
+        # WHEN
+        result = scan_cache.get(source_file)
+
+        # THEN
+        assert result is None
+
+    def test_changed_content_invalidates(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+
+        # WHEN
+        source_file.write_text('DiagnosticError(code="other-code")\n\n')
+        result = scan_cache.get(source_file)
+
+        # THEN
+        assert result is None
+
+    def test_changed_mtime_with_same_content(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+
+        # WHEN
+        stat = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        result = scan_cache.get(source_file)
+
+        # THEN
+        assert result == {"some-code": [(source_file, 1)]}
+
+    def test_different_kind_is_separate(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+        scan_cache.save()
+
+        # WHEN
+        result = cache.ScanCache(tmp_path / "cache", "docs").get(source_file)
+
+        # THEN
+        assert result is None
+
+    def test_version_change_invalidates(
+        self, tmp_path: Path, source_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+        scan_cache.save()
+
+        # WHEN
+        monkeypatch.setattr(cache, "__version__", "0.0.0")
+        result = cache.ScanCache(tmp_path / "cache", "sources").get(source_file)
+
+        # THEN
+        assert result is None
+
+    def test_corrupt_cache_is_ignored(self, tmp_path: Path, source_file: Path) -> None:
+        # GIVEN
+        (tmp_path / "cache").mkdir()
+        (tmp_path / "cache" / "sources.json").write_text("{not json")
+
+        # WHEN
+        result = cache.ScanCache(tmp_path / "cache", "sources").get(source_file)
+
+        # THEN
+        assert result is None
+
+    def test_in_memory(self, tmp_path: Path, source_file: Path) -> None:
+        # GIVEN
+        scan_cache = cache.ScanCache(None, "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+
+        # WHEN
+        scan_cache.save()
+        result = scan_cache.get(source_file)
+
+        # THEN
+        assert result == {"some-code": [(source_file, 1)]}
+        assert list(tmp_path.iterdir()) == [source_file]
+
+    def test_trusted_entries_are_not_checked(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        # GIVEN
+        other_file = tmp_path / "other.py"
+        other_file.write_text('DiagnosticError(code="other-code")\n')
+        scan_cache = cache.ScanCache(None, "sources")
+        scan_cache.put(source_file, {"some-code": [(source_file, 1)]})
+        scan_cache.put(other_file, {"other-code": [(other_file, 1)]})
+        source_blob = blob_id(source_file.read_bytes())
+        source_file.write_text("\n")
+        other_file.write_text("\n")
+
+        # WHEN
+        scan_cache.trust(
+            {
+                os.path.abspath(source_file): source_blob,
+                # eg: the content was different in the revision being trusted.
+                os.path.abspath(other_file): blob_id(b"other content\n"),
+            }
+        )
+
+        # THEN
+        assert scan_cache.get(source_file) == {"some-code": [(source_file, 1)]}
+        assert scan_cache.get(other_file) is None
+
+
+def test_traversal_only_parses_uncached_files(tmp_path: Path) -> None:
+    # GIVEN
+    (tmp_path / "one.md").touch()
+    (tmp_path / "two.md").touch()
+    scan_cache = cache.ScanCache(tmp_path / "cache", "docs")
+    scan_cache.put(tmp_path / "one.md", {"cached": [(tmp_path / "one.md", 1)]})
+
+    seen: list[Path] = []
+
+    def parse(path: Path) -> parsers.codeLocationMapping:
+        seen.append(path)
+        return {"parsed": [(path, 2)]}
+
+    # WHEN
+    result = parsers.handle_directory_traversal(
+        tmp_path, parse, extensions=(".md",), cache=scan_cache
+    )
+
+    # THEN
+    assert seen == [tmp_path / "two.md"]
+    assert result == {
+        "cached": [(tmp_path / "one.md", 1)],
+        "parsed": [(tmp_path / "two.md", 2)],
+    }
+    assert scan_cache.get(tmp_path / "two.md") == {"parsed": [(tmp_path / "two.md", 2)]}
+
+
+def test_traversal_caches_prefiltered_files(tmp_path: Path) -> None:
+    # GIVEN
+    source_file = tmp_path / "source.py"
+    source_file.write_text('DiagnosticError(code="some-code")\n')
+    scan_cache = cache.ScanCache(tmp_path / "cache", "sources")
+    parsers.find_codes_in_sources(tmp_path, cache=scan_cache)
+    source_file.write_text("x = 1\n")
+
+    # WHEN
+    result = parsers.find_codes_in_sources(tmp_path, cache=scan_cache)
+    scan_cache.save()
+
+    # THEN
+    assert result == {}
+    reloaded = cache.ScanCache(tmp_path / "cache", "sources")
+    assert reloaded.get(source_file) == {}
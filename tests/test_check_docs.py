@@ -1 +1,228 @@
 """Tests the source code and documentation analysis logic."""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from diagnostic import DiagnosticError
+from diagnostic import _check_docs as check_docs
+from diagnostic import _reports as reports
+from diagnostic._batch import Project
+from diagnostic._git import unchanged_files
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "errors.py").write_text(
+        'class AwesomeError(DiagnosticError):\n    code = "awesome-error"\n'
+    )
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "errors.md").write_text("## awesome-error\n")
+    return tmp_path
+
+
+class TestWatcher:
+    def test_first_poll_is_a_change(self, project: Path) -> None:
+        # GIVEN
+        watcher = check_docs._Watcher(project / "src", project / "docs")  # pyright: ignore[reportPrivateUsage]
+
+        # WHEN / THEN
+        assert watcher.poll()
+        assert not watcher.poll()
+
+    @pytest.mark.parametrize(
+        "change",
+        ["modified", "added", "removed"],
+    )
+    def test_detects_changes(self, project: Path, change: str) -> None:
+        # GIVEN
+        watcher = check_docs._Watcher(project / "src", project / "docs")  # pyright: ignore[reportPrivateUsage]
+        watcher.poll()
+
+        # WHEN
+        if change == "modified":
+            file = project / "docs" / "errors.md"
+            stat = file.stat()
+            os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        elif change == "added":
+            (project / "src" / "more.py").touch()
+        else:
+            (project / "src" / "errors.py").unlink()
+
+        # THEN
+        assert watcher.poll()
+
+    def test_ignores_unrelated_files(self, project: Path) -> None:
+        # GIVEN
+        watcher = check_docs._Watcher(project / "src", project / "docs")  # pyright: ignore[reportPrivateUsage]
+        watcher.poll()
+
+        # WHEN
+        (project / "src" / "notes.txt").touch()
+
+        # THEN
+        assert not watcher.poll()
+
+
+def test_watch_keeps_going_after_a_file_breaks(
+    project: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # GIVEN
+    errors = project / "src" / "errors.py"
+    content = errors.read_text()
+    changes = [
+        lambda: errors.write_text(content + "def broken(\n"),
+        lambda: errors.write_bytes(content.encode() + b"# \xff\n"),
+        lambda: errors.write_text(content),
+    ]
+
+    def sleep(interval: float) -> None:
+        if not changes:
+            raise KeyboardInterrupt
+        changes.pop(0)()
+
+    monkeypatch.setattr(check_docs.time, "sleep", sleep)
+
+    # WHEN
+    with pytest.raises(KeyboardInterrupt):
+        check_docs._watch(  # pyright: ignore[reportPrivateUsage]
+            project / "src", project / "docs", verbose=False, fail_on_extra=False
+        )
+
+    # THEN
+    out, err = capsys.readouterr()
+    assert "SyntaxError: " in err
+    assert "errors.py, line 3" in err
+    assert "UnicodeDecodeError: " in err
+    assert out.count("All error codes in code are documented!") == 2
+    assert out.rstrip().endswith(
+        "All error codes in code are documented! 🎉\nWatching for changes..."
+    )
+
+
+def test_rescan_only_parses_changed_files(project: Path) -> None:
+    # GIVEN
+    source_cache, docs_cache = check_docs._caches(None, strict_rst=False)  # pyright: ignore[reportPrivateUsage]
+    check_docs._scan(  # pyright: ignore[reportPrivateUsage]
+        project / "src",
+        project / "docs",
+        source_cache=source_cache,
+        docs_cache=docs_cache,
+    )
+    (project / "src" / "more.py").write_text('DiagnosticError(code="more-error")\n')
+
+    # WHEN
+    code_codes, doc_codes, stats = check_docs._scan(  # pyright: ignore[reportPrivateUsage]
+        project / "src",
+        project / "docs",
+        source_cache=source_cache,
+        docs_cache=docs_cache,
+    )
+
+    # THEN
+    assert (stats.files, stats.cached, stats.parsed) == (2, 1, 1)
+    assert set(code_codes) == {"awesome-error", "more-error"}
+    with pytest.raises(DiagnosticError) as exc_info:
+        check_docs._report(  # pyright: ignore[reportPrivateUsage]
+            project / "docs",
+            code_codes,
+            doc_codes,
+            stats,
+            verbose=False,
+            fail_on_extra=True,
+        )
+    assert exc_info.value.code == "undocumented-codes"
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_changed_since_only_trusts_entries_cached_at_the_revision(
+    project: Path,
+) -> None:
+    # GIVEN
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=project,
+            check=True,
+            capture_output=True,
+        )
+
+    errors = project / "src" / "errors.py"
+    (project / "src" / "other.py").write_text("x = 1\n")
+    git("init", "-q")
+    git("add", "src")
+    git("commit", "-q", "-m", "Define old-error")
+    cache_dir = project / "cache"
+    source_cache, _ = check_docs._caches(cache_dir, strict_rst=False)  # pyright: ignore[reportPrivateUsage]
+    check_docs._scan(project / "src", project / "docs", source_cache=source_cache)  # pyright: ignore[reportPrivateUsage]
+    source_cache.save()
+    errors.write_text(errors.read_text().replace("awesome-error", "new-error"))
+    git("commit", "-q", "-a", "-m", "Rename to new-error")
+    (project / "src" / "other.py").write_text("x = 2\n")
+    git("commit", "-q", "-a", "-m", "Change another file")
+
+    # WHEN
+    source_cache, _ = check_docs._caches(  # pyright: ignore[reportPrivateUsage]
+        cache_dir,
+        strict_rst=False,
+        unchanged=unchanged_files("HEAD~1", project / "src"),
+    )
+    code_codes, _, _ = check_docs._scan(  # pyright: ignore[reportPrivateUsage]
+        project / "src", project / "docs", source_cache=source_cache
+    )
+
+    # THEN
+    assert set(code_codes) == {"new-error"}
+
+
+def test_process_to_report(project: Path) -> None:
+    # GIVEN
+    (project / "docs" / "errors.md").write_text("## awesome-error\n## extra-error\n")
+    stream = io.StringIO()
+
+    # WHEN
+    success = check_docs._process_to_report(  # pyright: ignore[reportPrivateUsage]
+        project / "src",
+        project / "docs",
+        True,
+        reports.NDJSONReport(stream),
+    )
+
+    # THEN
+    assert not success
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(record["type"], record["code"]) for record in records] == [
+        ("code", "awesome-error"),
+        ("heading", "awesome-error"),
+        ("heading", "extra-error"),
+        ("extra", "extra-error"),
+    ]
+
+
+def test_process_batch(project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    # GIVEN
+    (project / "other").mkdir()
+    (project / "other" / "errors.py").write_text(
+        'DiagnosticError(code="other-error")\n'
+    )
+    projects = [
+        Project("good", project / "src", project / "docs"),
+        Project("bad", project / "other", project / "docs", fail_on_extra=False),
+    ]
+
+    # WHEN
+    success = check_docs._process_batch(projects, verbose=False)  # pyright: ignore[reportPrivateUsage]
+
+    # THEN
+    assert not success
+    captured = capsys.readouterr()
+    assert "good" in captured.out
+    assert "bad" in captured.out
+    assert "other-error" in captured.err
+    assert "awesome-error" not in captured.err
@@ -0,0 +1,178 @@
+"""Tests the presentation of diagnostics from many workers."""
+
+from __future__ import annotations
+
+import io
+import multiprocessing
+import threading
+import time
+
+import pytest
+from rich.console import Console
+
+from diagnostic import DiagnosticCollector, DiagnosticError, dump_plain
+
+
+def create_error(code: str, message: str = "message") -> DiagnosticError:
+    return DiagnosticError(
+        code=code, message=message, causes=["cause"], hint_stmt="hint"
+    )
+
+
+def _submit_from_process(queue: multiprocessing.Queue[DiagnosticError | None]) -> None:
+    queue.put(create_error("from-process"))
+
+
+def test_collects_from_threads() -> None:
+    # GIVEN
+    stream = io.StringIO()
+    collector = DiagnosticCollector(stream=stream)
+
+    def work(index: int) -> None:
+        for _ in range(10):
+            collector.submit(create_error(f"worker-{index}"))
+        collector.submit(create_error("shared", "the same from every worker"))
+
+    # WHEN
+    with collector:
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # THEN
+    output = stream.getvalue()
+    for index in range(4):
+        assert output.count(f"worker-{index}\n") == 1
+    assert output.count("the same from every worker") == 1
+    assert collector.presented == 5
+    assert collector.duplicates == 4 * 9 + 3
+
+
+def test_output_matches_dump_plain() -> None:
+    # GIVEN
+    errors = [create_error("first"), create_error("second"), create_error("third")]
+    stream = io.StringIO()
+    collector = DiagnosticCollector(stream=stream, batch_size=2)
+
+    # WHEN
+    for error in errors:
+        collector.submit(error)
+    collector.close()
+
+    # THEN
+    expected = io.StringIO()
+    dump_plain(errors, expected)
+    assert stream.getvalue() == expected.getvalue()
+
+
+def test_keeps_duplicates_without_deduplicate() -> None:
+    # GIVEN
+    collector = DiagnosticCollector(stream=io.StringIO(), deduplicate=False)
+
+    # WHEN
+    collector.submit(create_error("same"))
+    collector.submit(create_error("same"))
+    collector.close()
+
+    # THEN
+    assert collector.presented == 2
+    assert collector.duplicates == 0
+
+
+def test_presents_batches_while_running() -> None:
+    # GIVEN
+    stream = io.StringIO()
+
+    with DiagnosticCollector(stream=stream, batch_size=2, interval=60) as collector:
+        # WHEN
+        collector.submit(create_error("first"))
+        collector.submit(create_error("second"))
+        collector.submit(create_error("third"))
+        deadline = time.monotonic() + 5
+        while collector.presented < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # THEN
+        assert collector.presented == 2
+        assert "third" not in stream.getvalue()
+
+    assert collector.presented == 3
+
+
+def test_presents_after_interval() -> None:
+    # GIVEN
+    with DiagnosticCollector(stream=io.StringIO(), interval=0.01) as collector:
+        # WHEN
+        collector.submit(create_error("only"))
+        deadline = time.monotonic() + 5
+        while collector.presented < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # THEN
+        assert collector.presented == 1
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="needs the fork start method",
+)
+def test_collects_from_processes() -> None:
+    # GIVEN
+    context = multiprocessing.get_context("fork")
+    queue: multiprocessing.Queue[DiagnosticError | None] = context.Queue()
+    stream = io.StringIO()
+
+    # WHEN
+    with DiagnosticCollector(queue, stream=stream):
+        processes = [
+            context.Process(target=_submit_from_process, args=(queue,))
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    # THEN
+    assert stream.getvalue().count("from-process\n") == 1
+
+
+def test_presents_on_console() -> None:
+    # GIVEN
+    console = Console(file=io.StringIO(), color_system=None, width=80)
+    collector = DiagnosticCollector(console=console, batch_size=1)
+
+    # WHEN
+    collector.submit(create_error("first"))
+    collector.submit(create_error("second"))
+    collector.close()
+
+    # THEN
+    output = console.file.getvalue()  # type: ignore[attr-defined]
+    assert "error: first" in output
+    assert "error: second" in output
+    assert "\n\nerror: second" in output
+
+
+def test_rejects_console_and_stream() -> None:
+    with pytest.raises(ValueError, match="both console and stream"):
+        DiagnosticCollector(console=Console(), stream=io.StringIO())
+
+
+def test_reraises_errors_when_closing() -> None:
+    # GIVEN
+    class BrokenStream(io.StringIO):
+        def write(self, s: str) -> int:
+            raise OSError("broken")
+
+    collector = DiagnosticCollector(stream=BrokenStream())
+    collector.start()
+
+    # WHEN
+    collector.submit(create_error("first"))
+
+    # THEN
+    with pytest.raises(OSError, match="broken"):
+        collector.close()
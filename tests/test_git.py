@@ -0,0 +1,103 @@
+"""Tests finding the files that have changed, according to git."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from diagnostic._git import blob_id, changed_files, unchanged_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def _git(repository: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repository,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    (tmp_path / ".gitignore").write_text("ignored.py\n")
+    (tmp_path / "src").mkdir()
+    for name in ["unchanged.py", "modified.py", "staged.py"]:
+        (tmp_path / "src" / name).write_text("x = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "Initial commit")
+    return tmp_path
+
+
+def test_changed_files(repository: Path) -> None:
+    # GIVEN
+    src = repository / "src"
+    (src / "modified.py").write_text("x = 2\n")
+    (src / "staged.py").write_text("x = 2\n")
+    _git(repository, "add", "src/staged.py")
+    (src / "untracked.py").touch()
+    (src / "ignored.py").touch()
+
+    # WHEN
+    changed = changed_files("HEAD", src)
+
+    # THEN
+    assert changed == {
+        os.path.abspath(src / name)
+        for name in ["modified.py", "staged.py", "untracked.py"]
+    }
+
+
+def test_changed_files_since_older_revision(repository: Path) -> None:
+    # GIVEN
+    (repository / "src" / "modified.py").write_text("x = 2\n")
+    _git(repository, "commit", "-q", "-a", "-m", "Change")
+
+    # WHEN
+    changed = changed_files("HEAD~1", repository / "src" / "unchanged.py")
+
+    # THEN
+    assert changed == {os.path.abspath(repository / "src" / "modified.py")}
+
+
+def test_unchanged_files(repository: Path) -> None:
+    # GIVEN
+    src = repository / "src"
+    (src / "modified.py").write_text("x = 2\n")
+    (src / "untracked.py").touch()
+
+    # WHEN
+    unchanged = unchanged_files("HEAD", src)
+
+    # THEN
+    assert unchanged == {
+        os.path.abspath(repository / name): blob_id((repository / name).read_bytes())
+        for name in [".gitignore", "src/unchanged.py", "src/staged.py"]
+    }
+
+
+def test_blob_id_matches_git(repository: Path) -> None:
+    # GIVEN
+    file = repository / "src" / "unchanged.py"
+
+    # WHEN
+    result = subprocess.run(
+        ["git", "hash-object", str(file)], check=True, capture_output=True, text=True
+    )
+
+    # THEN
+    assert blob_id(file.read_bytes()) == result.stdout.strip()
+
+
+def test_unknown_revision(repository: Path) -> None:
+    with pytest.raises(ValueError, match="git diff failed"):
+        changed_files("does-not-exist", repository)
+
+
+def test_not_a_repository(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="git rev-parse failed"):
+        changed_files("HEAD", tmp_path)
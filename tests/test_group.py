@@ -0,0 +1,107 @@
+"""Tests the presentation of multiple diagnostics together."""
+
+from __future__ import annotations
+
+import io
+
+from rich.console import Console
+from rich.text import Text
+
+from diagnostic import DiagnosticError, DiagnosticGroup, dump_plain, render_many
+
+
+def create_error(code: str, message: str | Text = "message") -> DiagnosticError:
+    return DiagnosticError(
+        code=code, message=message, causes=["cause"], hint_stmt="hint"
+    )
+
+
+def rendered(*renderables: object) -> str:
+    with io.StringIO() as stream:
+        console = Console(file=stream, color_system=None)
+        for renderable in renderables:
+            console.print(renderable)
+        return stream.getvalue()
+
+
+def test_render_many_matches_individual_rendering() -> None:
+    # GIVEN
+    errors = [create_error("first"), create_error("second")]
+    console = Console(file=io.StringIO(), color_system=None)
+
+    # WHEN
+    render_many(errors, console=console)
+
+    # THEN
+    result = console.file.getvalue()  # type: ignore[attr-defined]
+    assert result == rendered(errors[0], "", errors[1])
+
+
+def test_groups_by_code_in_order_of_first_occurrence() -> None:
+    # GIVEN
+    errors = [
+        create_error("first", "one"),
+        create_error("second", "two"),
+        create_error("first", "three"),
+    ]
+
+    # WHEN
+    group = DiagnosticGroup(errors, group_by_code=True)
+
+    # THEN
+    assert group.diagnostics == [errors[0], errors[2], errors[1]]
+
+
+def test_deduplicates_identical_diagnostics() -> None:
+    # GIVEN
+    errors = [
+        create_error("first", "one"),
+        create_error("first", "one"),
+        create_error("first", Text("one")),
+        create_error("first", Text("one", style="bold")),
+        create_error("second", "one"),
+    ]
+
+    # WHEN
+    group = DiagnosticGroup(errors, deduplicate=True)
+
+    # THEN
+    assert group.diagnostics == [errors[0], errors[3], errors[4]]
+
+
+def test_deduplicates_plain_text_and_string() -> None:
+    # GIVEN
+    errors = [create_error("first", "one"), create_error("first", Text("one"))]
+    console = Console(file=io.StringIO(), color_system=None)
+
+    # WHEN
+    render_many(errors, console=console, deduplicate=True)
+
+    # THEN
+    assert rendered(errors[0]) == rendered(errors[1])
+    assert console.file.getvalue() == rendered(errors[0])  # type: ignore[attr-defined]
+
+
+def test_keeps_duplicates_by_default() -> None:
+    # GIVEN
+    errors = [create_error("first"), create_error("first")]
+
+    # WHEN
+    group = DiagnosticGroup(errors)
+
+    # THEN
+    assert group.diagnostics == errors
+    assert repr(group) == "<DiagnosticGroup(2 diagnostics)>"
+
+
+def test_dump_plain() -> None:
+    # GIVEN
+    errors = [create_error("first"), create_error("second")]
+
+    # WHEN
+    with io.StringIO() as stream:
+        dump_plain(errors, stream)
+        result = stream.getvalue()
+
+    # THEN
+    assert result == f"{errors[0]}\n\n{errors[1]}\n"
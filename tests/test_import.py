@@ -0,0 +1,75 @@
+"""Tests the import-time cost of the package."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+_REPORT_MODULES = "import sys; print(*sys.modules, sep='\\n')"
+
+
+def _importtime(statement: str) -> dict[str, int]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; {_REPORT_MODULES}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Failed imports (eg: optional imports within the standard library) are
+    # reported by `-X importtime` too, so only keep the ones that were loaded.
+    loaded = set(process.stdout.splitlines())
+
+    modules: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, _, name = (
+            part.strip() for part in line.replace(":", "|", 1).split("|")
+        )
+        if name in loaded:
+            modules[name] = int(self_us)
+    return modules
+
+
+def imported_modules(statement: str) -> dict[str, int]:
+    """Run `statement` in a fresh interpreter, with `-X importtime`.
+
+    Returns:
+        A mapping of every module imported by `statement`, to the time spent
+        importing it (excluding its dependencies) in microseconds. Modules
+        imported during interpreter startup (eg: by `site`) are excluded.
+    """
+    startup = _importtime("pass")
+    modules = _importtime(statement)
+    return {name: us for name, us in modules.items() if name not in startup}
+
+
+def is_standard_library(name: str) -> bool:
+    return name.split(".")[0] in sys.stdlib_module_names
+
+
+def test_import_only_loads_standard_library() -> None:
+    # GIVEN / WHEN
+    modules = imported_modules("import diagnostic")
+
+    # THEN
+    assert "diagnostic" in modules
+    assert [
+        name
+        for name in modules
+        if not is_standard_library(name) and name.split(".")[0] != "diagnostic"
+    ] == []
+
+
+def test_check_docs_does_not_load_document_parsers() -> None:
+    # GIVEN / WHEN
+    modules = imported_modules("import diagnostic._check_docs")
+
+    # THEN
+    assert "diagnostic._parsers" in modules
+    assert [
+        name
+        for name in modules
+        if name.split(".")[0] in ("docutils", "markdown_it") or name == "rich.traceback"
+    ] == []
@@ -0,0 +1,176 @@
+"""Tests the presentation of diagnostics through `logging`."""
+
+from __future__ import annotations
+
+import io
+import logging
+import logging.handlers
+import pickle
+import queue
+from typing import TYPE_CHECKING
+
+import pytest
+from rich.console import Console
+
+from diagnostic import DiagnosticError
+from diagnostic.logging import (
+    DiagnosticFormatter,
+    DiagnosticHandler,
+    DiagnosticQueueHandler,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class TerminalStream(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def create_error() -> DiagnosticError:
+    return DiagnosticError(
+        code="logged-error", message="message", causes=["cause"], hint_stmt="hint"
+    )
+
+
+@pytest.fixture
+def logger() -> Iterator[logging.Logger]:
+    logger = logging.getLogger("diagnostic.tests")
+    logger.propagate = False
+    yield logger
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+
+
+def test_presents_diagnostic_logged_as_message(logger: logging.Logger) -> None:
+    # GIVEN
+    stream = io.StringIO()
+    logger.addHandler(DiagnosticHandler(stream))
+    error = create_error()
+
+    # WHEN
+    logger.warning(error)
+
+    # THEN
+    assert stream.getvalue() == f"logged-error\n{error}\n"
+
+
+def test_presents_diagnostic_logged_as_exception(logger: logging.Logger) -> None:
+    # GIVEN
+    stream = io.StringIO()
+    logger.addHandler(DiagnosticHandler(stream))
+    error = create_error()
+
+    # WHEN
+    try:
+        raise error
+    except DiagnosticError:
+        logger.exception("Could not %s", "continue")
+
+    # THEN
+    assert stream.getvalue() == f"Could not continue\n{error}\n"
+
+
+def test_shows_traceback(logger: logging.Logger) -> None:
+    # GIVEN
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(
+        DiagnosticFormatter("%(levelname)s %(message)s", show_traceback=True)
+    )
+    logger.addHandler(handler)
+
+    # WHEN
+    try:
+        raise create_error()
+    except DiagnosticError:
+        logger.exception("Failed")
+
+    # THEN
+    output = stream.getvalue()
+    assert output.startswith("ERROR Failed\nTraceback (most recent call last):\n")
+    assert output.endswith(f"\n{create_error()}\n")
+
+
+def test_leaves_other_records_alone() -> None:
+    # GIVEN
+    record = logging.makeLogRecord({"msg": "Hello %s", "args": ("world",)})
+
+    # WHEN
+    formatted = DiagnosticFormatter("%(levelname)s %(message)s").format(record)
+
+    # THEN
+    assert formatted == logging.Formatter("%(levelname)s %(message)s").format(record)
+
+
+def test_renders_on_console() -> None:
+    # GIVEN
+    console = Console(file=io.StringIO(), color_system=None, width=80)
+    record = logging.makeLogRecord({"msg": create_error()})
+
+    # WHEN
+    formatted = DiagnosticFormatter(console=console).format(record)
+
+    # THEN
+    assert formatted.startswith("logged-error\nerror: logged-error\n")
+    assert "× message" in formatted
+    assert not formatted.endswith("\n")
+
+
+def test_renders_with_rich_on_terminals(logger: logging.Logger) -> None:
+    # GIVEN
+    stream = TerminalStream()
+    logger.addHandler(DiagnosticHandler(stream))
+
+    # WHEN
+    logger.error(create_error())
+
+    # THEN
+    assert "\x1b[" in stream.getvalue()
+
+
+def test_queue_handler_defers_presenting(logger: logging.Logger) -> None:
+    # GIVEN
+    records: queue.Queue[logging.LogRecord] = queue.Queue()
+    logger.addHandler(DiagnosticQueueHandler(records))
+    error = create_error()
+
+    # WHEN
+    try:
+        raise error
+    except DiagnosticError:
+        logger.exception("Could not %s", "continue")
+    logger.error(error)
+
+    # THEN
+    first, second = records.get_nowait(), records.get_nowait()
+    assert first.diagnostic is error  # type: ignore[attr-defined]
+    assert first.msg == "Could not continue"
+    assert first.exc_info is None
+    assert "Traceback" in (first.exc_text or "")
+    assert second.msg is error
+    # Nothing left in them that can not be sent to another process.
+    pickle.dumps(first)
+    pickle.dumps(second)
+
+
+def test_queue_listener_presents(logger: logging.Logger) -> None:
+    # GIVEN
+    records: queue.Queue[logging.LogRecord] = queue.Queue()
+    stream = io.StringIO()
+    logger.addHandler(DiagnosticQueueHandler(records))
+    listener = logging.handlers.QueueListener(records, DiagnosticHandler(stream))
+    error = create_error()
+
+    # WHEN
+    listener.start()
+    try:
+        raise error
+    except DiagnosticError:
+        logger.exception("Failed")
+    logger.warning("Not a diagnostic")
+    listener.stop()
+
+    # THEN
+    assert stream.getvalue() == f"Failed\n{error}\nNot a diagnostic\n"
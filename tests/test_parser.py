@@ -1,11 +1,14 @@
 """Tests for the parsing and discovery logic for codes in code and docs."""
 
+import random
+import sys
 import textwrap
 from pathlib import Path
 
 import pytest
 
 from diagnostic import _parsers as parsers
+from diagnostic._base import RE_code
 
 
 class TestDocumentationParsing:
@@ -115,6 +118,98 @@ class TestDocumentationParsing:
             "heading-6": [(document, 33)],
         }
 
+    def test_inline_markup_in_titles_rst(self, tmp_path: Path) -> None:
+        # GIVEN
+        document = tmp_path / "content.rst"
+        content = textwrap.dedent(
+            """\
+                Errors
+                ======
+
+                ``literal-heading``
+                -------------------
+
+                plain-heading
+                -------------
+            """
+        )
+        document.write_text(content)
+
+        # WHEN
+        headings = parsers.find_code_headings_in_document(document)
+
+        # THEN
+        assert headings == {
+            "Errors": [(document, 2)],
+            "literal-heading": [(document, 5)],
+            "plain-heading": [(document, 8)],
+        }
+
+    def test_strict_rst_matches_scanner(self, tmp_path: Path) -> None:
+        # GIVEN
+        document = tmp_path / "content.rst"
+        content = textwrap.dedent(
+            """\
+                Introduction.
+
+                heading-1
+                =========
+
+                .. code-block:: rst
+
+                    not-a-heading
+                    -------------
+
+                - not-a-heading-either
+
+                ---------
+                heading-2
+                ---------
+            """
+        )
+        document.write_text(content)
+
+        # WHEN
+        scanned = parsers.find_code_headings_in_document(document)
+        parsed = parsers.find_code_headings_in_document(document, strict_rst=True)
+
+        # THEN
+        assert (
+            scanned
+            == parsed
+            == {
+                "heading-1": [(document, 4)],
+                "heading-2": [(document, 15)],
+            }
+        )
+
+    def test_rst_scanner_matches_docutils(self) -> None:
+        # GIVEN
+        fragments = [
+            *["", "", "", "text", "some-code", "Some Title", "  inset-code"],
+            *["=========", "---------", "~~~~~~~~~", "--", "====", "#####"],
+            *["- item", "1. item", "  indented", "    more", "term", ":field: x"],
+            *[".. note::", "..", ".. contents::", "text::", "| line", ">>> x"],
+            *["``some-code``", "ref-code_", "+---+", "=====  =====", "\tx"],
+        ]
+        rng = random.Random(0)
+        documents = [
+            "Introduction.\n\n"
+            + "\n".join(rng.choices(fragments, k=rng.randint(1, 12)))
+            for _ in range(300)
+        ]
+
+        for document in documents:
+            # WHEN
+            scanned = parsers._scan_rst_titles(document)  # pyright: ignore[reportPrivateUsage]
+
+            # THEN
+            if scanned is not None:
+                parsed = parsers._parse_rst_titles(document)  # pyright: ignore[reportPrivateUsage]
+                assert scanned == [
+                    (text, lineno) for text, lineno in parsed if RE_code.match(text)
+                ], document
+
     def test_rejects_non_md_rst_file(self, tmp_path: Path) -> None:
         # GIVEN
         document = tmp_path / "content.asciidoc"
@@ -124,6 +219,79 @@ class TestDocumentationParsing:
         with pytest.raises(AssertionError):
             parsers.find_code_headings_in_document(document)
 
+    def test_setext_headings_and_code_md(self, tmp_path: Path) -> None:
+        # GIVEN
+        document = tmp_path / "content.md"
+        content = textwrap.dedent(
+            """\
+                heading-1
+                =========
+
+                ```
+                # not-a-heading
+                ```
+
+                    # not-a-heading-either
+
+                heading-2
+                ---------
+            """
+        )
+        document.write_text(content)
+
+        # WHEN
+        headings = parsers.find_code_headings_in_document(document)
+
+        # THEN
+        assert headings == {
+            "heading-1": [(document, 1)],
+            "heading-2": [(document, 10)],
+        }
+
+    def test_ambiguous_constructs_md(self, tmp_path: Path) -> None:
+        # GIVEN
+        document = tmp_path / "content.md"
+        content = textwrap.dedent(
+            """\
+                > ## quoted-heading
+
+                - item
+
+                      # not-a-heading
+            """
+        )
+        document.write_text(content)
+
+        # WHEN
+        headings = parsers.find_code_headings_in_document(document)
+
+        # THEN
+        assert headings == {"quoted-heading": [(document, 1)]}
+
+    def test_markdown_scanner_matches_markdown_it(self) -> None:
+        # GIVEN
+        fragments = [
+            *["", "", "", "text", "some-code", "  indented", "    code", "[ref]: /x"],
+            *["# a", "## some-code", "  ### b ##", "#no", "####### c", "# d \\#"],
+            *["===", "---", "  ---", "= =", "- - -", "***", "* * *", "--"],
+            *["- item", "+ item", "1. item", "2) item", "-", "  - item", "- # e"],
+            *["```", "~~~", "````", "```py", "``` a`b", "   ```", "    ```"],
+            *["> quote", "<div>", "a\tb"],
+        ]
+        rng = random.Random(0)
+        documents = [
+            "\n".join(rng.choices(fragments, k=rng.randint(1, 12))) for _ in range(2000)
+        ]
+
+        for document in documents:
+            # WHEN
+            scanned = parsers._scan_markdown_headings(document)  # pyright: ignore[reportPrivateUsage]
+
+            # THEN
+            if scanned is not None:
+                parsed = parsers._parse_markdown_headings(document)  # pyright: ignore[reportPrivateUsage]
+                assert scanned == parsed, document
+
 
 class TestCodeParsing:
     def test_picking_up_code_from_class_definitions(self, tmp_path: Path) -> None:
@@ -205,6 +373,158 @@ class TestCodeParsing:
             "awesome": [(source_file, 5)],
         }
 
+    def test_picking_up_code_from_annotated_class_attributes(
+        self, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        source_file = tmp_path / "awesome.py"
+        source = textwrap.dedent(
+            """
+            class AwesomeThing(Diagnostic):
+                code: str = "awesome-thing"
+
+            class NotAwesomeThing(Diagnostic):
+                code: str
+            """
+        )
+        source_file.write_text(source)
+
+        # WHEN
+        results = parsers.find_codes_in_sources(source_file)
+
+        # THEN
+        assert results == {"awesome-thing": [(source_file, 2)]}
+
+    def test_picking_up_code_from_unpacked_dictionaries(self, tmp_path: Path) -> None:
+        # GIVEN
+        source_file = tmp_path / "awesome.py"
+        source = textwrap.dedent(
+            """
+            make_error = functools.partial(
+                DiagnosticError, **{"code": "awesome", "hint_stmt": None}
+            )
+            make_error(**{"message": "code"})
+            """
+        )
+        source_file.write_text(source)
+
+        # WHEN
+        results = parsers.find_codes_in_sources(source_file)
+
+        # THEN
+        assert results == {"awesome": [(source_file, 2)]}
+
+    def test_picking_up_code_from_nested_scopes(self, tmp_path: Path) -> None:
+        # GIVEN
+        source_file = tmp_path / "awesome.py"
+        source = textwrap.dedent(
+            """
+            class Outer:
+                class Inner(Diagnostic):
+                    code = "inner"
+
+                def method(self):
+                    if True:
+                        raise DiagnosticError(
+                            message=f"{[DiagnosticError(code='nested') for _ in x]}",
+                            code="outer",
+                        )
+            """
+        )
+        source_file.write_text(source)
+
+        # WHEN
+        results = parsers.find_codes_in_sources(source_file)
+
+        # THEN
+        assert results == {
+            "inner": [(source_file, 3)],
+            "outer": [(source_file, 8)],
+            "nested": [(source_file, 9)],
+        }
+
+    def test_picking_up_code_from_decorators(self, tmp_path: Path) -> None:
+        # GIVEN
+        source_file = tmp_path / "awesome.py"
+        source = textwrap.dedent(
+            """
+            @register(code="decorated-code")
+            def function():
+                pass
+
+            @attach(code="class-decorated")
+            @dataclasses.dataclass
+            class Attached:
+                pass
+
+            class Outer:
+                @register(code="method-decorated")
+                async def method(self):
+                    pass
+            """
+        )
+        source_file.write_text(source)
+
+        # WHEN
+        results = parsers.find_codes_in_sources(source_file)
+
+        # THEN
+        assert results == {
+            "decorated-code": [(source_file, 2)],
+            "class-decorated": [(source_file, 6)],
+            "method-decorated": [(source_file, 12)],
+        }
+
+    def test_parallel_matches_serial(self, tmp_path: Path) -> None:
+        # GIVEN
+        for index in range(5):
+            (tmp_path / f"module_{index}.py").write_text(
+                textwrap.dedent(
+                    f"""
+                    class Error{index}(DiagnosticError):
+                        code = "shared-code"
+
+                    DiagnosticError(code="code-{index}", message="", causes=[])
+                    """
+                )
+            )
+
+        # WHEN
+        serial = parsers.find_codes_in_sources(tmp_path, jobs=1)
+        parallel = parsers.find_codes_in_sources(tmp_path, jobs=2)
+
+        # THEN
+        assert parallel == serial
+        assert parallel["shared-code"] == [
+            (tmp_path / f"module_{index}.py", 2) for index in range(5)
+        ]
+
+    def test_skips_files_without_codes(self, tmp_path: Path) -> None:
+        # GIVEN
+        (tmp_path / "with_code.py").write_text('Error(code="found")\n')
+        (tmp_path / "without_code.py").write_text("import os\n")
+        (tmp_path / "empty.py").touch()
+        stats = parsers.ScanStats()
+
+        # WHEN
+        results = parsers.find_codes_in_sources(tmp_path, stats=stats)
+
+        # THEN
+        assert results == {"found": [(tmp_path / "with_code.py", 1)]}
+        assert stats == parsers.ScanStats(files=3, cached=0, skipped=2, parsed=1)
+
+    def test_prefilter_does_not_skip_files_with_codes(self, tmp_path: Path) -> None:
+        # GIVEN
+        source_file = tmp_path / "source.py"
+        source_file.write_text("# only mentions code in a comment\nx = 1\n")
+
+        # WHEN
+        may_contain = parsers._may_contain_code(source_file)  # pyright: ignore[reportPrivateUsage]
+
+        # THEN
+        assert may_contain
+        assert parsers.find_codes_in_sources(source_file) == {}
+
 
 def test_directory_traversal(tmp_path: Path) -> None:
     # GIVEN
@@ -231,3 +551,118 @@ def test_directory_traversal(tmp_path: Path) -> None:
             (tmp_path / "folder" / "subfolder" / "three.md", 0),
         ]
     }
+
+
+def test_many_directory_traversals_share_files(tmp_path: Path) -> None:
+    # GIVEN
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "one.md").touch()
+    (tmp_path / "other.md").touch()
+    calls: list[Path] = []
+
+    def seen(path: Path) -> parsers.codeLocationMapping:
+        calls.append(path)
+        return {"seen": [(path, 0)]}
+
+    # WHEN
+    result = parsers.handle_many_directory_traversals(
+        [tmp_path, tmp_path / "shared", tmp_path / "shared" / ".." / "shared"],
+        seen,
+        extensions=(".md",),
+    )
+
+    # THEN
+    assert sorted(calls) == [tmp_path / "other.md", tmp_path / "shared" / "one.md"]
+    assert result == [
+        {"seen": [(tmp_path / "other.md", 0), (tmp_path / "shared" / "one.md", 0)]},
+        {"seen": [(tmp_path / "shared" / "one.md", 0)]},
+        {"seen": [(tmp_path / "shared" / ".." / "shared" / "one.md", 0)]},
+    ]
+
+
+class TestCodeDiscovery:
+    def test_finds_classes_by_importing(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        # GIVEN
+        package = tmp_path / "discovered_package"
+        (package / "sub").mkdir(parents=True)
+        (package / "__init__.py").touch()
+        (package / "__main__.py").write_text("raise SystemExit('ran __main__')\n")
+        (package / "broken.py").write_text("import does_not_exist\n")
+        (package / "sub" / "__init__.py").touch()
+        (package / "sub" / "errors.py").write_text(
+            textwrap.dedent(
+                """
+                import dataclasses
+
+                from diagnostic import DiagnosticError
+
+                class DiscoveredError(DiagnosticError):
+                    code = "discovered-error"
+
+                @dataclasses.dataclass
+                class DecoratedError(DiagnosticError):
+                    code = "decorated-error"
+
+                class Namespace:
+                    class DiscoveredError(DiagnosticError):
+                        code = "nested-error"
+
+                def fail():
+                    raise DiagnosticError(code="not-discovered", message="", causes=[])
+                """
+            )
+        )
+        monkeypatch.setattr(sys, "path", [str(tmp_path), *sys.path])
+
+        # WHEN
+        results = parsers.find_codes_by_import("discovered_package", package)
+        elsewhere = parsers.find_codes_by_import("discovered_package", tmp_path / "x")
+
+        # THEN
+        errors = package / "sub" / "errors.py"
+        assert results == {
+            "discovered-error": [(errors, 6)],
+            "decorated-error": [(errors, 10)],
+            "nested-error": [(errors, 14)],
+        }
+        assert elsewhere == {}
+        assert "Ignoring module discovered_package.broken" in capsys.readouterr().err
+
+    def test_classes_without_a_class_statement(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # GIVEN
+        package = tmp_path / "dynamic_package"
+        package.mkdir()
+        (package / "__init__.py").write_text(
+            textwrap.dedent(
+                """
+                from diagnostic import DiagnosticError
+
+                DynamicError = type(
+                    "DynamicError", (DiagnosticError,), {"code": "dynamic-error"}
+                )
+
+                class OriginalError(DiagnosticError):
+                    code = "renamed-error"
+
+                OriginalError.__qualname__ = "RenamedError"
+                """
+            )
+        )
+        monkeypatch.setattr(sys, "path", [str(tmp_path), *sys.path])
+
+        # WHEN
+        results = parsers.find_codes_by_import("dynamic_package", package)
+
+        # THEN
+        init = package / "__init__.py"
+        assert results == {
+            "dynamic-error": [(init, 1)],
+            "renamed-error": [(init, 1)],
+        }
@@ -0,0 +1,110 @@
+"""Tests the index of diagnostic classes, by their code."""
+
+import gc
+
+import pytest
+
+from diagnostic import DiagnosticError, DiagnosticWarning, lookup
+
+
+def test_lookup() -> None:
+    # GIVEN
+    class RegisteredError(DiagnosticError):
+        code = "registry-lookup"
+
+    # WHEN
+    found = lookup("registry-lookup")
+
+    # THEN
+    assert found is RegisteredError
+
+
+def test_lookup_missing() -> None:
+    # GIVEN
+    DiagnosticError(
+        code="registry-instance-only", message="message", causes=[], hint_stmt=None
+    )
+
+    # WHEN
+    with pytest.raises(LookupError) as exc_info:
+        lookup("registry-instance-only")
+
+    # THEN
+    assert "No diagnostic class" in str(exc_info.value)
+
+
+def test_lookup_duplicate() -> None:
+    # GIVEN
+    class FirstError(DiagnosticError):
+        code = "registry-duplicate"
+
+    class SecondWarning(DiagnosticWarning):
+        code = "registry-duplicate"
+
+    # WHEN
+    with pytest.raises(LookupError) as exc_info:
+        lookup("registry-duplicate")
+
+    # THEN
+    assert "More than one diagnostic class" in str(exc_info.value)
+    assert FirstError.__qualname__ in str(exc_info.value)
+    assert SecondWarning.__qualname__ in str(exc_info.value)
+
+
+def test_redefinition_replaces() -> None:
+    # GIVEN
+    def define() -> type[DiagnosticError]:
+        class RedefinedError(DiagnosticError):
+            code = "registry-redefined"
+
+        return RedefinedError
+
+    define()
+
+    # WHEN
+    latest = define()
+
+    # THEN
+    assert lookup("registry-redefined") is latest
+
+
+def test_subclasses_without_code_are_not_registered() -> None:
+    # GIVEN
+    class ParentError(DiagnosticError):
+        code = "registry-parent"
+
+    class ChildError(ParentError):  # pyright: ignore[reportUnusedClass]
+        pass
+
+    # WHEN
+    found = lookup("registry-parent")
+
+    # THEN
+    assert found is ParentError
+
+
+def test_collected_classes_are_dropped() -> None:
+    # GIVEN
+    class TemporaryError(DiagnosticError):  # pyright: ignore[reportUnusedClass]
+        code = "registry-temporary"
+
+    # WHEN
+    del TemporaryError
+    gc.collect()
+
+    # THEN
+    with pytest.raises(LookupError):
+        lookup("registry-temporary")
+
+
+def test_invalid_classes_are_not_registered() -> None:
+    # GIVEN
+    with pytest.raises(ValueError):
+
+        class InvalidError(DiagnosticError):  # pyright: ignore[reportUnusedClass]
+            code = "registry-invalid"
+            docs_index = "https://example.com/no-placeholder"
+
+    # WHEN / THEN
+    with pytest.raises(LookupError):
+        lookup("registry-invalid")
@@ -95,6 +95,20 @@ def test_str(data: dict[str, Any]) -> None:
     assert result == data["str"]
 
 
+@error_data
+def test_write_plain(data: dict[str, Any]) -> None:
+    # GIVEN
+    err = create_error(data["given"])
+
+    # WHEN
+    with io.StringIO() as stream:
+        err.write_plain(stream)
+        result = stream.getvalue()
+
+    # THEN
+    assert result == data["str"]
+
+
 @error_data
 def test_ascii(data: dict[str, Any]) -> None:
     # GIVEN
@@ -170,3 +184,50 @@ def test_rich_text_string() -> None:
         "note: This contains a number (1.0).\n"
         "hint: This contains a number (1.0)."
     )
+
+
+def test_decorations_are_rendered_once_per_console() -> None:
+    # GIVEN
+    err = DiagnosticError(
+        code="test-diagnostic",
+        message="Message",
+        causes=["cause one", "cause two"],
+        hint_stmt="Hint",
+        note_stmt="Note",
+    )
+    console = Console(file=io.StringIO(), color_system=None)
+    calls: list[str] = []
+    original_render_str = console.render_str
+
+    def counting_render_str(text: str, **kwargs: Any) -> Text:
+        calls.append(text)
+        return original_render_str(text, **kwargs)
+
+    console.render_str = counting_render_str  # type: ignore[method-assign]
+
+    # WHEN
+    console.print(err)
+    first_calls = calls[:]
+    calls.clear()
+    console.print(err)
+    second_calls = calls[:]
+
+    # THEN
+    assert "[red]├─>[/] " in first_calls
+    assert not [call for call in second_calls if "─>" in call]
+
+
+def test_decorations_follow_console_markup_setting() -> None:
+    # GIVEN
+    err = DiagnosticError(
+        code="test-diagnostic", message="Message", causes=[], hint_stmt=None
+    )
+    rendered_in_unicode(err)  # populate the caches, with a different console
+
+    # WHEN
+    with io.StringIO() as stream:
+        Console(file=stream, color_system=None, markup=False).print(err)
+        result = stream.getvalue()
+
+    # THEN
+    assert "[red]×[/] Message" in result
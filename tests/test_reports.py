@@ -0,0 +1,120 @@
+"""Tests the machine-readable reports of check-docs."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from diagnostic import _reports as reports
+
+
+def _write_report(report: reports.Report) -> None:
+    report.start()
+    report.codes({"some-code": [(Path("src/a.py"), 1), (Path("src/b.py"), 2)]})
+    report.headings({"other-code": [(Path("docs/index.md"), 3)]})
+    report.undocumented("some-code", [(Path("src/a.py"), 1), (Path("src/b.py"), 2)])
+    report.extra("other-code", [(Path("docs/index.md"), 3)])
+    report.finish()
+
+
+def test_ndjson() -> None:
+    # GIVEN
+    stream = io.StringIO()
+
+    # WHEN
+    _write_report(reports.NDJSONReport(stream))
+
+    # THEN
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records == [
+        {"type": "code", "code": "some-code", "path": "src/a.py", "line": 1},
+        {"type": "code", "code": "some-code", "path": "src/b.py", "line": 2},
+        {"type": "heading", "code": "other-code", "path": "docs/index.md", "line": 3},
+        {
+            "type": "undocumented",
+            "code": "some-code",
+            "locations": [
+                {"path": "src/a.py", "line": 1},
+                {"path": "src/b.py", "line": 2},
+            ],
+        },
+        {
+            "type": "extra",
+            "code": "other-code",
+            "locations": [{"path": "docs/index.md", "line": 3}],
+        },
+    ]
+
+
+def test_json() -> None:
+    # GIVEN
+    stream = io.StringIO()
+
+    # WHEN
+    _write_report(reports.JSONReport(stream))
+
+    # THEN
+    assert json.loads(stream.getvalue()) == {
+        "codes": [
+            {"code": "some-code", "path": "src/a.py", "line": 1},
+            {"code": "some-code", "path": "src/b.py", "line": 2},
+        ],
+        "headings": [{"code": "other-code", "path": "docs/index.md", "line": 3}],
+        "undocumented": [
+            {
+                "code": "some-code",
+                "locations": [
+                    {"path": "src/a.py", "line": 1},
+                    {"path": "src/b.py", "line": 2},
+                ],
+            }
+        ],
+        "extra": [
+            {"code": "other-code", "locations": [{"path": "docs/index.md", "line": 3}]}
+        ],
+    }
+
+
+@pytest.mark.parametrize("cls", [reports.JSONReport, reports.SARIFReport])
+def test_empty_reports_are_valid(cls: type[reports.Report]) -> None:
+    # GIVEN
+    stream = io.StringIO()
+    report = cls(stream)
+
+    # WHEN
+    report.start()
+    report.finish()
+
+    # THEN
+    assert json.loads(stream.getvalue())
+
+
+def test_sarif() -> None:
+    # GIVEN
+    stream = io.StringIO()
+
+    # WHEN
+    _write_report(reports.SARIFReport(stream))
+
+    # THEN
+    log = json.loads(stream.getvalue())
+    assert log["version"] == "2.1.0"
+    [run] = log["runs"]
+    assert run["tool"]["driver"]["name"] == "diagnostic.check-docs"
+    assert [
+        (
+            result["ruleId"],
+            [
+                (
+                    location["physicalLocation"]["artifactLocation"]["uri"],
+                    location["physicalLocation"]["region"]["startLine"],
+                )
+                for location in result["locations"]
+            ],
+        )
+        for result in run["results"]
+    ] == [
+        ("undocumented-code", [("src/a.py", 1), ("src/b.py", 2)]),
+        ("extra-code", [("docs/index.md", 3)]),
+    ]
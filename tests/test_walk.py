@@ -0,0 +1,155 @@
+"""Tests the walking of directory trees."""
+
+from pathlib import Path
+
+import pytest
+
+from diagnostic import _walk as walk
+
+
+def _touch(root: Path, *names: str) -> None:
+    for name in names:
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).touch()
+
+
+def _walked(root: Path, path_filter: walk.PathFilter) -> list[str]:
+    return [
+        file.relative_to(root).as_posix()
+        for file in path_filter.iter_files(root, extensions=(".py",))
+    ]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_dir", "expected"),
+    [
+        ("*.py", "module.py", False, True),
+        ("*.py", "deep/in/module.py", False, True),
+        ("*.py", "module.pyc", False, None),
+        ("build/", "build", True, True),
+        ("build/", "build", False, None),
+        ("/build", "build", True, True),
+        ("/build", "nested/build", True, None),
+        ("docs/*.py", "docs/conf.py", False, True),
+        ("docs/*.py", "docs/nested/conf.py", False, None),
+        ("docs/**/*.py", "docs/nested/conf.py", False, True),
+        ("**/fixtures", "tests/data/fixtures", True, True),
+        ("fixtures/**", "fixtures/a/b.py", False, True),
+        ("test_?.py", "test_1.py", False, True),
+        ("test_[0-9].py", "test_a.py", False, None),
+        ("test_[!0-9].py", "test_a.py", False, True),
+        ("\\#literal", "#literal", False, True),
+        ("!keep.py", "keep.py", False, False),
+    ],
+)
+def test_patterns(pattern: str, path: str, is_dir: bool, expected: bool | None) -> None:
+    # GIVEN
+    rule = walk._parse_rule(pattern)  # pyright: ignore[reportPrivateUsage]
+    assert rule is not None
+
+    # WHEN
+    matched = walk._matches([rule], path, is_dir)  # pyright: ignore[reportPrivateUsage]
+
+    # THEN
+    assert matched is expected
+
+
+@pytest.mark.parametrize("line", ["", "   ", "# comment", "/"])
+def test_lines_without_patterns(line: str) -> None:
+    assert walk._parse_rule(line) is None  # pyright: ignore[reportPrivateUsage]
+
+
+def test_skips_default_excludes_and_virtual_environments(tmp_path: Path) -> None:
+    # GIVEN
+    _touch(
+        tmp_path,
+        "package/module.py",
+        ".git/hooks/hook.py",
+        "node_modules/package/setup.py",
+        "package/__pycache__/module.py",
+        "package.egg-info/module.py",
+        "env/lib/python3.12/site-packages/dependency.py",
+        "env/pyvenv.cfg",
+    )
+
+    # WHEN
+    files = _walked(tmp_path, walk.PathFilter())
+
+    # THEN
+    assert files == ["package/module.py"]
+
+
+def test_respects_gitignore(tmp_path: Path) -> None:
+    # GIVEN
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("excluded.py\n")
+    (tmp_path / ".gitignore").write_text("build/\n/generated_*.py\n")
+    _touch(
+        tmp_path,
+        "src/package/module.py",
+        "src/package/excluded.py",
+        "src/package/generated_1.py",
+        "src/package/vendored/library.py",
+        "src/package/vendored/patched.py",
+        "src/build/module.py",
+        "build/lib/module.py",
+        "generated_2.py",
+    )
+    (tmp_path / "src" / ".gitignore").write_text("package/vendored/\n")
+    (tmp_path / "src" / "package" / ".gitignore").write_text("!excluded.py\n")
+
+    # WHEN
+    from_root = _walked(tmp_path, walk.PathFilter())
+    from_src = _walked(tmp_path / "src", walk.PathFilter())
+    unfiltered = _walked(tmp_path / "src", walk.PathFilter(gitignore=False))
+
+    # THEN
+    assert from_root == [
+        "src/package/excluded.py",
+        "src/package/generated_1.py",
+        "src/package/module.py",
+    ]
+    assert from_src == [
+        "package/excluded.py",
+        "package/generated_1.py",
+        "package/module.py",
+    ]
+    assert unfiltered == [
+        "build/module.py",
+        "package/excluded.py",
+        "package/generated_1.py",
+        "package/module.py",
+        "package/vendored/library.py",
+        "package/vendored/patched.py",
+    ]
+
+
+def test_ignores_gitignore_outside_a_repository(tmp_path: Path) -> None:
+    # GIVEN
+    (tmp_path / ".gitignore").write_text("*.py\n")
+    _touch(tmp_path, "project/module.py")
+
+    # WHEN
+    files = _walked(tmp_path / "project", walk.PathFilter())
+
+    # THEN
+    assert files == ["module.py"]
+
+
+def test_include_and_exclude(tmp_path: Path) -> None:
+    # GIVEN
+    _touch(
+        tmp_path,
+        "setup.py",
+        "src/package/module.py",
+        "src/package/test_module.py",
+        "tests/test_package.py",
+    )
+
+    # WHEN
+    files = _walked(
+        tmp_path, walk.PathFilter(include=("src", "setup.py"), exclude=("test_*",))
+    )
+
+    # THEN
+    assert files == ["setup.py", "src/package/module.py"]
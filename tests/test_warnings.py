@@ -0,0 +1,168 @@
+"""Tests the presentation of diagnostic warnings emitted with `warnings`."""
+
+from __future__ import annotations
+
+import io
+import warnings
+from typing import TYPE_CHECKING
+
+import pytest
+from rich.console import Console
+
+from diagnostic import DiagnosticWarning
+from diagnostic.warnings import WarningHook, install, uninstall
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def create_warning(code: str, message: str = "message") -> DiagnosticWarning:
+    return DiagnosticWarning(code=code, message=message, causes=[], hint_stmt=None)
+
+
+def emit(*pairs: tuple[str, str]) -> None:
+    for code, message in pairs:
+        warnings.warn(create_warning(code, message), stacklevel=1)
+
+
+@pytest.fixture(autouse=True)
+def _restore_warnings() -> Iterator[None]:
+    with warnings.catch_warnings():
+        yield
+    uninstall()
+
+
+@pytest.fixture
+def console() -> Console:
+    return Console(file=io.StringIO(), color_system=None, width=80)
+
+
+def output(console: Console) -> str:
+    return console.file.getvalue()  # type: ignore[attr-defined]
+
+
+def test_once_presents_first_of_each_code(console: Console) -> None:
+    # GIVEN
+    hook = install(console=console)
+
+    # WHEN
+    emit(*(("first-code", f"Item {i} is odd") for i in range(5)))
+    emit(("second-code", "Something else"), ("second-code", "Something else"))
+    presented = output(console)
+    hook.summarise()
+
+    # THEN
+    assert presented.count("warning: first-code") == 1
+    assert "Item 0 is odd" in presented
+    assert "Item 1 is odd" not in presented
+    assert presented.count("warning: second-code") == 1
+    assert output(console)[len(presented) :] == (
+        "note: 5 repeated warnings were not shown: first-code (4), second-code (1)\n"
+    )
+
+
+def test_always_presents_every_warning(console: Console) -> None:
+    # GIVEN
+    hook = install(mode="always", console=console)
+
+    # WHEN
+    emit(("some-code", "message"), ("some-code", "message"), ("some-code", "other"))
+    presented = output(console)
+    hook.summarise()
+
+    # THEN
+    assert presented.count("warning: some-code") == 3
+    assert output(console) == presented
+
+
+def test_count_presents_at_summary(console: Console) -> None:
+    # GIVEN
+    hook = install(mode="count", console=console)
+
+    # WHEN
+    emit(("some-code", "first"), ("some-code", "second"), ("some-code", "third"))
+    presented = output(console)
+    hook.summarise()
+
+    # THEN
+    assert presented == ""
+    assert output(console).count("warning: some-code") == 1
+    assert "first" in output(console)
+    assert output(console).endswith("note: emitted 3 times\n")
+
+
+def test_forgets_least_recent_codes(console: Console) -> None:
+    # GIVEN
+    hook = install(maxsize=2, console=console)
+
+    # WHEN
+    emit(("a", "message"), ("a", "message"), ("b", "message"), ("c", "message"))
+    emit(("a", "message"))
+    presented = output(console)
+    hook.summarise()
+
+    # THEN
+    assert presented.count("warning: a") == 2
+    assert output(console).endswith(
+        "note: 1 repeated warnings were not shown: other (1)\n"
+    )
+
+
+def test_does_not_grow_warning_registry(console: Console) -> None:
+    # GIVEN
+    install(console=console)
+    registry: dict[str | tuple[str, type[Warning], int], int] = {}
+
+    # WHEN
+    for index in range(10):
+        warning = create_warning("some-code", f"Item {index} is odd")
+        warnings.warn_explicit(
+            warning, DiagnosticWarning, "file.py", 1, registry=registry
+        )
+
+    # THEN
+    assert set(registry) <= {"version"}
+    assert output(console).count("warning: some-code") == 1
+
+
+def test_passes_other_warnings_on(console: Console) -> None:
+    # GIVEN
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        install(console=console)
+
+        # WHEN
+        warnings.warn("plain warning", UserWarning, stacklevel=1)
+
+    # THEN
+    assert [str(w.message) for w in caught] == ["plain warning"]
+    assert output(console) == ""
+
+
+def test_earlier_filters_still_apply(console: Console) -> None:
+    # GIVEN
+    warnings.simplefilter("error", DiagnosticWarning)
+    install(console=console)
+
+    # WHEN / THEN
+    with pytest.raises(DiagnosticWarning):
+        emit(("some-code", "message"))
+
+
+def test_uninstall_restores_showwarning(console: Console) -> None:
+    # GIVEN
+    original = warnings.showwarning
+    filters = list(warnings.filters)
+    install(console=console)
+
+    # WHEN
+    uninstall()
+
+    # THEN
+    assert warnings.showwarning is original
+    assert warnings.filters == filters
+
+
+def test_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError, match="mode"):
+        WarningHook(mode="sometimes")  # type: ignore[arg-type]